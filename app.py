@@ -5,6 +5,7 @@ A full-stack web application for managing and booking campus resources.
 
 import os
 from flask import Flask, session
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -19,9 +20,14 @@ from src.controllers.review_controller import review_bp
 from src.controllers.message_controller import message_bp
 from src.controllers.admin_controller import admin_bp
 from src.controllers.concierge_controller import concierge_bp
+from src.controllers.events_controller import events_bp
 
 # Initialize database
 from src.data_access.database import Database
+from src.utils.recommendation_job import start_recommendation_job, DEFAULT_INTERVAL
+from src.data_access.retention_dal import DEFAULT_RETENTION_DAYS
+from src.utils import retention_job
+from src.utils.ai_concierge import preload_concierge
 db = Database()
 
 
@@ -36,6 +42,12 @@ def create_app():
     app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE', 5242880))
     app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'src/static/uploads')
 
+    # Reverse proxies in front of the app (0: none). Rate limits key on the client
+    # address, which is then taken from X-Forwarded-For instead of the proxy's.
+    trusted_proxies = int(os.getenv('TRUSTED_PROXIES', 0))
+    if trusted_proxies > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies)
+
     # Register blueprints
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
@@ -45,6 +57,24 @@ def create_app():
     app.register_blueprint(message_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(concierge_bp)
+    app.register_blueprint(events_bp)
+
+    # Recompute personalized recommendations in the background (0 disables)
+    recommendation_interval = int(os.getenv('RECOMMENDATION_INTERVAL', DEFAULT_INTERVAL))
+    if recommendation_interval > 0:
+        start_recommendation_job(db, recommendation_interval)
+
+    # Archive old admin logs and messages in the background (0 disables)
+    retention_interval = int(os.getenv('RETENTION_INTERVAL', retention_job.DEFAULT_INTERVAL))
+    if retention_interval > 0:
+        retention_job.start_retention_job(db, retention_interval, {
+            'admin_logs': int(os.getenv('ADMIN_LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS['admin_logs'])),
+            'messages': int(os.getenv('MESSAGE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS['messages'])),
+        })
+
+    # Build the concierge and warm its context off the request path (0 disables)
+    if os.getenv('CONCIERGE_PRELOAD', '1') != '0':
+        preload_concierge()
 
     # Context processor for templates
     @app.context_processor
@@ -0,0 +1,119 @@
+"""
+Benchmark for the booking analytics rollup.
+Compares the raw bookings join with rollup reads at 5M bookings, and times
+a full rebuild and applying a batch of changes from the feed.
+
+Usage:
+    python -m benchmarks.bench_booking_rollup [booking_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.data_access.database import Database
+from src.data_access.rollup_dal import BookingRollupDAL
+
+RESOURCE_COUNT = 2_000
+USER_COUNT = 20_000
+DEPARTMENTS = 20
+CATEGORIES = 12
+DAYS = 730
+CHANGE_COUNT = 10_000
+STATUSES = ['approved', 'approved', 'completed', 'completed', 'pending', 'rejected', 'cancelled']
+
+RAW_CATEGORY_QUERY = """
+    SELECT r.category, COUNT(b.booking_id) as booking_count,
+           ROUND(SUM((julianday(b.end_datetime) - julianday(b.start_datetime)) * 24), 1) as booked_hours
+    FROM resources r
+    JOIN bookings b ON r.resource_id = b.resource_id
+    WHERE r.category IS NOT NULL AND b.status IN ('approved', 'completed')
+      AND b.start_datetime >= ? AND b.start_datetime < ?
+    GROUP BY r.category
+    ORDER BY booking_count DESC
+"""
+
+
+def build_database(path, booking_count):
+    """Create users, resources and bookings spread over two years."""
+    db = Database(path)
+    rng = random.Random(37)
+    first_day = date(2029, 1, 1)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO users (name, email, password_hash, role, department) VALUES (?, ?, 'x', 'student', ?)",
+            ((f'User {i}', f'user{i}@x.edu', f'Department {i % DEPARTMENTS}') for i in range(USER_COUNT))
+        )
+        conn.executemany(
+            """INSERT INTO resources (owner_id, title, category, location, capacity, status)
+               VALUES (1, ?, ?, 'Main Campus', 10, 'published')""",
+            ((f'Resource {i}', f'Category {i % CATEGORIES}') for i in range(RESOURCE_COUNT))
+        )
+
+        def bookings():
+            for _ in range(booking_count):
+                day = first_day + timedelta(days=rng.randrange(DAYS))
+                hour = rng.randint(8, 20)
+                yield (
+                    rng.randint(1, RESOURCE_COUNT), rng.randint(1, USER_COUNT),
+                    f'{day} {hour:02d}:00', f'{day} {hour + 1:02d}:00', rng.choice(STATUSES)
+                )
+
+        conn.executemany(
+            """INSERT INTO bookings (resource_id, requester_id, start_datetime, end_datetime, status)
+               VALUES (?, ?, ?, ?, ?)""",
+            bookings()
+        )
+    return db
+
+
+def timed(label, func, repeat=3):
+    """Print the best of `repeat` runs and return the last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<44} {best * 1000:10.1f} ms")
+    return result
+
+
+def main(booking_count=5_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        db = build_database(os.path.join(tmp, 'bench.db'), booking_count)
+        print(f"bookings: {booking_count}, resources: {RESOURCE_COUNT}, users: {USER_COUNT}, days: {DAYS}")
+        print(f"{'build database (triggers on)':<44} {(time.perf_counter() - start) * 1000:10.1f} ms")
+        rollups = BookingRollupDAL(db)
+
+        timed('full rebuild', rollups.rebuild, repeat=1)
+        rows = db.execute_query("SELECT COUNT(*) as n FROM booking_daily_rollup", fetch_one=True)['n']
+        print(f"{'rollup rows':<44} {rows:10d}")
+
+        rng = random.Random(7)
+        with db.get_connection() as conn:
+            for _ in range(CHANGE_COUNT):
+                conn.execute(
+                    "UPDATE bookings SET status = ? WHERE booking_id = ?",
+                    (rng.choice(STATUSES), rng.randint(1, booking_count))
+                )
+        timed(f'apply {CHANGE_COUNT} changes', rollups.apply_changes, repeat=1)
+
+        for label, (first, last) in (
+            ('whole range', ('2029-01-01', '2031-01-01')),
+            ('one month', ('2030-03-01', '2030-04-01')),
+        ):
+            raw = timed(f'usage by category, {label}: raw join',
+                        lambda: db.execute_query(RAW_CATEGORY_QUERY, (first, last), fetch_all=True))
+            rolled = timed(f'usage by category, {label}: rollup',
+                           lambda: rollups.get_usage_by_category(first, (date.fromisoformat(last) - timedelta(days=1)).isoformat()))
+            assert [(r['category'], r['booking_count']) for r in raw] == \
+                [(r['category'], r['booking_count']) for r in rolled]
+        timed('usage by department, whole range: rollup', rollups.get_usage_by_department)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,110 @@
+"""
+Benchmark for streamed concierge answers.
+Asks the same questions through /concierge/ask (one JSON body) and
+/concierge/ask/stream (server-sent events) and reports time to first byte
+time to the first piece of answer text, and total time separately. A per-piece delay stands in for a slower
+answer source, such as a local model generating text.
+
+Usage:
+    python -m benchmarks.bench_concierge_stream [piece_delay_ms] [rounds]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from flask import Flask
+from src.controllers import concierge_controller
+from src.controllers.auth_controller import auth_bp
+from src.controllers.concierge_controller import concierge_bp
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.database import Database
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.utils import ai_concierge
+from src.utils.rate_limit import RateLimiter, set_rate_limiter
+
+DB_PATH = 'bench_concierge_stream.db'
+QUERIES = ('find a study room in the library tomorrow', 'show me the best resources', 'what categories are there')
+
+
+def seed(db):
+    """A few hundred resources with bookings tomorrow."""
+    owner = UserDAL(db).create_user('Owner', 'owner@example.edu', 'x', 'staff')
+    resources, bookings = ResourceDAL(db), BookingDAL(db)
+    tomorrow = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    for i in range(300):
+        category = ('Study Room', 'Lab', 'Meeting Room')[i % 3]
+        resource_id = resources.create_resource(owner_id=owner, title=f'{category} {i}', description='Bench',
+                                                category=category, location=f'Library Building {i % 7}',
+                                                capacity=6, status='published')
+        if i % 2:
+            bookings.create_booking(resource_id=resource_id, requester_id=owner,
+                                    start_datetime=tomorrow.isoformat(),
+                                    end_datetime=(tomorrow + timedelta(hours=1)).isoformat())
+
+
+def slowed(concierge, delay):
+    """Make every streamed piece of the concierge take `delay` seconds longer."""
+    stream = concierge.stream_natural_language_response
+
+    def slow_stream(*args, **kwargs):
+        for piece in stream(*args, **kwargs):
+            time.sleep(delay)
+            yield piece
+
+    concierge.stream_natural_language_response = slow_stream
+    concierge.generate_natural_language_response = lambda *args, **kwargs: ''.join(slow_stream(*args, **kwargs))
+
+
+def timed(client, path, query):
+    """POST a question; return seconds to the first byte, to the first answer text, and in total."""
+    start = time.perf_counter()
+    response = client.post(path, json={'query': query}, buffered=False)
+    first = first_text = None
+    for chunk in response.response:
+        now = time.perf_counter() - start
+        if first is None and chunk:
+            first = now
+        if first_text is None and (b'"text"' in chunk or b'"response"' in chunk):
+            first_text = now
+    response.close()
+    return first, first_text, time.perf_counter() - start
+
+
+def main(piece_delay_ms=50, rounds=5):
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    db = Database(DB_PATH)
+    seed(db)
+    ai_concierge.Database = lambda: db
+    concierge = ai_concierge.ResourceConcierge()
+    concierge.warm()
+    slowed(concierge, piece_delay_ms / 1000)
+    concierge_controller.get_concierge = lambda: concierge
+    set_rate_limiter(RateLimiter(enabled=False))
+
+    app = Flask(__name__)
+    app.secret_key = 'bench'
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(concierge_bp)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+
+    print(f"{piece_delay_ms} ms per piece, best of {rounds}, answer cache cleared each time")
+    print(f"{'query':<44} {'endpoint':>8} {'TTFB ms':>8} {'text ms':>8} {'total ms':>9}")
+    for query in QUERIES:
+        for path in ('/concierge/ask', '/concierge/ask/stream'):
+            samples = []
+            for _ in range(rounds):
+                concierge.answer_cache.clear()
+                samples.append(timed(client, path, query))
+            first, first_text, total = min(samples, key=lambda sample: sample[2])
+            print(f"{query:<44} {path.rsplit('/', 1)[-1]:>8} {first * 1000:>8.1f} {first_text * 1000:>8.1f} "
+                  f"{total * 1000:>9.1f}")
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
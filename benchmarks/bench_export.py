@@ -0,0 +1,77 @@
+"""
+Benchmark for streaming exports.
+Exports bookings at growing table sizes and reports throughput and peak
+Python memory, which should stay flat as the table grows.
+
+Usage:
+    python -m benchmarks.bench_export [booking_count ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from src.data_access.database import Database
+from src.utils.export import export_chunks, parquet_available
+
+STATUSES = ('pending', 'approved', 'rejected', 'cancelled', 'completed')
+
+
+def add_bookings(db, first, count, rng):
+    """Append count bookings numbered from first."""
+    with db.get_connection() as conn:
+        def rows():
+            for i in range(first, first + count):
+                day = date(2029, 1, 1) + timedelta(days=rng.randrange(730))
+                yield (rng.randint(1, 1000), 1, f'{day} 10:00', f'{day} 11:00',
+                       rng.choice(STATUSES), f'Booking {i} notes')
+
+        conn.executemany(
+            """INSERT INTO bookings (resource_id, requester_id, start_datetime, end_datetime, status, notes)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            rows()
+        )
+        # The analytics change feed is not part of this benchmark
+        conn.execute("DELETE FROM booking_changes")
+
+
+def measure(db, fmt, **filters):
+    """Run one export to nowhere; return (seconds, peak bytes, output bytes)."""
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in export_chunks(db, 'bookings', fmt, **filters))
+    seconds = time.perf_counter() - start
+    # Separate traced run: tracemalloc slows allocation-heavy code several times
+    tracemalloc.start()
+    for _ in export_chunks(db, 'bookings', fmt, **filters):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, size
+
+
+def main(*sizes):
+    sizes = sizes or (250_000, 1_000_000)
+    formats = ['csv'] + (['parquet'] if parquet_available() else [])
+    rng = random.Random(40)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'bench.db'))
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO users (name, email, password_hash, role) VALUES ('U', 'u@x.edu', 'x', 'student')")
+        total = 0
+        print(f"{'rows':>10} {'format':>8} {'filter':>10} {'seconds':>8} {'rows/s':>10} {'peak MB':>8} {'output MB':>10}")
+        for size in sizes:
+            add_bookings(db, total + 1, size - total, rng)
+            total = size
+            for fmt in formats:
+                for label, filters in (('none', {}), ('approved', {'status': 'approved'})):
+                    seconds, peak, output = measure(db, fmt, **filters)
+                    print(f"{total:>10} {fmt:>8} {label:>10} {seconds:>8.2f} {total / seconds:>10.0f} "
+                          f"{peak / 1e6:>8.1f} {output / 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,65 @@
+"""
+Benchmark for concierge intent routing.
+Routes every query of the tests/ai_eval intent corpus many times with the
+IntentRouter and with the substring if/elif chain it replaced, and
+reports per-query latency and how many corpus labels each gets right.
+
+Usage:
+    python -m benchmarks.bench_intent_router [rounds]
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import date
+from src.utils.ai_concierge import ResourceConcierge
+
+CORPUS = os.path.join(os.path.dirname(__file__), '..', 'tests', 'ai_eval', 'intent_corpus.json')
+
+
+def keyword_chain(query_text):
+    """The substring routing generate_natural_language_response used before."""
+    query_lower = query_text.lower()
+    if 'top rated' in query_lower or 'best' in query_lower or 'recommend' in query_lower:
+        return 'recommendations'
+    elif 'popular' in query_lower or 'most booked' in query_lower:
+        return 'popular'
+    elif 'category' in query_lower or 'categories' in query_lower or 'types' in query_lower:
+        return 'categories'
+    elif 'stats' in query_lower or 'statistics' in query_lower or 'overview' in query_lower:
+        return 'stats'
+    return None
+
+
+def timed(route, queries, rounds):
+    """Route every query `rounds` times; return sorted per-call microseconds."""
+    samples = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            route(query)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return sorted(samples)
+
+
+def main(rounds=2000):
+    with open(CORPUS) as f:
+        corpus = json.load(f)
+    router = ResourceConcierge().router
+    router.set_vocabulary(**corpus['vocabulary'])
+    today = date.fromisoformat(corpus['today'])
+    queries = [case['query'] for case in corpus['queries']]
+    labels = [case['intent'] for case in corpus['queries']]
+
+    print(f"{len(queries)} corpus queries x {rounds} rounds")
+    print(f"{'router':>14} {'p50 us':>8} {'p99 us':>8} {'correct':>8}")
+    for label, route in (('if/elif', keyword_chain), ('IntentRouter', lambda q: router.route(q, today).intent)):
+        samples = timed(route, queries, rounds)
+        correct = sum(route(query) == intent for query, intent in zip(queries, labels))
+        print(f"{label:>14} {samples[len(samples) // 2]:>8.2f} {samples[int(len(samples) * 0.99)]:>8.2f} "
+              f"{correct:>5}/{len(queries)}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
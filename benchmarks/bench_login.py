@@ -0,0 +1,79 @@
+"""
+Benchmark for password checks under a login burst.
+Runs concurrent clients that each check a password a few times, at
+several bcrypt costs and pool settings, and reports throughput, latency
+percentiles, the deepest queue and rejections.
+
+Usage:
+    python -m benchmarks.bench_login [clients] [logins_per_client]
+"""
+
+import os
+import sys
+import threading
+import time
+import bcrypt
+from src.utils.hash_pool import HashPool, HashPoolBusy
+
+COSTS = (4, 8, 10, 12)
+
+
+def pools():
+    """Pool settings to compare: (label, HashPool factory)."""
+    cpus = os.cpu_count() or 1
+    settings = [('inline', lambda: HashPool(workers=0)),
+                ('thread x1', lambda: HashPool(workers=1, kind='thread'))]
+    if cpus > 1:
+        settings.append((f'thread x{cpus}', lambda: HashPool(workers=cpus, kind='thread')))
+    settings.append((f'process x{cpus}', lambda: HashPool(workers=cpus, kind='process')))
+    return settings
+
+
+def burst(pool, hashed, clients, logins):
+    """Run clients x logins checks at once; return (seconds, latencies, rejected)."""
+    latencies, rejected = [], []
+    lock = threading.Lock()
+    go = threading.Event()
+
+    def client():
+        go.wait()
+        for _ in range(logins):
+            start = time.perf_counter()
+            try:
+                assert pool.checkpw(b'TestPass123', hashed)
+            except HashPoolBusy:
+                with lock:
+                    rejected.append(1)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    go.set()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), len(rejected)
+
+
+def main(clients=16, logins=2):
+    print(f"{clients} clients x {logins} logins, {os.cpu_count()} CPUs")
+    print(f"{'cost':>4} {'pool':>12} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'max depth':>9} {'rejected':>8}")
+    for cost in COSTS:
+        hashed = bcrypt.hashpw(b'TestPass123', bcrypt.gensalt(cost))
+        for label, make_pool in pools():
+            pool = make_pool()
+            pool.checkpw(b'TestPass123', hashed)  # start workers outside the timing
+            seconds, latencies, rejected = burst(pool, hashed, clients, logins)
+            stats = pool.stats()
+            pool.shutdown()
+            p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+            print(f"{cost:>4} {label:>12} {len(latencies) / seconds:>9.1f} {p50:>8.1f} {p95:>8.1f} "
+                  f"{stats['max_depth']:>9} {rejected:>8}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,92 @@
+"""
+Benchmark for the in-memory resource catalog.
+Measures load time, memory footprint and query latency at 100k resources.
+
+Usage:
+    python -m benchmarks.bench_resource_catalog [resource_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.data_access.database import Database
+from src.data_access.resource_catalog import ResourceCatalog, SORT_RATING
+
+WORDS = ('quiet study room lab projector whiteboard seminar hall equipment camera '
+         'microscope studio lounge kitchen podium speaker laptop cart gym court').split()
+
+
+def build_database(path, count):
+    """Create a database with `count` published resources."""
+    db = Database(path)
+    rng = random.Random(42)
+    categories = [f'Category {i}' for i in range(20)]
+    locations = [f'Building {i // 10}, Room {i}' for i in range(500)]
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO users (name, email, password_hash, role) VALUES ('Owner', 'o@x.edu', 'x', 'staff')"
+        )
+        conn.executemany(
+            """INSERT INTO resources (owner_id, title, description, category, location, capacity, status)
+               VALUES (1, ?, ?, ?, ?, ?, 'published')""",
+            (
+                (
+                    ' '.join(rng.choice(WORDS) for _ in range(5)).title(),
+                    ' '.join(rng.choice(WORDS) for _ in range(30)),
+                    rng.choice(categories),
+                    rng.choice(locations),
+                    rng.randint(1, 200),
+                )
+                for _ in range(count)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO reviews (resource_id, reviewer_id, rating) VALUES (?, 1, ?)",
+            ((rid, rng.randint(1, 5)) for rid in range(1, count + 1, 3))
+        )
+    return db
+
+
+def timed(label, func, repeat=20):
+    """Run func `repeat` times and print the mean latency."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:8.2f} ms")
+    return result
+
+
+def main(count=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = build_database(os.path.join(tmp, 'bench.db'), count)
+        catalog = ResourceCatalog(db)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        catalog.load()
+        load_time = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"resources: {len(catalog)}")
+        print(f"load time: {load_time:.2f} s")
+        print(f"catalog memory: {current / 1e6:.1f} MB (peak during load {peak / 1e6:.1f} MB)")
+
+        timed('first page, no filter', lambda: catalog.search(page=1, per_page=24))
+        timed('category filter', lambda: catalog.search(category='Category 3', per_page=24))
+        timed('location substring filter', lambda: catalog.search(location='building 7', per_page=24))
+        timed('keyword filter', lambda: catalog.search(keyword='microscope', per_page=24))
+        timed('category + sort by rating', lambda: catalog.search(category='Category 3', sort=SORT_RATING, per_page=24))
+        timed('top rated (homepage)', lambda: catalog.top_rated(limit=6))
+        timed('suggest, 1 char prefix', lambda: catalog.suggest('s'), repeat=200)
+        timed('suggest, 4 char prefix', lambda: catalog.suggest('micr'), repeat=200)
+        timed('single resource refresh', lambda: catalog.refresh(count // 2))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,60 @@
+"""
+Benchmark for bulk user import.
+Builds a cohort CSV (a tenth of the rows carry their own password, a few
+are invalid) and imports it into a fresh database, reporting the time of
+each phase against one-at-a-time registration (a hash and an insert per
+user) on a sample.
+
+Usage:
+    python -m benchmarks.bench_user_import [users] [workers]
+"""
+
+import os
+import sys
+import time
+from src.data_access.database import Database
+from src.data_access.user_dal import UserDAL
+from src.utils import user_import
+from src.utils.auth import BCRYPT_ROUNDS, hash_password
+
+DB_PATH = 'bench_user_import.db'
+SAMPLE = 20
+
+
+def cohort_csv(users):
+    """CSV text of `users` students; every 500th row has a bad email."""
+    lines = ['name,email,role,department,password']
+    for i in range(users):
+        email = f'student{i}@example.edu' if i % 500 else f'student{i}'
+        password = f'Cohort{i}pass' if i % 10 == 0 else ''
+        lines.append(f'Student {i},{email},student,Dept {i % 40},{password}')
+    return '\n'.join(lines) + '\n'
+
+
+def main(users=20_000, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    db = Database(DB_PATH)
+    text = cohort_csv(users)
+
+    dal = UserDAL(db)
+    start = time.perf_counter()
+    for i in range(SAMPLE):
+        dal.create_user(f'Single {i}', f'single{i}@example.edu', hash_password('Single123'), 'student')
+    per_user = (time.perf_counter() - start) / SAMPLE
+
+    start = time.perf_counter()
+    _, summary = user_import.import_users(db, text, workers)
+    total = time.perf_counter() - start
+    print(f"{users} users, {workers} hashing processes, bcrypt cost {BCRYPT_ROUNDS} "
+          f"(generated passwords {user_import.INITIAL_ROUNDS})")
+    print(f"  created {summary['created']}, errors {summary['error']}")
+    print(f"  validate {summary['validate_seconds']:.2f}s  hash {summary['hash_seconds']:.2f}s  "
+          f"insert {summary['insert_seconds']:.2f}s  total {total:.1f}s ({users / total:.0f} users/s)")
+    print(f"  one at a time: {per_user * 1000:.0f} ms/user, {per_user * users / 60:.1f} min for {users}")
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,109 @@
+"""
+Benchmark for the utilization engine.
+Times a full semester (16 weeks) across 5k resources: the first report in a
+process (loading every booking), later reports, and a report after a batch
+of new and re-stamped bookings.
+
+Usage:
+    python -m benchmarks.bench_utilization [resource_count] [booking_count]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from src.data_access.database import Database
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.utilization_dal import UtilizationDAL, clear_booking_intervals
+
+BUILDINGS = 40
+SEMESTER_START = date(2030, 1, 14)
+SEMESTER_DAYS = 16 * 7
+RULES = [
+    None,
+    json.dumps({day: [['08:00', '18:00']] for day in ('mon', 'tue', 'wed', 'thu', 'fri')}),
+    json.dumps({day: [['07:30', '12:00'], ['13:00', '23:00']] for day in ('mon', 'tue', 'wed', 'thu', 'fri', 'sat')}),
+]
+
+
+def build_database(path, resource_count, booking_count):
+    """Create resources across buildings with a semester of bookings."""
+    db = Database(path)
+    rng = random.Random(38)
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO users (name, email, password_hash, role) VALUES ('Owner', 'o@x.edu', 'x', 'staff')")
+        conn.executemany(
+            """INSERT INTO resources (owner_id, title, category, location, capacity, availability_rules, status)
+               VALUES (1, ?, 'Rooms', ?, 10, ?, 'published')""",
+            ((f'Resource {i}', f'Building {i % BUILDINGS}', RULES[i % len(RULES)]) for i in range(resource_count))
+        )
+
+        def bookings():
+            for _ in range(booking_count):
+                day = SEMESTER_START + timedelta(days=rng.randrange(SEMESTER_DAYS))
+                start = rng.randrange(7 * 60, 21 * 60, 15)
+                end = start + rng.choice((30, 60, 90, 120, 180))
+                yield (
+                    rng.randint(1, resource_count),
+                    f'{day} {start // 60:02d}:{start % 60:02d}',
+                    f'{day} {end // 60:02d}:{end % 60:02d}' if end < 1440 else f'{day} 23:59',
+                    rng.choice(('approved', 'completed', 'completed', 'pending', 'rejected')),
+                )
+
+        conn.executemany(
+            """INSERT INTO bookings (resource_id, requester_id, start_datetime, end_datetime, status)
+               VALUES (?, 1, ?, ?, ?)""",
+            bookings()
+        )
+    return db
+
+
+def timed(label, func, repeat=3):
+    """Print the best of `repeat` runs and return the last result."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.1f} ms")
+    return result
+
+
+def main(resource_count=5_000, booking_count=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        db = build_database(os.path.join(tmp, 'bench.db'), resource_count, booking_count)
+        print(f"resources: {resource_count}, bookings: {booking_count}, days: {SEMESTER_DAYS}")
+        print(f"{'build database':<40} {(time.perf_counter() - start) * 1000:10.1f} ms")
+        dal = UtilizationDAL(db)
+        end_day = SEMESTER_START + timedelta(days=SEMESTER_DAYS - 1)
+
+        timed('load resources', dal.load_resources)
+        report = timed('first report (loads usage bookings)', lambda: dal.get_utilization(SEMESTER_START, end_day),
+                       repeat=1)
+        print(f"{'bookings loaded':<40} {dal.intervals.rows_read:10d}")
+        timed('refresh with no changes', dal.intervals.refresh)
+        timed('later report', lambda: dal.get_utilization(SEMESTER_START, end_day))
+
+        bookings = BookingDAL(db)
+        for i in range(100):
+            booking_id = bookings.create_booking(1 + i, 1, '2030-02-04 10:00', '2030-02-04 11:00')
+            bookings.update_booking_status(booking_id, 'approved')
+            bookings.update_booking_status(1 + i * 997, 'cancelled')
+        read_before = dal.intervals.rows_read
+        report = timed('report after 100 new + 100 cancelled', lambda: dal.get_utilization(SEMESTER_START, end_day),
+                       repeat=1)
+        print(f"{'rows re-read':<40} {dal.intervals.rows_read - read_before:10d}")
+        print(f"{'overall utilization':<40} {report['overall']['utilization']:10.1f} %")
+        print(f"{'resources with assumed hours':<40} {len(report['assumed_availability']):10d}")
+
+        clear_booking_intervals()
+        fresh = UtilizationDAL(db).get_utilization(SEMESTER_START, end_day)
+        print(f"{'matches a full reload':<40} {str(fresh == report):>10}")
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,63 @@
+"""
+Benchmark for the TF-IDF resource vector index.
+Measures build, re-assembly and cosine top-K latency at 50k resources.
+
+Usage:
+    python -m benchmarks.bench_vector_index [resource_count]
+"""
+
+import random
+import sys
+import time
+
+from src.data_access.vector_index import ResourceVectorIndex
+
+WORDS = ('quiet study lab projector whiteboard seminar hall equipment camera microscope '
+         'studio lounge kitchen podium speaker laptop cart gym court piano recording '
+         'chemistry physics biology robotics printer scanner drone vr headset monitor '
+         'conference meeting group silent booth outdoor field pool theater gallery').split()
+
+
+def timed(label, func, repeat=20):
+    """Run func `repeat` times and print the mean latency."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:8.2f} ms")
+    return result
+
+
+def main(count=50_000):
+    rng = random.Random(7)
+    # Synthetic vocabulary tail so the matrix has realistic width
+    words = WORDS + [f'term{i}' for i in range(20_000)]
+    index = ResourceVectorIndex(db=None)
+    index.loaded = True
+
+    start = time.perf_counter()
+    for resource_id in range(1, count + 1):
+        index._set_document(
+            resource_id,
+            ' '.join(rng.choice(WORDS) for _ in range(4)),
+            ' '.join(rng.choice(words) for _ in range(40)),
+            rng.choice(['Lab', 'Study Room', 'Equipment', 'Venue']),
+            f'Building {rng.randint(1, 60)}',
+        )
+    index._ensure_matrix()
+    print(f"resources: {count}, vocabulary: {len(index._vocabulary)}, nnz: {index._matrix.nnz}")
+    print(f"{'full tokenize + matrix build':<40} {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    def reassemble():
+        index._matrix = None
+        index._ensure_matrix()
+
+    timed('matrix re-assembly after a change', reassemble, repeat=5)
+    timed('text query, top 10', lambda: index.search('quiet study booth with monitor', k=10))
+    timed('similar-to-resource, top 10', lambda: index.similar(count // 2, k=10))
+    ids = rng.sample(range(1, count + 1), 100)
+    timed('batch of 100 similar queries', lambda: index.similar_batch(ids, k=10), repeat=5)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
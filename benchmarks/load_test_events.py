@@ -0,0 +1,83 @@
+"""
+Load test for the in-process event bus and SSE stream generator.
+Holds thousands of idle streams on threads and measures memory per
+connection and publish-to-delivery latency.
+
+Usage:
+    python -m benchmarks.load_test_events [connections] [events]
+"""
+
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from src.controllers import events_controller
+from src.utils.event_bus import EventBus
+
+
+def main(connections=3000, events=200):
+    bus = EventBus()
+    events_controller.event_bus = bus
+    # Stack size is what bounds idle threads; 256 KiB is plenty for a stream loop
+    threading.stack_size(256 * 1024)
+    latencies = []
+    latencies_lock = threading.Lock()
+    ready = threading.Barrier(connections + 1)
+
+    def client(user_id):
+        stream = events_controller.event_stream(bus.subscribe(user_id), heartbeat=5)
+        next(stream)  # retry frame
+        ready.wait()
+        for frame in stream:
+            if frame.startswith('id:'):
+                if '"last": true' in frame:
+                    return
+                sent = float(frame.split('"sent": ')[1].rstrip('}\n'))
+                with latencies_lock:
+                    latencies.append(time.perf_counter() - sent)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i % (connections // 2) + 1,), daemon=True)
+               for i in range(connections)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"idle connections: {bus.connection_count()} (2 per user), "
+          f"started in {time.perf_counter() - start:.2f} s")
+    print(f"python heap per connection: {current / connections / 1024:.1f} KiB "
+          f"(+ thread stack, {threading.stack_size() // 1024} KiB reserved)")
+
+    publish_times = []
+    users = list(range(1, connections // 2 + 1))
+    for n in range(events):
+        # Each event concerns two users, like a message between sender and receiver
+        pair = (users[n % len(users)], users[(n * 7 + 1) % len(users)])
+        t0 = time.perf_counter()
+        bus.publish(pair, 'message', {'n': n, 'last': False, 'sent': time.perf_counter()})
+        publish_times.append(time.perf_counter() - t0)
+        time.sleep(0.001)
+    t0 = time.perf_counter()
+    bus.publish(users, 'message', {'n': events, 'last': True, 'sent': time.perf_counter()})
+    broadcast = time.perf_counter() - t0
+    for thread in threads:
+        thread.join(timeout=30)
+    broadcast_delivered = time.perf_counter() - t0
+
+    latencies.sort()
+    print(f"publish to 2 users:     mean {statistics.mean(publish_times) * 1e6:8.1f} us")
+    print(f"broadcast to all users: publish {broadcast * 1000:8.2f} ms, "
+          f"all {connections} streams received {broadcast_delivered * 1000:8.2f} ms")
+    print(f"delivered message frames: {len(latencies)}")
+    print(f"message delivery:       p50 {latencies[len(latencies) // 2] * 1000:8.2f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:8.2f} ms")
+    print(f"overflowed connections: {bus.overflows}")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
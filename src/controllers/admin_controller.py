@@ -1,6 +1,8 @@
 """Admin controller - admin dashboard and management functions."""
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from datetime import date, timedelta
+from flask import (Blueprint, Response, render_template, request, redirect, url_for, flash, session, jsonify,
+                   stream_with_context)
 from src.data_access.database import Database
 from src.data_access.admin_dal import AdminDAL
 from src.data_access.user_dal import UserDAL
@@ -8,6 +10,11 @@ from src.data_access.resource_dal import ResourceDAL
 from src.data_access.booking_dal import BookingDAL
 from src.data_access.review_dal import ReviewDAL
 from src.controllers.auth_controller import login_required, role_required
+from src.utils.ai_concierge import get_concierge
+from src.utils.auth import get_hash_pool
+from src.utils.validators import validate_date
+from src.utils.export import FORMATS, export_chunks, parquet_available
+from src.utils.user_import import import_users, report_csv
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -18,12 +25,15 @@ resource_dal = ResourceDAL(db)
 booking_dal = BookingDAL(db)
 review_dal = ReviewDAL(db)
 
+# Weeks of utilization shown when no date range is given (about a semester)
+UTILIZATION_WEEKS = 16
+
 
 @admin_bp.route('/')
 @role_required('admin', 'staff')
 def dashboard():
     """Admin dashboard with system statistics."""
-    stats = admin_dal.get_system_stats()
+    stats = admin_dal.get_cached_system_stats()
     pending_bookings = booking_dal.get_pending_bookings()
     recent_logs = admin_dal.get_admin_logs(limit=20)
 
@@ -61,6 +71,36 @@ def delete_user(user_id):
     return redirect(url_for('admin.manage_users'))
 
 
+@admin_bp.route('/users/import', methods=['POST'])
+@role_required('admin')
+def import_users_csv():
+    """
+    Create users in bulk from an uploaded CSV (name, email[, role, department, password]).
+
+    Returns the per-row report as a CSV download, including generated
+    initial passwords, or as JSON with ?format=json.
+    """
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Choose a CSV file to import.', 'danger')
+        return redirect(url_for('admin.manage_users'))
+    try:
+        report, summary = import_users(db, upload.read().decode('utf-8-sig'))
+    except (ValueError, UnicodeDecodeError) as e:
+        flash(f'Import failed: {e}', 'danger')
+        return redirect(url_for('admin.manage_users'))
+
+    admin_dal.log_action(session['user_id'], f"Imported {summary['created']} users", 'users',
+                         details=f"{upload.filename}: {summary}")
+    if request.args.get('format') == 'json':
+        return jsonify({'success': True, 'summary': summary, 'report': report})
+    return Response(
+        report_csv(report),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="import-report-{date.today().isoformat()}.csv"'}
+    )
+
+
 @admin_bp.route('/resources')
 @role_required('admin', 'staff')
 def manage_resources():
@@ -85,15 +125,148 @@ def manage_reviews():
     return render_template('admin/reviews.html', reviews=reviews)
 
 
+def _date_range_args():
+    """
+    Parse the optional start/end query params.
+
+    Returns:
+        Tuple of ({'start': date, 'end': date} for valid params, list of error messages)
+    """
+    dates, errors = {}, []
+    for param in ('start', 'end'):
+        value = request.args.get(param, '').strip()
+        if not value:
+            continue
+        is_valid, result = validate_date(value)
+        if is_valid:
+            dates[param] = result
+        else:
+            errors.append(f'{param.title()} date: {result}')
+    return dates, errors
+
+
+def _utilization_range(dates):
+    """Utilization covers the requested range, or the last UTILIZATION_WEEKS weeks."""
+    end_day = dates.get('end') or date.today()
+    start_day = dates.get('start') or end_day - timedelta(weeks=UTILIZATION_WEEKS) + timedelta(days=1)
+    return start_day, end_day
+
+
 @admin_bp.route('/analytics')
 @role_required('admin', 'staff')
 def analytics():
-    """Analytics and reports."""
-    stats = admin_dal.get_system_stats()
-    usage_by_category = admin_dal.get_usage_by_category()
-    usage_by_department = admin_dal.get_usage_by_department()
+    """
+    Analytics and reports.
+
+    Query params:
+        start, end: Optional inclusive date range, YYYY-MM-DD
+    """
+    dates, errors = _date_range_args()
+    for error in errors:
+        flash(error, 'warning')
+
+    start_day = dates['start'].isoformat() if 'start' in dates else None
+    end_day = dates['end'].isoformat() if 'end' in dates else None
+    stats = admin_dal.get_cached_system_stats()
+    usage_by_category = admin_dal.get_usage_by_category(start_day, end_day)
+    usage_by_department = admin_dal.get_usage_by_department(start_day, end_day)
+    try:
+        utilization = admin_dal.get_utilization(*_utilization_range(dates))
+    except ValueError as e:
+        flash(f'Utilization: {e}', 'warning')
+        utilization = None
 
     return render_template('admin/analytics.html',
                          stats=stats,
                          usage_by_category=usage_by_category,
-                         usage_by_department=usage_by_department)
+                         usage_by_department=usage_by_department,
+                         utilization=utilization,
+                         start_day=start_day,
+                         end_day=end_day,
+                         parquet_available=parquet_available())
+
+
+@admin_bp.route('/analytics/utilization')
+@role_required('admin', 'staff')
+def utilization_json():
+    """
+    Utilization per resource, building and week as JSON.
+
+    Query params:
+        start, end: Optional inclusive date range, YYYY-MM-DD
+            (default: the last UTILIZATION_WEEKS weeks)
+    """
+    dates, errors = _date_range_args()
+    if errors:
+        return jsonify({'success': False, 'message': '; '.join(errors)}), 400
+    try:
+        return jsonify(admin_dal.get_utilization(*_utilization_range(dates)))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+
+@admin_bp.route('/analytics/heatmap')
+@role_required('admin', 'staff')
+def demand_heatmap():
+    """
+    Hour-of-week demand heatmap as JSON.
+
+    Query params:
+        dimension: 'category' (default), 'location' or 'resource'
+        key: Category, location or resource id to show (default: everything)
+    """
+    dimension = request.args.get('dimension', 'category')
+    key = request.args.get('key') or None
+    try:
+        return jsonify(admin_dal.get_demand_heatmap(dimension, key))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+
+@admin_bp.route('/metrics/hash-pool')
+@role_required('admin')
+def hash_pool_stats():
+    """Password hashing pool metrics: queue depth, waits and rejections (JSON)."""
+    return jsonify(get_hash_pool().stats())
+
+
+@admin_bp.route('/metrics/concierge-cache')
+@role_required('admin')
+def concierge_cache_stats():
+    """Concierge answer cache metrics: entries, hit rate, invalidations, evictions (JSON)."""
+    return jsonify(get_concierge().answer_cache.stats())
+
+
+@admin_bp.route('/export/<dataset>')
+@role_required('admin')
+def export(dataset):
+    """
+    Download bookings, reviews or admin logs, streamed as they are read.
+
+    Query params:
+        format: 'csv' (default) or 'parquet'
+        start, end: Optional inclusive date range, YYYY-MM-DD
+        status: Optional status filter (bookings)
+    """
+    dates, errors = _date_range_args()
+    fmt = request.args.get('format', 'csv')
+    status = request.args.get('status') or None
+    try:
+        if errors:
+            raise ValueError('; '.join(errors))
+        chunks = export_chunks(db, dataset, fmt, dates.get('start'), dates.get('end'), status)
+    except (ValueError, RuntimeError) as e:
+        flash(f'Export failed: {e}', 'danger')
+        return redirect(url_for('admin.analytics'))
+
+    admin_dal.log_action(session['user_id'], f'Exported {dataset} as {fmt}', dataset,
+                         details=request.query_string.decode() or None)
+    filename = f"{dataset}-{date.today().isoformat()}.{fmt}"
+    return Response(
+        stream_with_context(chunks),
+        mimetype=FORMATS[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Accel-Buffering': 'no',
+        }
+    )
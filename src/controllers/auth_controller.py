@@ -4,9 +4,12 @@ Handles user registration, login, and logout.
 """
 
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from src.data_access.auth_cache import get_auth_cache
 from src.data_access.database import Database
 from src.data_access.user_dal import UserDAL
-from src.utils.auth import hash_password, verify_password, validate_password_strength
+from src.utils.auth import hash_password, verify_password, needs_rehash, validate_password_strength
+from src.utils.hash_pool import HashPoolBusy
+from src.utils.rate_limit import form_email, rate_limited, record_failure, remember_device
 from src.utils.validators import validate_email, validate_name, validate_role
 from functools import wraps
 
@@ -15,6 +18,7 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 # Initialize database and DAL
 db = Database()
 user_dal = UserDAL(db)
+auth_cache = get_auth_cache(db)
 
 
 def login_required(f):
@@ -29,7 +33,13 @@ def login_required(f):
 
 
 def role_required(*roles):
-    """Decorator to require specific roles for routes."""
+    """
+    Decorator to require specific roles for routes.
+
+    The role and auth_version come from the in-process auth cache rather
+    than a users-table read per request. A session whose auth_version is
+    no longer current (role changed, user deleted) is ended.
+    """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -37,8 +47,16 @@ def role_required(*roles):
                 flash('Please log in to access this page.', 'warning')
                 return redirect(url_for('auth.login'))
 
-            user = user_dal.get_user_by_id(session['user_id'])
-            if not user or user['role'] not in roles:
+            current = auth_cache.get(session['user_id'])
+            # Sessions from before auth_version existed adopt the current version once
+            if current is not None and 'auth_version' not in session:
+                session['auth_version'] = current[1]
+            if current is None or current[1] != session['auth_version']:
+                session.clear()
+                flash('Your access has changed. Please log in again.', 'warning')
+                return redirect(url_for('auth.login'))
+
+            if current[0] not in roles:
                 flash('You do not have permission to access this page.', 'danger')
                 return redirect(url_for('main.index'))
 
@@ -48,6 +66,7 @@ def role_required(*roles):
 
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@rate_limited('register')
 def register():
     """User registration page."""
     if request.method == 'POST':
@@ -89,7 +108,11 @@ def register():
             return render_template('auth/register.html')
 
         # Create user
-        password_hash = hash_password(password)
+        try:
+            password_hash = hash_password(password)
+        except HashPoolBusy:
+            flash('The server is busy. Please try again in a moment.', 'warning')
+            return render_template('auth/register.html'), 503
         user_id = user_dal.create_user(name, email, password_hash, role, department)
 
         if user_id:
@@ -102,6 +125,7 @@ def register():
 
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@rate_limited('login', account=form_email)
 def login():
     """User login page."""
     if request.method == 'POST':
@@ -116,15 +140,31 @@ def login():
         # Get user
         user = user_dal.get_user_by_email(email)
 
-        if user and verify_password(password, user['password_hash']):
+        try:
+            verified = user is not None and verify_password(password, user['password_hash'])
+        except HashPoolBusy:
+            flash('Too many sign-ins right now. Please try again in a moment.', 'warning')
+            return render_template('auth/login.html'), 503
+
+        if verified:
+            # Upgrade the hash to the current cost while the password is at hand
+            if needs_rehash(user['password_hash']):
+                try:
+                    user_dal.update_password(user['user_id'], hash_password(password))
+                except HashPoolBusy:
+                    pass  # retried on a later login
+
             # Set session
             session['user_id'] = user['user_id']
             session['user_name'] = user['name']
             session['user_role'] = user['role']
+            session['auth_version'] = user['auth_version']
 
             flash(f'Welcome back, {user["name"]}!', 'success')
-            return redirect(url_for('main.dashboard'))
+            # This browser skips the account's failed-login limit from now on
+            return remember_device(redirect(url_for('main.dashboard')), email)
         else:
+            record_failure('login', email)
             flash('Invalid email or password.', 'danger')
 
     return render_template('auth/login.html')
@@ -10,6 +10,7 @@ from src.data_access.database import Database
 from src.data_access.booking_dal import BookingDAL
 from src.data_access.resource_dal import ResourceDAL
 from src.controllers.auth_controller import login_required
+from src.utils.rate_limit import rate_limited
 from src.utils.validators import validate_datetime, validate_booking_times, sanitize_string
 from datetime import datetime
 
@@ -23,6 +24,7 @@ resource_dal = ResourceDAL(db)
 
 @booking_bp.route('/create/<int:resource_id>', methods=['GET', 'POST'])
 @login_required
+@rate_limited('booking_create')
 def create_booking(resource_id):
     """Create a booking for a resource."""
     resource = resource_dal.get_resource_by_id(resource_id)
@@ -63,6 +65,10 @@ def create_booking(resource_id):
         )
 
         if has_conflict:
+            # Turned-away requests still count as demand
+            booking_dal.record_attempt(
+                resource_id, session['user_id'], start_dt.isoformat(), end_dt.isoformat()
+            )
             flash('This time slot conflicts with an existing booking.', 'danger')
             return render_template('bookings/create.html', resource=resource)
 
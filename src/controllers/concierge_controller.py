@@ -3,23 +3,33 @@ AI Concierge controller.
 Provides API endpoints for the AI Resource Concierge feature.
 """
 
-from flask import Blueprint, render_template, request, jsonify, session
-from src.utils.ai_concierge import concierge
+import json
+import logging
+from flask import Blueprint, Response, render_template, request, jsonify, session, stream_with_context
+from src.utils.ai_concierge import get_concierge
 from src.controllers.auth_controller import login_required
+from src.utils.rate_limit import rate_limited
 
 concierge_bp = Blueprint('concierge', __name__, url_prefix='/concierge')
+logger = logging.getLogger(__name__)
+
+
+def _sse(data, event=None):
+    """Encode one server-sent event with a JSON payload."""
+    return (f"event: {event}\n" if event else '') + f"data: {json.dumps(data)}\n\n"
 
 
 @concierge_bp.route('/')
 @login_required
 def index():
     """AI Concierge interface page."""
-    context = concierge.get_context_summary()
+    context = get_concierge().get_context_summary()
     return render_template('concierge/index.html', context=context)
 
 
 @concierge_bp.route('/ask', methods=['POST'])
 @login_required
+@rate_limited('concierge_ask')
 def ask():
     """
     Handle AI Concierge queries.
@@ -37,7 +47,7 @@ def ask():
         }), 400
 
     # Generate response
-    response = concierge.generate_natural_language_response(query_text)
+    response = get_concierge().generate_natural_language_response(query_text, user_id=session['user_id'])
 
     return jsonify({
         'success': True,
@@ -46,8 +56,52 @@ def ask():
     })
 
 
+@concierge_bp.route('/ask/stream', methods=['POST'])
+@login_required
+@rate_limited('concierge_ask')
+def ask_stream():
+    """
+    Handle AI Concierge queries, streaming the answer as server-sent events.
+
+    Accepts the same JSON as /ask. Events:
+        intent: {"intent": ...}, sent as soon as the query is routed
+        (default): {"text": ...}, one per piece of the answer, in order
+        error: {"message": ...}, if answering fails part way
+        done: {}
+    """
+    data = request.get_json(silent=True) or {}
+    query_text = data.get('query', '').strip()
+
+    if not query_text:
+        return jsonify({
+            'success': False,
+            'message': 'Query cannot be empty.'
+        }), 400
+
+    user_id = session['user_id']
+    concierge = get_concierge()
+    route = concierge.route_query(query_text)
+
+    def events():
+        yield _sse({'intent': route.intent}, 'intent')
+        try:
+            for piece in concierge.stream_natural_language_response(query_text, user_id, route=route):
+                yield _sse({'text': piece})
+        except Exception:
+            logger.exception("Concierge stream failed for %r", query_text)
+            yield _sse({'message': 'The concierge could not finish this answer.'}, 'error')
+        yield _sse({}, 'done')
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @concierge_bp.route('/api/query', methods=['POST'])
 @login_required
+@rate_limited('concierge_query')
 def structured_query():
     """
     Handle structured API queries to the concierge.
@@ -65,8 +119,10 @@ def structured_query():
 
     # Remove query_type from params
     params = {k: v for k, v in data.items() if k != 'query_type'}
+    if query_type == 'resource_recommendations':
+        params['user_id'] = session['user_id']
 
     # Execute query
-    result = concierge.answer_query(query_type, **params)
+    result = get_concierge().answer_query(query_type, **params)
 
     return jsonify(result)
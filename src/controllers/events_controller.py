@@ -0,0 +1,53 @@
+"""Events controller - Server-Sent Events stream of a user's live updates."""
+
+import json
+from flask import Blueprint, Response, session, stream_with_context
+from src.controllers.auth_controller import login_required
+from src.utils.event_bus import event_bus
+
+events_bp = Blueprint('events', __name__, url_prefix='/events')
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+# Milliseconds the browser waits before reconnecting
+RETRY_MILLISECONDS = 3000
+
+
+def format_event(event):
+    """Serialize a bus event as an SSE frame."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def event_stream(subscription, heartbeat=HEARTBEAT_SECONDS):
+    """
+    Yield SSE frames for a subscription until the client goes away.
+
+    A heartbeat comment is sent whenever no event arrives for `heartbeat`
+    seconds; writing it is how a dropped connection is noticed.
+    """
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            event = subscription.next_event(timeout=heartbeat)
+            if subscription.overflowed:
+                # Too far behind: have the page refetch rather than replay a backlog
+                yield "event: resync\ndata: {}\n\n"
+                return
+            yield format_event(event) if event else ": heartbeat\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@events_bp.route('/stream')
+@login_required
+def stream():
+    """Stream new messages and booking status changes to the signed-in user."""
+    subscription = event_bus.subscribe(session['user_id'])
+    return Response(
+        stream_with_context(event_stream(subscription)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        }
+    )
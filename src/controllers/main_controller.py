@@ -4,6 +4,7 @@ from flask import Blueprint, render_template, session
 from src.data_access.database import Database
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.booking_dal import BookingDAL
+from src.data_access.recommendation_dal import RecommendationDAL
 from src.controllers.auth_controller import login_required
 
 main_bp = Blueprint('main', __name__)
@@ -11,13 +12,14 @@ main_bp = Blueprint('main', __name__)
 db = Database()
 resource_dal = ResourceDAL(db)
 booking_dal = BookingDAL(db)
+recommendation_dal = RecommendationDAL(db)
 
 
 @main_bp.route('/')
 def index():
     """Homepage."""
     featured_resources = resource_dal.get_top_rated_resources(limit=6)
-    categories = resource_dal.get_categories()
+    categories = resource_dal.catalog.get_categories()
     return render_template('index.html',
                          featured_resources=featured_resources,
                          categories=categories)
@@ -41,8 +43,14 @@ def dashboard():
     # Get upcoming bookings
     upcoming_bookings = booking_dal.get_upcoming_bookings(user_id)
 
+    # Precomputed from booking history; new users fall back to top rated
+    recommended_resources = recommendation_dal.get_recommendations(user_id, limit=6)
+    if not recommended_resources:
+        recommended_resources = resource_dal.get_top_rated_resources(limit=6)
+
     return render_template('dashboard.html',
                          my_resources=my_resources,
                          my_bookings=my_bookings,
                          bookings_for_my_resources=bookings_for_my_resources,
-                         upcoming_bookings=upcoming_bookings)
+                         upcoming_bookings=upcoming_bookings,
+                         recommended_resources=recommended_resources)
@@ -1,6 +1,6 @@
 """Message controller - handles messaging between users."""
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from src.data_access.database import Database
 from src.data_access.message_dal import MessageDAL
 from src.data_access.user_dal import UserDAL
@@ -13,6 +13,9 @@ db = Database()
 message_dal = MessageDAL(db)
 user_dal = UserDAL(db)
 
+# Messages loaded per page of a thread
+THREAD_PAGE_SIZE = 50
+
 
 @message_bp.route('/')
 @login_required
@@ -22,24 +25,82 @@ def inbox():
     return render_template('messages/inbox.html', threads=threads)
 
 
+@message_bp.route('/unread')
+@login_required
+def unread_counts():
+    """
+    Unread totals for the navigation badge (JSON).
+
+    The ETag is the user's counter version, so a poll with a matching
+    If-None-Match gets an empty 304 after one primary-key read.
+    """
+    user_id = session['user_id']
+    counts = message_dal.get_unread_counts(user_id)
+    etag = f"unread-{user_id}-{counts['version']}"
+    response = jsonify({
+        'unread_messages': counts['unread_messages'],
+        'unread_threads': counts['unread_threads']
+    })
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
 @message_bp.route('/thread/<int:thread_id>')
 @login_required
 def view_thread(thread_id):
-    """View a message thread."""
-    messages = message_dal.get_thread_messages(thread_id)
+    """View the newest page of a message thread."""
+    user_id = session['user_id']
 
     # Verify user is part of this thread
-    if messages:
-        user_id = session['user_id']
-        is_participant = any(m['sender_id'] == user_id or m['receiver_id'] == user_id for m in messages)
-        if not is_participant:
-            flash('You do not have access to this conversation.', 'danger')
-            return redirect(url_for('message.inbox'))
-    else:
+    other_user_id = message_dal.get_other_participant(thread_id, user_id)
+    if other_user_id is None:
+        flash('You do not have access to this conversation.', 'danger')
+        return redirect(url_for('message.inbox'))
+
+    messages, older_cursor = message_dal.get_thread_page(thread_id, limit=THREAD_PAGE_SIZE)
+    if not messages:
         flash('No messages found.', 'info')
         return redirect(url_for('message.inbox'))
 
-    return render_template('messages/thread.html', messages=messages, thread_id=thread_id)
+    message_dal.mark_thread_read(thread_id, user_id)
+
+    return render_template('messages/thread.html',
+                         messages=list(reversed(messages)),
+                         thread_id=thread_id,
+                         other_user=user_dal.get_user_by_id(other_user_id),
+                         older_cursor=older_cursor)
+
+
+@message_bp.route('/thread/<int:thread_id>/older')
+@login_required
+def older_messages(thread_id):
+    """
+    Fetch the page of messages before a cursor (JSON, newest first).
+
+    Query params:
+        before: message_id cursor returned with the previous page
+    """
+    if message_dal.get_other_participant(thread_id, session['user_id']) is None:
+        return jsonify({'error': 'Not found'}), 404
+
+    before = request.args.get('before', type=int)
+    messages, next_cursor = message_dal.get_thread_page(
+        thread_id, before_id=before, limit=THREAD_PAGE_SIZE
+    )
+    return jsonify({
+        'messages': [
+            {
+                'message_id': m['message_id'],
+                'sender_id': m['sender_id'],
+                'sender_name': m['sender_name'],
+                'content': m['content'],
+                'timestamp': m['timestamp']
+            }
+            for m in messages
+        ],
+        'next_cursor': next_cursor
+    })
 
 
 @message_bp.route('/send/<int:receiver_id>', methods=['GET', 'POST'])
@@ -83,16 +144,12 @@ def reply_to_thread(thread_id):
         flash('Message cannot be empty.', 'danger')
         return redirect(url_for('message.view_thread', thread_id=thread_id))
 
-    # Get thread messages to find the other user
-    messages = message_dal.get_thread_messages(thread_id)
-    if not messages:
-        flash('Thread not found.', 'danger')
-        return redirect(url_for('message.inbox'))
-
     # Find receiver (the other person in the conversation)
     user_id = session['user_id']
-    first_message = messages[0]
-    receiver_id = first_message['sender_id'] if first_message['receiver_id'] == user_id else first_message['receiver_id']
+    receiver_id = message_dal.get_other_participant(thread_id, user_id)
+    if receiver_id is None:
+        flash('Thread not found.', 'danger')
+        return redirect(url_for('message.inbox'))
 
     content = sanitize_string(content, 2000)
     message_id = message_dal.create_message(thread_id, user_id, receiver_id, content)
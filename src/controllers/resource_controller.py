@@ -3,10 +3,11 @@ Resource controller.
 Handles resource CRUD operations and search functionality.
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from src.data_access.database import Database
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.review_dal import ReviewDAL
+from src.data_access.resource_catalog import SORT_NEWEST, SORT_OPTIONS
 from src.controllers.auth_controller import login_required
 from src.utils.validators import validate_resource_title, sanitize_string
 import json
@@ -18,6 +19,10 @@ db = Database()
 resource_dal = ResourceDAL(db)
 review_dal = ReviewDAL(db)
 
+RESOURCES_PER_PAGE = 24
+MAX_SUGGESTIONS = 20
+SIMILAR_RESOURCES = 4
+
 
 @resource_bp.route('/')
 def list_resources():
@@ -25,36 +30,61 @@ def list_resources():
     keyword = request.args.get('keyword', '').strip()
     category = request.args.get('category', '').strip()
     location = request.args.get('location', '').strip()
+    capacity = request.args.get('capacity', '').strip()
+    sort = request.args.get('sort', SORT_NEWEST)
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    if sort not in SORT_OPTIONS:
+        sort = SORT_NEWEST
 
-    # Search resources
-    resources = resource_dal.search_resources(
+    # Search the in-memory catalog (ratings and facet counts come back together)
+    result = resource_dal.catalog.faceted_search(
         keyword=keyword if keyword else None,
         category=category if category else None,
-        location=location if location else None
+        location=location if location else None,
+        capacity=capacity if capacity else None,
+        sort=sort,
+        page=page,
+        per_page=RESOURCES_PER_PAGE
     )
+    total = result['total']
 
     # Get categories for filter dropdown
-    categories = resource_dal.get_categories()
-
-    # Add rating info to each resource
-    resources_with_ratings = []
-    for resource in resources:
-        resource_dict = dict(resource)
-        rating_info = review_dal.get_average_rating(resource['resource_id'])
-        resource_dict['avg_rating'] = rating_info['avg_rating']
-        resource_dict['review_count'] = rating_info['review_count']
-        resources_with_ratings.append(resource_dict)
+    categories = resource_dal.catalog.get_categories()
 
     return render_template(
         'resources/list.html',
-        resources=resources_with_ratings,
+        resources=result['resources'],
+        facets=result['facets'],
         categories=categories,
         keyword=keyword,
         category=category,
-        location=location
+        location=location,
+        capacity=capacity,
+        sort=sort,
+        page=page,
+        total=total,
+        total_pages=max((total + RESOURCES_PER_PAGE - 1) // RESOURCES_PER_PAGE, 1)
     )
 
 
+@resource_bp.route('/suggest')
+def suggest():
+    """
+    Typeahead suggestions for the search box.
+
+    Served from the catalog's in-memory prefix index, so it never queries
+    SQLite and is cheap enough to call on every keystroke.
+    """
+    prefix = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 8, type=int), 1), MAX_SUGGESTIONS)
+
+    return jsonify({
+        'query': prefix,
+        'suggestions': resource_dal.catalog.suggest(prefix, limit)
+    })
+
+
 @resource_bp.route('/<int:resource_id>')
 def view_resource(resource_id):
     """View resource details."""
@@ -73,12 +103,21 @@ def view_resource(resource_id):
     if 'user_id' in session:
         user_has_reviewed = review_dal.user_has_reviewed(resource_id, session['user_id'])
 
+    # Similar resources from the TF-IDF index, displayed from the catalog
+    similar_resources = []
+    for similar_id, score in resource_dal.vectors.similar(resource_id, k=SIMILAR_RESOURCES):
+        similar = resource_dal.catalog.get(similar_id)
+        if similar:
+            similar['similarity'] = round(score, 2)
+            similar_resources.append(similar)
+
     return render_template(
         'resources/view.html',
         resource=resource,
         reviews=reviews,
         rating_info=rating_info,
-        user_has_reviewed=user_has_reviewed
+        user_has_reviewed=user_has_reviewed,
+        similar_resources=similar_resources
     )
 
 
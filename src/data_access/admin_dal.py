@@ -3,7 +3,17 @@ Data Access Layer for Admin operations.
 Encapsulates database interactions for admin logs and analytics.
 """
 
+from src.data_access.audit_log import get_audit_writer
 from src.data_access.database import Database
+from src.data_access.demand_heatmap import get_demand_heatmap
+from src.data_access.rollup_dal import BookingRollupDAL
+from src.data_access.utilization_dal import UtilizationDAL
+from src.utils.snapshot import get_snapshot
+
+# Seconds system stats are served without recomputing when nothing changed
+STATS_TTL = 60
+# Tables whose writes make the system stats stale
+STATS_TABLES = ('users', 'resources', 'bookings', 'reviews')
 
 
 class AdminDAL:
@@ -12,28 +22,38 @@ class AdminDAL:
     def __init__(self, db: Database):
         """Initialize AdminDAL with database connection."""
         self.db = db
+        self.audit = get_audit_writer(db)
+        self.rollups = BookingRollupDAL(db)
+        self.utilization = UtilizationDAL(db)
+        self.demand = get_demand_heatmap(db)
+        self.stats_snapshot = get_snapshot(
+            (db.db_path, 'system_stats'), self.get_system_stats,
+            db=db, tables=STATS_TABLES, ttl=STATS_TTL
+        )
 
     def log_action(self, admin_id, action, target_table, details=None):
         """
         Log an admin action.
 
+        The record is queued and committed in a batch by the audit log
+        writer within a fraction of a second (see audit_log); call
+        flush_logs() to wait for it.
+
         Args:
             admin_id: ID of admin performing action
             action: Description of action
             target_table: Table affected
             details: Optional additional details
-
-        Returns:
-            log_id of created log entry
         """
-        query = """
-            INSERT INTO admin_logs (admin_id, action, target_table, details)
-            VALUES (?, ?, ?, ?)
-        """
-        return self.db.execute_query(query, (admin_id, action, target_table, details))
+        self.audit.log(admin_id, action, target_table, details)
+
+    def flush_logs(self):
+        """Wait until every logged action is committed; True if all were."""
+        return self.audit.flush()
 
     def get_admin_logs(self, limit=100):
-        """Get recent admin logs."""
+        """Get recent admin logs, including actions still queued for writing."""
+        self.audit.flush()
         query = """
             SELECT al.*, u.name as admin_name
             FROM admin_logs al
@@ -43,8 +63,17 @@ class AdminDAL:
         """
         return self.db.execute_query(query, (limit,), fetch_all=True)
 
+    def get_cached_system_stats(self):
+        """
+        Get system-wide statistics from the shared snapshot.
+
+        Refreshed after STATS_TTL seconds or once a stats table is written,
+        with stale-while-revalidate reads. The result is shared: do not mutate it.
+        """
+        return self.stats_snapshot.get()
+
     def get_system_stats(self):
-        """Get system-wide statistics."""
+        """Get system-wide statistics (runs every aggregate query)."""
         stats = {}
 
         # Total users by role
@@ -82,26 +111,45 @@ class AdminDAL:
 
         return stats
 
-    def get_usage_by_category(self):
-        """Get booking statistics by resource category."""
-        query = """
-            SELECT r.category, COUNT(b.booking_id) as booking_count
-            FROM resources r
-            LEFT JOIN bookings b ON r.resource_id = b.resource_id
-            WHERE r.category IS NOT NULL AND b.status IN ('approved', 'completed')
-            GROUP BY r.category
-            ORDER BY booking_count DESC
+    def get_usage_by_category(self, start_day=None, end_day=None):
         """
-        return self.db.execute_query(query, fetch_all=True)
+        Get booking statistics by resource category.
 
-    def get_usage_by_department(self):
-        """Get booking statistics by user department."""
-        query = """
-            SELECT u.department, COUNT(b.booking_id) as booking_count
-            FROM users u
-            JOIN bookings b ON u.user_id = b.requester_id
-            WHERE u.department IS NOT NULL AND b.status IN ('approved', 'completed')
-            GROUP BY u.department
-            ORDER BY booking_count DESC
+        Reads the daily rollup, so any date range costs the same as a few
+        rows per day rather than a scan of bookings.
+
+        Args:
+            start_day: Optional first day, 'YYYY-MM-DD' (inclusive)
+            end_day: Optional last day, 'YYYY-MM-DD' (inclusive)
+        """
+        return self.rollups.get_usage_by_category(start_day, end_day)
+
+    def get_usage_by_department(self, start_day=None, end_day=None):
+        """Get booking statistics by user department (from the daily rollup)."""
+        return self.rollups.get_usage_by_department(start_day, end_day)
+
+    def get_utilization(self, start_day, end_day):
+        """
+        Get booked vs available hours per resource, building and week.
+
+        Args:
+            start_day: First day (date)
+            end_day: Last day (date), inclusive
+
+        Returns:
+            Utilization report, see UtilizationDAL.get_utilization
+        """
+        return self.utilization.get_utilization(start_day, end_day)
+
+    def get_demand_heatmap(self, dimension='category', key=None):
+        """
+        Get requested hours per hour of the week.
+
+        Args:
+            dimension: 'category', 'location' or 'resource'
+            key: Value of the dimension to show, or None for all requests
+
+        Returns:
+            Heatmap payload, see DemandHeatmap.get
         """
-        return self.db.execute_query(query, fetch_all=True)
+        return self.demand.get(dimension, key)
@@ -0,0 +1,253 @@
+"""
+Asynchronous, batched writer for the admin audit log.
+
+AdminDAL.log_action() only appends a record to an in-memory queue; one
+background thread per database file drains it and writes each batch with
+a single executemany and commit. An admin request therefore pays for a
+queue put rather than an INSERT plus the fsync of its commit, and a bulk
+operation logging hundreds of actions costs one commit per batch instead
+of one per action.
+
+- A batch is written once BATCH_SIZE records are waiting or FLUSH_INTERVAL
+  seconds after its first record arrived, whichever comes first.
+- The queue is bounded. When it is full (the writer is stuck or far
+  behind) the caller writes its record synchronously instead, so overload
+  slows admin requests down rather than dropping audit records.
+- A failed batch is kept and retried on the next cycle.
+- Every writer is flushed at interpreter exit, and flush() waits until
+  everything logged so far is committed (reads of the log call it first).
+
+Records carry the time they were logged, so the timestamp column is the
+time of the action, not of the write.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from src.data_access.database import Database
+
+logger = logging.getLogger(__name__)
+
+# Records written per executemany
+BATCH_SIZE = 500
+# Seconds a record waits at most before its batch is written
+FLUSH_INTERVAL = 0.5
+# Records buffered before callers fall back to synchronous writes
+MAX_QUEUE_SIZE = 10_000
+# Seconds between retries of a batch that failed to write
+RETRY_INTERVAL = 2.0
+
+_INSERT = """
+    INSERT INTO admin_logs (admin_id, action, target_table, details, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+# Queue item that only wakes the writer up
+_WAKE = object()
+
+
+def _utc_timestamp():
+    """Current time in the format of SQLite's CURRENT_TIMESTAMP."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class AuditLogWriter:
+    """Queues audit records and writes them in batches on a daemon thread."""
+
+    def __init__(self, db: Database, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 maxsize=MAX_QUEUE_SIZE):
+        """
+        Initialize an idle writer; its thread starts with the first record.
+
+        Args:
+            db: Database holding admin_logs
+            batch_size: Records written per executemany
+            flush_interval: Seconds a record waits at most before being written
+            maxsize: Queue bound before callers write synchronously
+        """
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._stopping = False
+        # Set by flush() and close(): write what is queued without waiting
+        self._hurry = threading.Event()
+        self._leftover = []
+        # Records accepted into the queue and records committed from it
+        self._queued = 0
+        self._written = 0
+        self.batches = 0
+        self.sync_writes = 0
+        self.failures = 0
+
+    def log(self, admin_id, action, target_table, details=None):
+        """
+        Queue one audit record.
+
+        Writes it synchronously when the queue is full or the writer is
+        closed, so a record is never dropped.
+        """
+        record = (admin_id, action, target_table, details, _utc_timestamp())
+        with self._lock:
+            if not self._stopping:
+                try:
+                    self._queue.put_nowait(record)
+                except queue.Full:
+                    pass
+                else:
+                    self._queued += 1
+                    self._start()
+                    return
+            self.sync_writes += 1
+        self._write([record])
+
+    def _start(self):
+        """Start the writer thread if it is not running (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._thread.start()
+
+    def _write(self, records):
+        """Insert records in one transaction."""
+        with self.db.get_connection() as conn:
+            conn.executemany(_INSERT, records)
+
+    def _fill(self, batch):
+        """
+        Top batch up from the queue until it is full or FLUSH_INTERVAL has passed.
+
+        In a hurry (flush or close asked, or a _WAKE was taken) the queue is
+        drained without waiting. Finding it empty then answers the request,
+        so _hurry is cleared: otherwise a leftover _hurry would make every
+        later call return at once and the thread would spin.
+        """
+        deadline = None
+        hurry = False
+        while len(batch) < self.batch_size:
+            if hurry or self._hurry.is_set():
+                timeout = 0
+            elif batch:
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                timeout = deadline - time.monotonic()
+            else:
+                timeout = self.flush_interval
+            try:
+                record = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                if timeout <= 0 and not self._stopping:
+                    self._hurry.clear()
+                return
+            if record is _WAKE:
+                hurry = True
+            else:
+                batch.append(record)
+
+    def _wake(self):
+        """Interrupt the writer's wait for more records (after setting _hurry)."""
+        self._hurry.set()
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass  # a full queue never makes the writer wait
+
+    def _run(self):
+        """Thread body: write batches until stopped and the queue is empty."""
+        batch = []
+        while True:
+            self._fill(batch)
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Writing %d audit log records failed; retrying", len(batch))
+                    if self._stopping:
+                        self._leftover = batch
+                        return
+                    time.sleep(RETRY_INTERVAL)
+                    continue
+                with self._lock:
+                    self._written += len(batch)
+                    self.batches += 1
+                    self._done.notify_all()
+                batch = []
+            elif self._stopping:
+                return
+
+    def flush(self, timeout=10.0):
+        """
+        Wait until every record queued so far is committed.
+
+        Args:
+            timeout: Seconds to wait at most
+
+        Returns:
+            True if everything was written within the timeout
+        """
+        with self._lock:
+            target = self._queued
+            if self._written >= target:
+                return True
+            self._wake()
+            return self._done.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout=10.0):
+        """
+        Write everything still queued and stop the thread.
+
+        Records logged after close() are written synchronously.
+        """
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        self._wake()
+        if thread is not None:
+            thread.join(timeout)
+        leftover = self._leftover
+        self._leftover = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not _WAKE:
+                leftover.append(record)
+        if leftover:
+            try:
+                self._write(leftover)
+            except Exception:
+                logger.exception("Lost %d audit log records at shutdown", len(leftover))
+                return
+            with self._lock:
+                self._written += len(leftover)
+                self._done.notify_all()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_audit_writer(db: Database):
+    """Get the process-wide audit log writer of a database file."""
+    with _writers_lock:
+        writer = _writers.get(db.db_path)
+        if writer is None:
+            writer = AuditLogWriter(db)
+            _writers[db.db_path] = writer
+        return writer
+
+
+@atexit.register
+def clear_audit_writers():
+    """Flush and forget all writers (at exit, or when a database file is recreated)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
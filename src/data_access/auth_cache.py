@@ -0,0 +1,90 @@
+"""
+Process-wide cache of each user's role and auth_version.
+
+role_required used to read the users table on every protected request.
+It now asks an AuthVersionCache, which answers from memory:
+
+- UserDAL.update_role() bumps users.auth_version and UserDAL.delete_user()
+  removes the row; both drop the user's entry here, so a revocation made
+  in this process applies from the very next request.
+- Entries expire after ttl seconds, which bounds how long a change made by
+  another worker process goes unnoticed.
+
+A session records the auth_version it logged in with; once the stored
+version differs (or the user is gone) the session no longer authorizes
+anything and the user has to log in again.
+"""
+
+import threading
+import time
+from src.data_access.database import Database
+
+# Seconds an entry is trusted without re-reading the users table
+DEFAULT_TTL = 5.0
+# Entries kept before the cache starts over (bounds memory, not correctness)
+MAX_ENTRIES = 50_000
+
+
+class AuthVersionCache:
+    """Maps user_id to (role, auth_version), re-read after a TTL or invalidation."""
+
+    def __init__(self, db: Database, ttl=DEFAULT_TTL):
+        """Initialize an empty cache for a database."""
+        self.db = db
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        """
+        Get a user's current role and auth_version.
+
+        Returns:
+            (role, auth_version), or None if the user does not exist
+        """
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() < entry[1]:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        invalidations = self._invalidations
+        row = self.db.execute_query(
+            "SELECT role, auth_version FROM users WHERE user_id = ?", (user_id,), fetch_one=True
+        )
+        value = (row['role'], row['auth_version']) if row else None
+        with self._lock:
+            # Not cached if an invalidation raced the read: the row may predate it
+            if invalidations == self._invalidations:
+                if len(self._entries) >= MAX_ENTRIES:
+                    self._entries.clear()
+                self._entries[user_id] = (value, time.monotonic() + self.ttl)
+        return value
+
+    def invalidate(self, user_id):
+        """Forget a user's entry so the next check reads the users table."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidations += 1
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_auth_cache(db: Database):
+    """Get the process-wide auth cache of a database file."""
+    with _caches_lock:
+        cache = _caches.get(db.db_path)
+        if cache is None:
+            cache = AuthVersionCache(db)
+            _caches[db.db_path] = cache
+        return cache
+
+
+def clear_auth_caches():
+    """Forget all auth caches (used when a database file is recreated)."""
+    with _caches_lock:
+        _caches.clear()
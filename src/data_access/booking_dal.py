@@ -4,6 +4,7 @@ Encapsulates all database interactions for the bookings table.
 """
 
 from src.data_access.database import Database
+from src.utils.event_bus import event_bus
 from datetime import datetime
 
 
@@ -59,10 +60,24 @@ class BookingDAL:
         """
         try:
             self.db.execute_query(query, (status, booking_id))
-            return True
         except Exception:
             return False
 
+        booking = self.db.execute_query("""
+            SELECT b.booking_id, b.resource_id, b.requester_id, r.owner_id, r.title as resource_title
+            FROM bookings b
+            JOIN resources r ON b.resource_id = r.resource_id
+            WHERE b.booking_id = ?
+        """, (booking_id,), fetch_one=True)
+        if booking:
+            event_bus.publish((booking['requester_id'], booking['owner_id']), 'booking_status', {
+                'booking_id': booking_id,
+                'resource_id': booking['resource_id'],
+                'resource_title': booking['resource_title'],
+                'status': status
+            })
+        return True
+
     def get_bookings_by_requester(self, requester_id):
         """Get all bookings made by a user."""
         query = """
@@ -118,6 +133,26 @@ class BookingDAL:
         result = self.db.execute_query(query, tuple(params), fetch_one=True)
         return result['conflict_count'] > 0 if result else False
 
+    def record_attempt(self, resource_id, requester_id, start_datetime, end_datetime, outcome='conflict'):
+        """
+        Record a booking request that was turned away, for demand analytics.
+
+        Args:
+            resource_id: Resource that was requested
+            requester_id: User who asked
+            start_datetime: Requested start time
+            end_datetime: Requested end time
+            outcome: Why no booking was created
+
+        Returns:
+            attempt_id of the recorded attempt
+        """
+        query = """
+            INSERT INTO booking_attempts (resource_id, requester_id, start_datetime, end_datetime, outcome)
+            VALUES (?, ?, ?, ?, ?)
+        """
+        return self.db.execute_query(query, (resource_id, requester_id, start_datetime, end_datetime, outcome))
+
     def get_pending_bookings(self):
         """Get all pending bookings (for admin/staff approval)."""
         query = """
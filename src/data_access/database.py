@@ -5,8 +5,17 @@ Provides database connection management and schema setup.
 
 import sqlite3
 import os
+import threading
 from contextlib import contextmanager
 from src.models.schema import SCHEMA
+from src.models.migrations import apply_migrations
+
+
+_WRITE_ACTIONS = (sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE)
+
+# Per database file: table name -> number of committed writes seen in this process
+_generations = {}
+_generations_lock = threading.Lock()
 
 
 class Database:
@@ -15,6 +24,8 @@ class Database:
     def __init__(self, db_path='campus_hub.db'):
         """Initialize database connection manager."""
         self.db_path = db_path
+        with _generations_lock:
+            self._generations = _generations.setdefault(db_path, {})
         self.init_db()
 
     @contextmanager
@@ -22,6 +33,15 @@ class Database:
         """Context manager for database connections."""
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        written = set()
+
+        def track_writes(action, table, column, database, trigger):
+            if action in _WRITE_ACTIONS:
+                written.add(table)
+            return sqlite3.SQLITE_OK
+
+        # Called when statements are prepared, not per row
+        conn.set_authorizer(track_writes)
         try:
             yield conn
             conn.commit()
@@ -30,11 +50,32 @@ class Database:
             raise
         finally:
             conn.close()
+        if written:
+            self._bump(written)
+
+    def _bump(self, tables):
+        """Advance the generation of tables whose writes were committed."""
+        with _generations_lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+
+    def generation(self, *tables):
+        """
+        Get a token that changes whenever any of the tables is written.
+
+        Only writes committed through this process are seen; pair it with a
+        TTL for writes made by other processes.
+        """
+        generations = self._generations
+        return tuple(generations.get(table, 0) for table in tables)
 
     def init_db(self):
-        """Initialize the database with schema."""
+        """Initialize the database with schema and pending migrations."""
         with self.get_connection() as conn:
+            # Takes effect only on a new, empty file (see retention_dal)
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
             conn.executescript(SCHEMA)
+            apply_migrations(conn)
 
     def execute_query(self, query, params=(), fetch_one=False, fetch_all=False):
         """
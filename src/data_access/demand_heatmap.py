@@ -0,0 +1,207 @@
+"""
+Hour-of-week demand heatmap over booking requests.
+
+Demand is every requested booking hour, whatever became of the request:
+rows in bookings (pending, approved, rejected, cancelled or completed) plus
+booking_attempts, the requests turned away before a booking existed
+(time conflicts). Each request adds its minutes to the 7 x 24 hour-of-week
+bins it covers; a 23:00-01:00 request counts in both days.
+
+The aggregate is a NumPy array of 168 bins per resource id for requests and
+another for conflicted attempts. It remembers the last booking_id and
+attempt_id folded in, so a refresh reads only rows added since (ids are
+autoincrement and history is never rewritten). Category and location
+heatmaps are sums over resources using their current category and
+location. The first use in a process folds in the whole history once, in
+batches.
+"""
+
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from src.data_access.utilization_dal import HOURS_PER_WEEK, hourly_occupancy
+
+DIMENSIONS = ('category', 'location', 'resource')
+DAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+# Longest request counted, in minutes (bookings are limited to 7 days)
+MAX_REQUEST_MINUTES = 7 * 1440
+# Seconds resource categories/locations are reused before re-reading them
+MAPPING_TTL = 60
+
+# Rows folded in per query
+_BATCH_SIZE = 200_000
+
+_SOURCES = {
+    'requests': ('bookings', 'booking_id'),
+    'conflicts': ('booking_attempts', 'attempt_id'),
+}
+
+
+def week_minutes(rows, jd_starts, jd_ends, row_count):
+    """
+    Spread requests over hour-of-week bins.
+
+    Args:
+        rows: Row (0..row_count-1) of each request
+        jd_starts, jd_ends: Request bounds as SQLite julianday() values
+        row_count: Number of output rows
+
+    Returns:
+        float32 array (row_count, 168) of requested minutes, Monday 00:00 first
+    """
+    # Julian day numbers start on a Monday, so this is the minute of the week
+    starts = np.rint(((jd_starts + 0.5) % 7) * 1440).astype(np.int64)
+    durations = np.clip(np.rint((jd_ends - jd_starts) * 1440).astype(np.int64), 0, MAX_REQUEST_MINUTES)
+    # Two weeks of bins so requests running past Sunday midnight need no split
+    grid = hourly_occupancy(rows, starts, starts + durations, row_count, 2 * HOURS_PER_WEEK, cap=None)
+    return grid[:, :HOURS_PER_WEEK] + grid[:, HOURS_PER_WEEK:]
+
+
+class DemandHeatmap:
+    """Incrementally maintained hour-of-week demand per resource."""
+
+    def __init__(self, db):
+        """Initialize an empty heatmap bound to a database."""
+        self.db = db
+        self._lock = threading.Lock()
+        self._minutes = {source: np.zeros((0, HOURS_PER_WEEK)) for source in _SOURCES}
+        self._last_ids = {source: 0 for source in _SOURCES}
+        self._resources = None
+        self._resources_at = None
+        self._resources_generation = None
+        self.rows_read = 0
+
+    def _grow(self, size):
+        """Make room for resource ids below size (caller holds the lock)."""
+        for source, minutes in self._minutes.items():
+            if size > len(minutes):
+                grown = np.zeros((max(size, 2 * len(minutes)), HOURS_PER_WEEK))
+                grown[:len(minutes)] = minutes
+                self._minutes[source] = grown
+
+    def _fold(self, source):
+        """Add requests newer than the last folded id (caller holds the lock)."""
+        table, id_column = _SOURCES[source]
+        query = f"""
+            SELECT {id_column}, resource_id, julianday(start_datetime), julianday(end_datetime)
+            FROM {table}
+            WHERE {id_column} > ?
+            ORDER BY {id_column}
+            LIMIT ?
+        """
+        while True:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                rows = cursor.execute(query, (self._last_ids[source], _BATCH_SIZE)).fetchall()
+            if not rows:
+                return
+            data = np.fromiter(
+                itertools.chain.from_iterable(rows), dtype=np.float64, count=4 * len(rows)
+            ).reshape(-1, 4)
+            resource_ids, rows_of = np.unique(data[:, 1].astype(np.int64), return_inverse=True)
+            self._grow(int(resource_ids[-1]) + 1)
+            self._minutes[source][resource_ids] += week_minutes(rows_of, data[:, 2], data[:, 3], len(resource_ids))
+            self._last_ids[source] = int(data[-1, 0])
+            self.rows_read += len(rows)
+            if len(rows) < _BATCH_SIZE:
+                return
+
+    def refresh(self):
+        """Fold in requests and attempts added since the last refresh."""
+        with self._lock:
+            for source in _SOURCES:
+                self._fold(source)
+
+    def _resource_keys(self):
+        """Current {resource_id: (category, location)}, re-read after resource writes or MAPPING_TTL."""
+        generation = self.db.generation('resources')
+        if (self._resources is None or generation != self._resources_generation
+                or time.monotonic() - self._resources_at > MAPPING_TTL):
+            rows = self.db.execute_query(
+                "SELECT resource_id, category, location FROM resources", fetch_all=True
+            )
+            self._resources = {
+                row['resource_id']: (row['category'] or '', row['location'] or '') for row in rows or []
+            }
+            self._resources_generation = generation
+            self._resources_at = time.monotonic()
+        return self._resources
+
+    def get(self, dimension='category', key=None):
+        """
+        Get the heatmap of one category, location or resource, or of everything.
+
+        Args:
+            dimension: One of DIMENSIONS
+            key: Category or location name, or resource id; None for all requests
+
+        Returns:
+            Dictionary with 'days', 'demand' and 'conflicts' (7 x 24 lists of
+            requested hours), the 'peak' bin, the 'keys' available for the
+            dimension (not for resources) and 'total_hours'
+
+        Raises:
+            ValueError: If dimension is unknown or a resource key is not a number
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension}")
+        if dimension == 'resource' and key is not None:
+            if not str(key).isdigit():
+                raise ValueError("Resource key must be a resource id")
+            key = int(key)
+        self.refresh()
+        resources = self._resource_keys()
+        with self._lock:
+            size = len(self._minutes['requests'])
+            if key is None:
+                selected = slice(None)
+            elif dimension == 'resource':
+                selected = [key] if key < size else []
+            else:
+                position = DIMENSIONS.index(dimension)
+                selected = [
+                    resource_id for resource_id, values in resources.items()
+                    if values[position] == key and resource_id < size
+                ]
+            heatmaps = {source: minutes[selected].sum(axis=0) / 60 for source, minutes in self._minutes.items()}
+
+        demand = heatmaps['requests'] + heatmaps['conflicts']
+        peak = int(demand.argmax())
+        payload = {
+            'dimension': dimension,
+            'key': key,
+            'days': list(DAY_NAMES),
+            'demand': np.round(demand, 1).reshape(7, 24).tolist(),
+            'conflicts': np.round(heatmaps['conflicts'], 1).reshape(7, 24).tolist(),
+            'peak': {'day': DAY_NAMES[peak // 24], 'hour': peak % 24, 'hours': round(float(demand[peak]), 1)}
+                    if demand[peak] > 0 else None,
+            'total_hours': round(float(demand.sum()), 1),
+        }
+        if dimension != 'resource':
+            position = DIMENSIONS.index(dimension)
+            payload['keys'] = sorted({values[position] for values in resources.values()} - {''})
+        return payload
+
+
+_heatmaps = {}
+_heatmaps_lock = threading.Lock()
+
+
+def get_demand_heatmap(db):
+    """Get the shared demand heatmap for a database file."""
+    with _heatmaps_lock:
+        heatmap = _heatmaps.get(db.db_path)
+        if heatmap is None:
+            heatmap = DemandHeatmap(db)
+            _heatmaps[db.db_path] = heatmap
+        return heatmap
+
+
+def clear_demand_heatmaps():
+    """Forget all demand heatmaps (used when a database file is recreated)."""
+    with _heatmaps_lock:
+        _heatmaps.clear()
@@ -0,0 +1,129 @@
+"""
+Data Access Layer for bulk exports of bookings, reviews and admin logs.
+
+Rows are read in primary-key order in fixed-size batches, each batch its
+own short query (keyset pagination: WHERE id > last id ... LIMIT n). Memory
+stays at one batch however many rows match, and no read transaction is
+held open while a slow client downloads, so writers are never blocked by
+an export. Rows committed during an export are included if their id is
+past the current position.
+"""
+
+from datetime import timedelta
+from src.data_access.database import Database
+
+# Rows read per query
+BATCH_SIZE = 5000
+
+
+class ExportSpec:
+    """Columns, types and filter columns of one exportable table."""
+
+    def __init__(self, table, key, columns, date_column, status_column=None):
+        """
+        Describe an exportable table.
+
+        Args:
+            table: Table name
+            key: Integer primary key used for keyset pagination
+            columns: List of (column, type) with type 'int', 'float' or 'str'
+            date_column: Column the start/end day filter applies to
+            status_column: Column the status filter applies to, if any
+        """
+        self.table = table
+        self.key = key
+        self.columns = columns
+        self.date_column = date_column
+        self.status_column = status_column
+
+    @property
+    def column_names(self):
+        """Column names in export order."""
+        return [name for name, _ in self.columns]
+
+
+EXPORTS = {
+    'bookings': ExportSpec('bookings', 'booking_id', [
+        ('booking_id', 'int'), ('resource_id', 'int'), ('requester_id', 'int'),
+        ('start_datetime', 'str'), ('end_datetime', 'str'), ('status', 'str'),
+        ('notes', 'str'), ('created_at', 'str'), ('updated_at', 'str'),
+    ], date_column='start_datetime', status_column='status'),
+    'reviews': ExportSpec('reviews', 'review_id', [
+        ('review_id', 'int'), ('resource_id', 'int'), ('reviewer_id', 'int'),
+        ('rating', 'int'), ('comment', 'str'), ('timestamp', 'str'),
+    ], date_column='timestamp'),
+    'admin_logs': ExportSpec('admin_logs', 'log_id', [
+        ('log_id', 'int'), ('admin_id', 'int'), ('action', 'str'),
+        ('target_table', 'str'), ('details', 'str'), ('timestamp', 'str'),
+    ], date_column='timestamp'),
+}
+
+
+class ExportDAL:
+    """Streams table rows in batches for export."""
+
+    def __init__(self, db: Database):
+        """Initialize ExportDAL with database connection."""
+        self.db = db
+
+    @staticmethod
+    def get_spec(dataset):
+        """
+        Get the export description of a dataset.
+
+        Raises:
+            ValueError: If the dataset is not exportable
+        """
+        if dataset not in EXPORTS:
+            raise ValueError(f"Unknown export: {dataset} (choose from {', '.join(EXPORTS)})")
+        return EXPORTS[dataset]
+
+    def iter_batches(self, dataset, start_day=None, end_day=None, status=None, batch_size=BATCH_SIZE):
+        """
+        Yield matching rows as lists of tuples, batch_size rows at a time.
+
+        Args:
+            dataset: Key of EXPORTS
+            start_day: Optional first day (date), inclusive
+            end_day: Optional last day (date), inclusive
+            status: Optional status to match (datasets with a status column only)
+            batch_size: Rows per batch
+
+        Raises:
+            ValueError: If the dataset is unknown or has no status column
+        """
+        spec = self.get_spec(dataset)
+        # Unary + keeps filters off their indexes so every batch is a primary-key
+        # range scan; a filter index plus ORDER BY key would re-sort all matches per batch
+        conditions, params = [f"{spec.key} > ?"], []
+        if start_day:
+            conditions.append(f"+{spec.date_column} >= ?")
+            params.append(start_day.isoformat())
+        if end_day:
+            conditions.append(f"+{spec.date_column} < ?")
+            params.append((end_day + timedelta(days=1)).isoformat())
+        if status:
+            if not spec.status_column:
+                raise ValueError(f"{dataset} cannot be filtered by status")
+            conditions.append(f"+{spec.status_column} = ?")
+            params.append(status)
+        query = f"""
+            SELECT {', '.join(spec.column_names)}
+            FROM {spec.table}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {spec.key}
+            LIMIT ?
+        """
+        key_index = spec.column_names.index(spec.key)
+        last_key = 0
+        while True:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                rows = cursor.execute(query, (last_key, *params, batch_size)).fetchall()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1][key_index]
@@ -0,0 +1,178 @@
+"""
+Data Access Layer for the top-rated resources leaderboard.
+Maintains a materialized, Bayesian-ranked copy of per-resource review stats.
+
+A resource's score is the Bayesian average
+    (prior_weight * prior_mean + rating_sum) / (prior_weight + review_count)
+so a single 5-star review no longer outranks hundreds of 4.8 reviews.
+Rows are updated incrementally whenever a review or resource changes.
+All scores are re-materialized in one statement when the global mean
+drifts away from the prior they were computed with.
+"""
+
+import threading
+from src.data_access.database import Database
+
+# Weight of the prior, in "virtual reviews" at the global mean
+PRIOR_WEIGHT = 5
+# Prior used before any review exists
+DEFAULT_PRIOR_MEAN = 3.0
+# Re-rank everything once the global mean moves this far from the prior
+PRIOR_DRIFT = 0.05
+
+_built_databases = set()
+_built_lock = threading.Lock()
+
+
+def bayesian_average(rating_sum, review_count, prior_mean, prior_weight=PRIOR_WEIGHT):
+    """Compute the Bayesian average rating for a resource."""
+    return (prior_weight * prior_mean + rating_sum) / (prior_weight + review_count)
+
+
+class LeaderboardDAL:
+    """Data Access Layer for the resource_leaderboard table."""
+
+    def __init__(self, db: Database):
+        """Initialize LeaderboardDAL with database connection."""
+        self.db = db
+
+    def ensure_built(self):
+        """Materialize the leaderboard once per process if it was never built."""
+        if self.db.db_path in _built_databases:
+            return
+        with _built_lock:
+            if self.db.db_path in _built_databases:
+                return
+            meta = self.db.execute_query(
+                "SELECT prior_mean FROM leaderboard_meta WHERE id = 1", fetch_one=True
+            )
+            if not meta:
+                self.rebuild()
+            _built_databases.add(self.db.db_path)
+
+    def rebuild(self):
+        """Recompute every leaderboard row from the reviews table."""
+        with self.db.get_connection() as conn:
+            self._rebuild(conn)
+
+    def _rebuild(self, conn):
+        """Recompute every row and the global prior inside a transaction."""
+        totals = conn.execute(
+            "SELECT COALESCE(SUM(rating), 0) as total_sum, COUNT(*) as total_count FROM reviews"
+        ).fetchone()
+        total_sum, total_count = totals['total_sum'], totals['total_count']
+        prior_mean = total_sum / total_count if total_count else DEFAULT_PRIOR_MEAN
+
+        conn.execute("DELETE FROM resource_leaderboard")
+        conn.execute("""
+            INSERT INTO resource_leaderboard
+                (resource_id, category, is_published, review_count, rating_sum, avg_rating, bayes_score)
+            SELECT r.resource_id, r.category, r.status = 'published',
+                   COUNT(rv.review_id), SUM(rv.rating), AVG(rv.rating),
+                   (? * ? + SUM(rv.rating)) / (? + COUNT(rv.review_id))
+            FROM resources r
+            JOIN reviews rv ON r.resource_id = rv.resource_id
+            GROUP BY r.resource_id
+        """, (PRIOR_WEIGHT, prior_mean, PRIOR_WEIGHT))
+        conn.execute("""
+            INSERT OR REPLACE INTO leaderboard_meta (id, total_sum, total_count, prior_mean)
+            VALUES (1, ?, ?, ?)
+        """, (total_sum, total_count, prior_mean))
+
+    def refresh_resource(self, resource_id):
+        """
+        Recompute one resource's row after its reviews, status or category changed.
+
+        Runs in a single transaction that also keeps the global totals current.
+        The write lock is taken before the totals are read, so concurrent
+        refreshes apply their deltas one after the other instead of both
+        writing totals computed from the same snapshot.
+        """
+        with self.db.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            meta = conn.execute(
+                "SELECT total_sum, total_count, prior_mean FROM leaderboard_meta WHERE id = 1"
+            ).fetchone()
+            if not meta:
+                self._rebuild(conn)
+                return
+
+            current = conn.execute("""
+                SELECT r.category, r.status, COUNT(rv.review_id) as review_count,
+                       COALESCE(SUM(rv.rating), 0) as rating_sum
+                FROM resources r
+                LEFT JOIN reviews rv ON r.resource_id = rv.resource_id
+                WHERE r.resource_id = ?
+                GROUP BY r.resource_id
+            """, (resource_id,)).fetchone()
+            previous = conn.execute(
+                "SELECT rating_sum, review_count FROM resource_leaderboard WHERE resource_id = ?",
+                (resource_id,)
+            ).fetchone()
+
+            # Reviews of a deleted resource stay in the global totals
+            if current:
+                review_count, rating_sum = current['review_count'], current['rating_sum']
+            elif previous:
+                review_count, rating_sum = previous['review_count'], previous['rating_sum']
+            else:
+                review_count, rating_sum = 0, 0
+            old_count = previous['review_count'] if previous else 0
+            old_sum = previous['rating_sum'] if previous else 0
+            total_sum = meta['total_sum'] + rating_sum - old_sum
+            total_count = meta['total_count'] + review_count - old_count
+            prior_mean = meta['prior_mean']
+
+            conn.execute(
+                "UPDATE leaderboard_meta SET total_sum = ?, total_count = ? WHERE id = 1",
+                (total_sum, total_count)
+            )
+
+            if total_count and abs(total_sum / total_count - prior_mean) > PRIOR_DRIFT:
+                self._rebuild(conn)
+                return
+
+            if not current or current['review_count'] == 0:
+                conn.execute("DELETE FROM resource_leaderboard WHERE resource_id = ?", (resource_id,))
+                return
+
+            conn.execute("""
+                INSERT OR REPLACE INTO resource_leaderboard
+                    (resource_id, category, is_published, review_count, rating_sum, avg_rating, bayes_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                resource_id, current['category'], current['status'] == 'published',
+                review_count, rating_sum, rating_sum / review_count,
+                bayesian_average(rating_sum, review_count, prior_mean)
+            ))
+
+    def get_top_rated(self, limit=10, category=None):
+        """
+        Get the top resources by Bayesian average, optionally within a category.
+
+        One indexed read: the (is_published, [category,] bayes_score) index
+        delivers rows already in rank order, so SQLite stops after `limit`.
+        """
+        self.ensure_built()
+        query = """
+            SELECT r.*, lb.avg_rating, lb.review_count, lb.bayes_score
+            FROM resource_leaderboard lb
+            JOIN resources r ON r.resource_id = lb.resource_id
+            WHERE lb.is_published = 1 {category_filter}
+            ORDER BY lb.bayes_score DESC
+            LIMIT ?
+        """
+        if category:
+            return self.db.execute_query(
+                query.format(category_filter='AND lb.category = ?'),
+                (category, limit), fetch_all=True
+            )
+        return self.db.execute_query(query.format(category_filter=''), (limit,), fetch_all=True)
+
+    def get_prior_mean(self):
+        """Get the global mean rating the current scores were computed with."""
+        self.ensure_built()
+        meta = self.db.execute_query(
+            "SELECT prior_mean FROM leaderboard_meta WHERE id = 1", fetch_one=True
+        )
+        return meta['prior_mean'] if meta else DEFAULT_PRIOR_MEAN
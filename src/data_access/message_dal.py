@@ -1,9 +1,18 @@
 """
 Data Access Layer for Message operations.
-Encapsulates all database interactions for the messages table.
+Encapsulates all database interactions for the messages, threads and
+thread_participants tables.
+
+Each thread keeps a pointer to its last message, and each participant row
+its own inbox timestamp, unread count and read position. All of them are
+updated in the same transaction as the message insert, so the inbox is one
+indexed query regardless of how many messages a user has. Per-user unread
+totals in message_counters are adjusted alongside, so the navigation badge
+is a primary-key read.
 """
 
 from src.data_access.database import Database
+from src.utils.event_bus import event_bus
 
 
 class MessageDAL:
@@ -15,7 +24,7 @@ class MessageDAL:
 
     def create_message(self, thread_id, sender_id, receiver_id, content):
         """
-        Create a new message.
+        Create a new message and advance the thread in one transaction.
 
         Args:
             thread_id: Message thread ID
@@ -26,11 +35,71 @@ class MessageDAL:
         Returns:
             message_id of created message
         """
-        query = """
-            INSERT INTO messages (thread_id, sender_id, receiver_id, content)
-            VALUES (?, ?, ?, ?)
-        """
-        return self.db.execute_query(query, (thread_id, sender_id, receiver_id, content))
+        with self.db.get_connection() as conn:
+            self._ensure_thread(conn, thread_id, sender_id, receiver_id)
+            message_id = conn.execute("""
+                INSERT INTO messages (thread_id, sender_id, receiver_id, content)
+                VALUES (?, ?, ?, ?)
+            """, (thread_id, sender_id, receiver_id, content)).lastrowid
+            timestamp = conn.execute(
+                "SELECT timestamp FROM messages WHERE message_id = ?", (message_id,)
+            ).fetchone()['timestamp']
+
+            conn.execute("""
+                UPDATE threads SET last_message_id = ?, last_timestamp = ?
+                WHERE thread_id = ?
+            """, (message_id, timestamp, thread_id))
+            # The sender has read everything up to their own message
+            conn.execute("""
+                UPDATE thread_participants
+                SET last_timestamp = ?, unread_count = 0, last_read_message_id = ?
+                WHERE thread_id = ? AND user_id = ?
+            """, (timestamp, message_id, thread_id, sender_id))
+            if receiver_id != sender_id:
+                previously_unread = conn.execute("""
+                    SELECT unread_count FROM thread_participants
+                    WHERE thread_id = ? AND user_id = ?
+                """, (thread_id, receiver_id)).fetchone()['unread_count']
+                conn.execute("""
+                    UPDATE thread_participants
+                    SET last_timestamp = ?, unread_count = unread_count + 1
+                    WHERE thread_id = ? AND user_id = ?
+                """, (timestamp, thread_id, receiver_id))
+                self._adjust_counters(conn, receiver_id, 1, 1 if previously_unread == 0 else 0)
+
+        # Published after commit so subscribers never see an uncommitted message
+        event_bus.publish((sender_id, receiver_id), 'message', {
+            'thread_id': thread_id,
+            'message_id': message_id,
+            'sender_id': sender_id,
+            'receiver_id': receiver_id,
+            'content': content,
+            'timestamp': timestamp
+        })
+        return message_id
+
+    def _adjust_counters(self, conn, user_id, messages_delta, threads_delta):
+        """Apply a change to a user's unread totals and bump their version."""
+        conn.execute("INSERT OR IGNORE INTO message_counters (user_id) VALUES (?)", (user_id,))
+        conn.execute("""
+            UPDATE message_counters
+            SET unread_messages = MAX(unread_messages + ?, 0),
+                unread_threads = MAX(unread_threads + ?, 0),
+                version = version + 1
+            WHERE user_id = ?
+        """, (messages_delta, threads_delta, user_id))
+
+    def _ensure_thread(self, conn, thread_id, user1_id, user2_id):
+        """Create the thread and participant rows if this thread is new."""
+        user_low, user_high = min(user1_id, user2_id), max(user1_id, user2_id)
+        conn.execute("""
+            INSERT OR IGNORE INTO threads (thread_id, user_low, user_high)
+            VALUES (?, ?, ?)
+        """, (thread_id, user_low, user_high))
+        conn.executemany("""
+            INSERT OR IGNORE INTO thread_participants (thread_id, user_id, other_user_id)
+            VALUES (?, ?, ?)
+        """, ((thread_id, user_low, user_high), (thread_id, user_high, user_low)))
 
     def get_message_by_id(self, message_id):
         """Get message by ID."""
@@ -51,37 +120,124 @@ class MessageDAL:
         """
         return self.db.execute_query(query, (thread_id,), fetch_all=True)
 
-    def get_user_threads(self, user_id):
+    def get_thread_page(self, thread_id, before_id=None, limit=50):
         """
-        Get all message threads for a user.
+        Get one page of a thread's messages, newest first.
+
+        Keyset pagination on message_id: the idx_messages_thread index holds
+        (thread_id, rowid), so each page is an index range scan of `limit`
+        rows however long the conversation is.
+
+        Args:
+            thread_id: Message thread ID
+            before_id: Cursor from the previous page; None for the newest page
+            limit: Messages per page
 
-        Returns list of threads with latest message info.
+        Returns:
+            (messages, next_cursor) where next_cursor is None on the oldest page
         """
         query = """
-            SELECT DISTINCT
-                m.thread_id,
-                CASE
-                    WHEN m.sender_id = ? THEN m.receiver_id
-                    ELSE m.sender_id
-                END as other_user_id,
-                CASE
-                    WHEN m.sender_id = ? THEN receiver.name
-                    ELSE sender.name
-                END as other_user_name,
-                (SELECT content FROM messages m2
-                 WHERE m2.thread_id = m.thread_id
-                 ORDER BY timestamp DESC LIMIT 1) as last_message,
-                (SELECT timestamp FROM messages m2
-                 WHERE m2.thread_id = m.thread_id
-                 ORDER BY timestamp DESC LIMIT 1) as last_timestamp
+            SELECT m.*, sender.name as sender_name
             FROM messages m
             JOIN users sender ON m.sender_id = sender.user_id
-            JOIN users receiver ON m.receiver_id = receiver.user_id
-            WHERE m.sender_id = ? OR m.receiver_id = ?
-            GROUP BY m.thread_id
-            ORDER BY last_timestamp DESC
+            WHERE m.thread_id = ? {cursor_filter}
+            ORDER BY m.message_id DESC
+            LIMIT ?
+        """
+        if before_id is None:
+            rows = self.db.execute_query(
+                query.format(cursor_filter=''), (thread_id, limit + 1), fetch_all=True
+            )
+        else:
+            rows = self.db.execute_query(
+                query.format(cursor_filter='AND m.message_id < ?'),
+                (thread_id, before_id, limit + 1), fetch_all=True
+            )
+        messages = rows[:limit]
+        next_cursor = messages[-1]['message_id'] if len(rows) > limit else None
+        return messages, next_cursor
+
+    def get_other_participant(self, thread_id, user_id):
+        """
+        Get the other user in a thread without reading its messages.
+
+        Returns:
+            other user's ID, or None if user_id is not a participant
+        """
+        row = self.db.execute_query("""
+            SELECT other_user_id FROM thread_participants
+            WHERE thread_id = ? AND user_id = ?
+        """, (thread_id, user_id), fetch_one=True)
+        return row['other_user_id'] if row else None
+
+    def get_user_threads(self, user_id):
+        """
+        Get all message threads for a user.
+
+        Returns list of threads with latest message info and unread count,
+        most recent first. last_message and last_sender_id are None for a
+        thread whose only remaining messages were moved to the archive
+        (retention keeps the last one, but it can be deleted afterwards).
+        """
+        query = """
+            SELECT tp.thread_id,
+                   tp.other_user_id,
+                   other.name as other_user_name,
+                   last.content as last_message,
+                   last.sender_id as last_sender_id,
+                   tp.last_timestamp,
+                   tp.unread_count
+            FROM thread_participants tp
+            JOIN threads t ON t.thread_id = tp.thread_id
+            LEFT JOIN messages last ON last.message_id = t.last_message_id
+            JOIN users other ON other.user_id = tp.other_user_id
+            WHERE tp.user_id = ?
+            ORDER BY tp.last_timestamp DESC
+        """
+        return self.db.execute_query(query, (user_id,), fetch_all=True)
+
+    def mark_thread_read(self, thread_id, user_id):
+        """
+        Move a participant's read position to the thread's last message.
+
+        The write lock is taken before the unread count is read, so a second
+        tab or a concurrent create_message cannot change it before the
+        counters are adjusted by it.
+
+        Returns:
+            Number of messages that were unread
+        """
+        with self.db.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("""
+                SELECT unread_count FROM thread_participants
+                WHERE thread_id = ? AND user_id = ?
+            """, (thread_id, user_id)).fetchone()
+            if not row or row['unread_count'] == 0:
+                return 0
+            conn.execute("""
+                UPDATE thread_participants
+                SET unread_count = 0,
+                    last_read_message_id = (SELECT last_message_id FROM threads WHERE thread_id = ?)
+                WHERE thread_id = ? AND user_id = ?
+            """, (thread_id, thread_id, user_id))
+            self._adjust_counters(conn, user_id, -row['unread_count'], -1)
+            return row['unread_count']
+
+    def get_unread_counts(self, user_id):
         """
-        return self.db.execute_query(query, (user_id, user_id, user_id, user_id), fetch_all=True)
+        Get a user's unread totals.
+
+        Returns:
+            dict with unread_messages, unread_threads and version
+        """
+        row = self.db.execute_query(
+            "SELECT unread_messages, unread_threads, version FROM message_counters WHERE user_id = ?",
+            (user_id,), fetch_one=True
+        )
+        if not row:
+            return {'unread_messages': 0, 'unread_threads': 0, 'version': 0}
+        return dict(row)
 
     def get_or_create_thread_id(self, user1_id, user2_id):
         """
@@ -94,30 +250,58 @@ class MessageDAL:
         Returns:
             thread_id
         """
-        # Check for existing thread
-        query = """
-            SELECT DISTINCT thread_id
-            FROM messages
-            WHERE (sender_id = ? AND receiver_id = ?)
-               OR (sender_id = ? AND receiver_id = ?)
-            LIMIT 1
-        """
-        result = self.db.execute_query(
-            query, (user1_id, user2_id, user2_id, user1_id), fetch_one=True
-        )
-
-        if result:
-            return result['thread_id']
-
-        # Create new thread - use combination of user IDs as thread_id
-        # For simplicity, thread_id = smaller_id * 100000 + larger_id
-        return min(user1_id, user2_id) * 100000 + max(user1_id, user2_id)
+        user_low, user_high = min(user1_id, user2_id), max(user1_id, user2_id)
+        with self.db.get_connection() as conn:
+            conn.execute("""
+                INSERT OR IGNORE INTO threads (user_low, user_high) VALUES (?, ?)
+            """, (user_low, user_high))
+            thread_id = conn.execute("""
+                SELECT thread_id FROM threads WHERE user_low = ? AND user_high = ?
+            """, (user_low, user_high)).fetchone()['thread_id']
+            self._ensure_thread(conn, thread_id, user_low, user_high)
+            return thread_id
 
     def delete_message(self, message_id):
-        """Delete a message."""
-        query = "DELETE FROM messages WHERE message_id = ?"
+        """Delete a message, moving its thread's last-message pointer back if needed."""
         try:
-            self.db.execute_query(query, (message_id,))
+            with self.db.get_connection() as conn:
+                message = conn.execute(
+                    "SELECT thread_id, receiver_id FROM messages WHERE message_id = ?", (message_id,)
+                ).fetchone()
+                conn.execute("DELETE FROM messages WHERE message_id = ?", (message_id,))
+                if message:
+                    # A message the receiver had not read yet no longer counts as unread
+                    reader = conn.execute("""
+                        SELECT unread_count FROM thread_participants
+                        WHERE thread_id = ? AND user_id = ?
+                          AND unread_count > 0 AND COALESCE(last_read_message_id, 0) < ?
+                    """, (message['thread_id'], message['receiver_id'], message_id)).fetchone()
+                    if reader:
+                        conn.execute("""
+                            UPDATE thread_participants SET unread_count = unread_count - 1
+                            WHERE thread_id = ? AND user_id = ?
+                        """, (message['thread_id'], message['receiver_id']))
+                        self._adjust_counters(
+                            conn, message['receiver_id'], -1, -1 if reader['unread_count'] == 1 else 0
+                        )
+                    conn.execute("""
+                        UPDATE threads
+                        SET last_message_id = (SELECT MAX(message_id) FROM messages WHERE thread_id = ?)
+                        WHERE thread_id = ? AND last_message_id = ?
+                    """, (message['thread_id'], message['thread_id'], message_id))
+                    # With every older message archived none is left: keep the thread's place in the inbox
+                    conn.execute("""
+                        UPDATE threads
+                        SET last_timestamp = COALESCE(
+                            (SELECT timestamp FROM messages WHERE message_id = threads.last_message_id),
+                            last_timestamp)
+                        WHERE thread_id = ?
+                    """, (message['thread_id'],))
+                    conn.execute("""
+                        UPDATE thread_participants
+                        SET last_timestamp = (SELECT last_timestamp FROM threads WHERE thread_id = ?)
+                        WHERE thread_id = ?
+                    """, (message['thread_id'], message['thread_id']))
             return True
         except Exception:
             return False
@@ -0,0 +1,189 @@
+"""
+Sorted-array prefix index for search-box suggestions.
+Answers "what starts with this prefix" with a binary search plus a short scan.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+KIND_TITLE = 'title'
+KIND_CATEGORY = 'category'
+KIND_LOCATION = 'location'
+
+_KIND_RANK = {KIND_TITLE: 0, KIND_CATEGORY: 1, KIND_LOCATION: 2}
+_WORD_START = re.compile(r'(?:^|\W)(?=\w)')
+
+# Keys are truncated to this many characters to bound memory; longer
+# prefixes are matched against the key and then checked against the label.
+KEY_LENGTH = 24
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace so keys compare consistently."""
+    return ' '.join((text or '').lower().split())
+
+
+def _title_keys(title):
+    """Every suffix of the title that starts at a word, e.g. 'study room a' -> 'room a'."""
+    text = normalize(title)
+    return {text[match.end():match.end() + KEY_LENGTH] for match in _WORD_START.finditer(text)}
+
+
+class PrefixIndex:
+    """
+    Prefix index over resource titles, categories and locations.
+
+    Keys are kept in one sorted list with a parallel array of references, so
+    a lookup is bisect_left on the prefix followed by a scan of the matching
+    run. A reference >= 0 is the resource_id of a title entry; a negative
+    reference -(n + 1) points at the n-th distinct category or location.
+    Titles are indexed at every word boundary; categories and locations are
+    reference counted so each distinct value is stored once.
+    Not thread-safe on its own; the owning catalog serializes access.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._keys = []
+        self._refs = array('q')
+        self._indexed = {}
+        self._values = []
+        self._value_codes = {}
+        self._value_refs = {}
+        self._bulk = False
+
+    def __len__(self):
+        """Number of entries in the index."""
+        return len(self._keys)
+
+    def begin_bulk(self):
+        """Append entries unsorted until end_bulk(), for the initial load."""
+        self._bulk = True
+
+    def end_bulk(self):
+        """Sort the entries appended since begin_bulk() in one pass."""
+        self._bulk = False
+        order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._keys = [self._keys[i] for i in order]
+        self._refs = array('q', (self._refs[i] for i in order))
+
+    def _insert(self, key, ref):
+        """Insert an entry, keeping the keys sorted."""
+        if self._bulk:
+            position = len(self._keys)
+        else:
+            position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._refs.insert(position, ref)
+
+    def _delete(self, key, ref):
+        """Delete an entry located by binary search."""
+        keys, refs = self._keys, self._refs
+        position = bisect_left(keys, key)
+        while position < len(keys) and keys[position] == key:
+            if refs[position] == ref:
+                del keys[position]
+                del refs[position]
+                return
+            position += 1
+
+    def _value_ref(self, kind, value):
+        """Get the negative reference for a category or location."""
+        code = self._value_codes.get((kind, value))
+        if code is None:
+            code = len(self._values)
+            self._values.append((kind, value))
+            self._value_codes[(kind, value)] = code
+        return -(code + 1)
+
+    def _add_value(self, kind, value):
+        """Reference a category or location, indexing it on first use."""
+        if not value:
+            return
+        ref = self._value_ref(kind, value)
+        count = self._value_refs.get(ref, 0)
+        if count == 0:
+            self._insert(normalize(value)[:KEY_LENGTH], ref)
+        self._value_refs[ref] = count + 1
+
+    def _drop_value(self, kind, value):
+        """Release a category or location, unindexing it on last use."""
+        if not value:
+            return
+        ref = self._value_ref(kind, value)
+        count = self._value_refs.get(ref, 0)
+        if count <= 1:
+            self._value_refs.pop(ref, None)
+            self._delete(normalize(value)[:KEY_LENGTH], ref)
+        else:
+            self._value_refs[ref] = count - 1
+
+    def add(self, resource_id, title, category, location):
+        """Index one resource."""
+        self._indexed[resource_id] = (title, category, location)
+        for key in _title_keys(title):
+            self._insert(key, resource_id)
+        self._add_value(KIND_CATEGORY, category)
+        self._add_value(KIND_LOCATION, location)
+
+    def remove(self, resource_id):
+        """Remove one resource from the index."""
+        indexed = self._indexed.pop(resource_id, None)
+        if indexed is None:
+            return
+        title, category, location = indexed
+        for key in _title_keys(title):
+            self._delete(key, resource_id)
+        self._drop_value(KIND_CATEGORY, category)
+        self._drop_value(KIND_LOCATION, location)
+
+    def suggest(self, prefix, limit=10):
+        """
+        Get suggestions whose title, category or location starts with prefix.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of dicts with 'type', 'value' and, for titles, 'resource_id'.
+            Titles come first, then categories, then locations; within each
+            type, whole-value prefix matches rank above word matches.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        key_prefix = prefix[:KEY_LENGTH]
+        keys, refs = self._keys, self._refs
+        position = bisect_left(keys, key_prefix)
+        scan_limit = limit * 8
+        seen = set()
+        matches = []
+        while position < len(keys) and len(matches) < scan_limit:
+            key, ref = keys[position], refs[position]
+            if not key.startswith(key_prefix):
+                break
+            position += 1
+            if ref in seen:
+                continue
+            seen.add(ref)
+            if ref >= 0:
+                kind, label = KIND_TITLE, self._indexed[ref][0]
+            else:
+                kind, label = self._values[-ref - 1]
+            normalized = normalize(label)
+            if len(prefix) > KEY_LENGTH and prefix not in normalized:
+                continue
+            whole = normalized.startswith(prefix)
+            matches.append((_KIND_RANK[kind], not whole, key, label, ref, kind))
+
+        matches.sort()
+        suggestions = []
+        for _, _, _, label, ref, kind in matches[:limit]:
+            suggestion = {'type': kind, 'value': label}
+            if kind == KIND_TITLE:
+                suggestion['resource_id'] = ref
+            suggestions.append(suggestion)
+        return suggestions
@@ -0,0 +1,483 @@
+"""
+In-memory catalog of published resources.
+Serves the browse pages (filter, sort, pagination) without touching SQLite.
+
+The catalog is a struct-of-arrays: one compact column per field, addressed by
+a slot number, plus inverted indexes from category and location to slots.
+It is loaded lazily with a single query and then kept current by the DAL
+write paths calling refresh(resource_id). A PrefixIndex over titles,
+categories and locations is maintained alongside for typeahead.
+
+Memory footprint (CPython 3.11, see benchmarks/bench_resource_catalog.py) at
+100k published resources with ~40 char titles, ~200 char descriptions,
+20 categories and 500 locations:
+    numeric columns (id, owner, capacity, category, rating, count):  ~5 MB
+    string columns (title, description, search text, created_at):   ~77 MB
+    inverted indexes and the id -> slot map:                         ~19 MB
+    typeahead prefix index (~500k word-boundary keys):               ~50 MB
+    total as reported by tracemalloc:                               ~160 MB
+Loading takes ~3.3 s; a filtered, sorted page is served in 2-12 ms and a
+typeahead suggestion in ~0.2 ms.
+Locations and categories are interned, so repeated values cost one pointer.
+"""
+
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from src.data_access.prefix_index import PrefixIndex
+from src.data_access.leaderboard_dal import LeaderboardDAL, bayesian_average
+
+
+SORT_NEWEST = 'newest'
+SORT_RATING = 'rating'
+SORT_TITLE = 'title'
+SORT_OPTIONS = (SORT_NEWEST, SORT_RATING, SORT_TITLE)
+
+# Capacity facet buckets as (label, min, max); max None means unbounded
+CAPACITY_BUCKETS = (
+    ('1-4', 1, 4),
+    ('5-10', 5, 10),
+    ('11-25', 11, 25),
+    ('26-50', 26, 50),
+    ('51+', 51, None),
+)
+_BUCKET_FLOORS = [low for _, low, _ in CAPACITY_BUCKETS]
+
+_CATALOG_QUERY = """
+    SELECT r.resource_id, r.owner_id, r.title, r.description, r.category,
+           r.location, r.capacity, r.images, r.availability_rules, r.status,
+           r.created_at, AVG(rv.rating) as avg_rating,
+           COUNT(rv.review_id) as review_count
+    FROM resources r
+    LEFT JOIN reviews rv ON r.resource_id = rv.resource_id
+    WHERE r.status = 'published' {where}
+    GROUP BY r.resource_id
+"""
+
+
+class ResourceCatalog:
+    """Read-optimized, struct-of-arrays copy of the published resources."""
+
+    def __init__(self, db):
+        """Initialize an empty catalog bound to a database."""
+        self.db = db
+        self.loaded = False
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        """Drop all columns and indexes."""
+        # Numeric columns
+        self._ids = array('q')
+        self._owner_ids = array('q')
+        self._capacities = array('q')
+        self._category_codes = array('l')
+        self._avg_ratings = array('d')
+        self._review_counts = array('l')
+        self._alive = bytearray()
+
+        # String columns
+        self._titles = []
+        self._descriptions = []
+        self._locations = []
+        self._created_at = []
+        self._images = []
+        self._availability_rules = []
+        self._search_text = []
+
+        # Category dictionary encoding
+        self._category_names = []
+        self._category_lookup = {}
+
+        # Indexes
+        self._slot_by_id = {}
+        self._free_slots = []
+        self._by_category = {}
+        self._by_location = {}
+        self._prefix = PrefixIndex()
+
+        # Full sort orders, rebuilt lazily after the next mutation
+        self._order_cache = {}
+        # (leaderboard_meta generation, prior mean) the rating order is computed with
+        self._prior = None
+
+    def load(self):
+        """Load every published resource with one aggregate query."""
+        rows = self.db.execute_query(_CATALOG_QUERY.format(where=''), fetch_all=True)
+        with self._lock:
+            self._reset()
+            self._prefix.begin_bulk()
+            for row in rows or []:
+                self._upsert(row)
+            self._prefix.end_bulk()
+            self.loaded = True
+
+    def ensure_loaded(self):
+        """Load the catalog on first use."""
+        if not self.loaded:
+            with self._lock:
+                if not self.loaded:
+                    self.load()
+
+    def refresh(self, resource_id):
+        """
+        Re-read a single resource after it changed.
+
+        Unpublished or deleted resources are removed from the catalog.
+        Does nothing until the catalog has been loaded.
+        """
+        if not self.loaded:
+            return
+        row = self.db.execute_query(
+            _CATALOG_QUERY.format(where='AND r.resource_id = ?'),
+            (resource_id,), fetch_one=True
+        )
+        with self._lock:
+            if row:
+                self._upsert(row)
+            else:
+                self._remove(resource_id)
+
+    def _category_code(self, category):
+        """Dictionary-encode a category (caller holds the lock)."""
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = len(self._category_names)
+            self._category_names.append(category)
+            self._category_lookup[category] = code
+        return code
+
+    def _upsert(self, row):
+        """Insert or replace one resource row (caller holds the lock)."""
+        resource_id = row['resource_id']
+        if resource_id in self._slot_by_id:
+            self._remove(resource_id)
+        self._order_cache.clear()
+
+        category = row['category']
+        location = row['location']
+        if category is not None:
+            category = sys.intern(category)
+        if location is not None:
+            location = sys.intern(location)
+        values = (
+            row['title'] or '', row['description'] or '', location,
+            row['created_at'] or '', row['images'], row['availability_rules']
+        )
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._ids[slot] = resource_id
+            self._owner_ids[slot] = row['owner_id']
+            self._capacities[slot] = row['capacity'] or 0
+            self._category_codes[slot] = self._category_code(category)
+            self._avg_ratings[slot] = row['avg_rating'] or 0.0
+            self._review_counts[slot] = row['review_count'] or 0
+            self._alive[slot] = 1
+            (self._titles[slot], self._descriptions[slot], self._locations[slot],
+             self._created_at[slot], self._images[slot],
+             self._availability_rules[slot]) = values
+            self._search_text[slot] = f"{values[0]}\n{values[1]}".lower()
+        else:
+            slot = len(self._ids)
+            self._ids.append(resource_id)
+            self._owner_ids.append(row['owner_id'])
+            self._capacities.append(row['capacity'] or 0)
+            self._category_codes.append(self._category_code(category))
+            self._avg_ratings.append(row['avg_rating'] or 0.0)
+            self._review_counts.append(row['review_count'] or 0)
+            self._alive.append(1)
+            self._titles.append(values[0])
+            self._descriptions.append(values[1])
+            self._locations.append(values[2])
+            self._created_at.append(values[3])
+            self._images.append(values[4])
+            self._availability_rules.append(values[5])
+            self._search_text.append(f"{values[0]}\n{values[1]}".lower())
+
+        self._slot_by_id[resource_id] = slot
+        self._prefix.add(resource_id, values[0], category, location)
+        if category is not None:
+            self._by_category.setdefault(category, set()).add(slot)
+        if location:
+            self._by_location.setdefault(location, set()).add(slot)
+
+    def _remove(self, resource_id):
+        """Drop a resource and recycle its slot (caller holds the lock)."""
+        slot = self._slot_by_id.pop(resource_id, None)
+        if slot is None:
+            return
+        self._order_cache.clear()
+        self._prefix.remove(resource_id)
+        category = self._category_names[self._category_codes[slot]]
+        location = self._locations[slot]
+        for index, key in ((self._by_category, category), (self._by_location, location)):
+            slots = index.get(key)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del index[key]
+        self._alive[slot] = 0
+        self._titles[slot] = self._descriptions[slot] = self._search_text[slot] = ''
+        self._images[slot] = self._availability_rules[slot] = None
+        self._free_slots.append(slot)
+
+    def __len__(self):
+        """Number of published resources in the catalog."""
+        self.ensure_loaded()
+        return len(self._slot_by_id)
+
+    def get(self, resource_id):
+        """Get one published resource as a dict, or None."""
+        self.ensure_loaded()
+        with self._lock:
+            slot = self._slot_by_id.get(resource_id)
+            return self._row(slot) if slot is not None else None
+
+    def get_categories(self):
+        """Get distinct categories of published resources."""
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._by_category.keys())
+
+    def get_locations(self):
+        """Get distinct locations of published resources."""
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._by_location.keys())
+
+    def suggest(self, prefix, limit=10):
+        """Get typeahead suggestions for titles, categories and locations."""
+        self.ensure_loaded()
+        with self._lock:
+            return self._prefix.suggest(prefix, limit)
+
+    def _matching_slots(self, keyword=None, category=None, location=None, capacity=None):
+        """
+        Return the slots matching the filters (caller holds the lock).
+
+        Returns None when no filter is given, meaning every resource matches.
+        """
+        candidates = None
+
+        if category:
+            candidates = set(self._by_category.get(category, ()))
+
+        if location:
+            # Substring match, like the SQL "location LIKE %x%", resolved
+            # against the distinct locations instead of every row.
+            needle = location.lower()
+            matched = set()
+            for name, slots in self._by_location.items():
+                if needle in name.lower():
+                    matched |= slots
+            candidates = matched if candidates is None else candidates & matched
+
+        if keyword:
+            needle = keyword.lower()
+            text = self._search_text
+            if candidates is None:
+                candidates = self._slot_by_id.values()
+            candidates = [slot for slot in candidates if needle in text[slot]]
+
+        if capacity:
+            bounds = next((b for b in CAPACITY_BUCKETS if b[0] == capacity), None)
+            if bounds is not None:
+                _, low, high = bounds
+                high = high if high is not None else sys.maxsize
+                capacities = self._capacities
+                if candidates is None:
+                    candidates = self._slot_by_id.values()
+                candidates = [slot for slot in candidates if low <= capacities[slot] <= high]
+
+        return candidates
+
+    def _facet_counts(self, slots):
+        """
+        Count categories, locations and capacity buckets in one pass
+        over the matching slots (caller holds the lock).
+        """
+        if slots is None:
+            cached = self._order_cache.get('facets')
+            if cached is not None:
+                return cached
+
+        codes, locations, capacities = self._category_codes, self._locations, self._capacities
+        category_counts = [0] * len(self._category_names)
+        location_counts = {}
+        bucket_counts = [0] * len(CAPACITY_BUCKETS)
+
+        for slot in (self._slot_by_id.values() if slots is None else slots):
+            category_counts[codes[slot]] += 1
+            location = locations[slot]
+            if location:
+                location_counts[location] = location_counts.get(location, 0) + 1
+            bucket = bisect_right(_BUCKET_FLOORS, capacities[slot]) - 1
+            if bucket >= 0:
+                bucket_counts[bucket] += 1
+
+        names = self._category_names
+        facets = {
+            'category': sorted(
+                ((names[code], count) for code, count in enumerate(category_counts)
+                 if count and names[code] is not None),
+                key=lambda item: (-item[1], item[0])
+            ),
+            'location': sorted(location_counts.items(), key=lambda item: (-item[1], item[0])),
+            'capacity': [
+                (CAPACITY_BUCKETS[i][0], count) for i, count in enumerate(bucket_counts) if count
+            ],
+        }
+        if slots is None:
+            self._order_cache['facets'] = facets
+        return facets
+
+    def _full_order(self, sort):
+        """Every slot in sort order, cached until the next mutation (caller holds the lock)."""
+        # The rating order is only valid for the prior it was computed with
+        key = (sort, self._prior_mean()) if sort == SORT_RATING else sort
+        order = self._order_cache.get(key)
+        if order is None:
+            order = self._sort_slots(self._slot_by_id.values(), sort)
+            self._order_cache[key] = order
+        return order
+
+    def _sync_prior(self):
+        """Read the leaderboard's prior mean again after leaderboard_meta was written."""
+        generation = self.db.generation('leaderboard_meta')
+        if self._prior is None or self._prior[0] != generation:
+            self._prior = (generation, LeaderboardDAL(self.db).get_prior_mean())
+
+    def _prior_mean(self):
+        """The leaderboard's prior mean, as of the last _sync_prior."""
+        return self._prior[1]
+
+    def _sort_slots(self, slots, sort):
+        """Order slots by the requested sort key (caller holds the lock)."""
+        ids = self._ids
+        if sort == SORT_RATING:
+            # Bayesian average with the leaderboard's prior, matching its ranking
+            ratings, counts = self._avg_ratings, self._review_counts
+            prior = self._prior_mean()
+            return sorted(
+                slots,
+                key=lambda s: (bayesian_average(ratings[s] * counts[s], counts[s], prior), counts[s], ids[s]),
+                reverse=True
+            )
+        if sort == SORT_TITLE:
+            titles = self._titles
+            return sorted(slots, key=lambda s: (titles[s].lower(), ids[s]))
+        created = self._created_at
+        return sorted(slots, key=lambda s: (created[s], ids[s]), reverse=True)
+
+    def _row(self, slot):
+        """Materialize one slot as a resource dict."""
+        avg_rating = self._avg_ratings[slot]
+        return {
+            'resource_id': self._ids[slot],
+            'owner_id': self._owner_ids[slot],
+            'title': self._titles[slot],
+            'description': self._descriptions[slot],
+            'category': self._category_names[self._category_codes[slot]],
+            'location': self._locations[slot],
+            'capacity': self._capacities[slot],
+            'images': self._images[slot],
+            'availability_rules': self._availability_rules[slot],
+            'status': 'published',
+            'created_at': self._created_at[slot],
+            'avg_rating': round(avg_rating, 1) if avg_rating else 0,
+            'review_count': self._review_counts[slot],
+        }
+
+    def search(self, keyword=None, category=None, location=None,
+               sort=SORT_NEWEST, page=1, per_page=None, capacity=None):
+        """
+        Filter, sort and paginate published resources.
+
+        Args:
+            keyword: Search in title and description
+            category: Filter by category
+            location: Filter by location (substring)
+            sort: One of SORT_OPTIONS
+            page: 1-based page number
+            per_page: Page size, or None for all results
+            capacity: Filter by capacity bucket label (see CAPACITY_BUCKETS)
+
+        Returns:
+            Tuple of (list of resource dicts, total match count)
+        """
+        result = self.faceted_search(keyword, category, location, sort, page,
+                                     per_page, capacity, facets=False)
+        return result['resources'], result['total']
+
+    def faceted_search(self, keyword=None, category=None, location=None,
+                       sort=SORT_NEWEST, page=1, per_page=None, capacity=None,
+                       facets=True):
+        """
+        Search with per-category, per-location and capacity-bucket counts.
+
+        The counts describe the whole match set and are computed in the same
+        pass that serves the page, so narrowing a search needs no extra query.
+
+        Returns:
+            dict with 'resources' (the page), 'total' and 'facets', where each
+            facet is a list of (value, count) pairs, most common first
+        """
+        self.ensure_loaded()
+        if sort == SORT_RATING:
+            self._sync_prior()
+        with self._lock:
+            slots = self._matching_slots(keyword, category, location, capacity)
+            facet_counts = self._facet_counts(slots) if facets else None
+            if slots is None:
+                ordered = self._full_order(sort)
+            elif len(slots) * 4 > len(self._slot_by_id):
+                # Broad matches: filtering the cached order beats re-sorting
+                wanted = set(slots)
+                ordered = [slot for slot in self._full_order(sort) if slot in wanted]
+            else:
+                ordered = self._sort_slots(slots, sort)
+            total = len(ordered)
+            if per_page:
+                start = (max(page, 1) - 1) * per_page
+                ordered = ordered[start:start + per_page]
+            return {
+                'resources': [self._row(slot) for slot in ordered],
+                'total': total,
+                'facets': facet_counts,
+            }
+
+    def top_rated(self, limit=10):
+        """Get the highest rated (Bayesian) resources that have at least one review."""
+        self.ensure_loaded()
+        self._sync_prior()
+        with self._lock:
+            counts = self._review_counts
+            top = []
+            for slot in self._full_order(SORT_RATING):
+                if len(top) >= limit:
+                    break
+                if counts[slot]:
+                    top.append(self._row(slot))
+            return top
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(db):
+    """Get the shared catalog for a database file."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(db.db_path)
+        if catalog is None:
+            catalog = ResourceCatalog(db)
+            _catalogs[db.db_path] = catalog
+        return catalog
+
+
+def clear_catalogs():
+    """Forget all catalogs (used when a database file is recreated)."""
+    with _catalogs_lock:
+        _catalogs.clear()
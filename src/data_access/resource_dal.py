@@ -4,6 +4,9 @@ Encapsulates all database interactions for the resources table.
 """
 
 from src.data_access.database import Database
+from src.data_access.resource_catalog import get_catalog
+from src.data_access.leaderboard_dal import LeaderboardDAL
+from src.data_access.vector_index import get_vector_index
 import json
 
 
@@ -13,6 +16,9 @@ class ResourceDAL:
     def __init__(self, db: Database):
         """Initialize ResourceDAL with database connection."""
         self.db = db
+        self.catalog = get_catalog(db)
+        self.leaderboard = LeaderboardDAL(db)
+        self.vectors = get_vector_index(db)
 
     def create_resource(self, owner_id, title, description, category, location,
                         capacity, images=None, availability_rules=None, status='draft'):
@@ -38,10 +44,13 @@ class ResourceDAL:
                                  capacity, images, availability_rules, status)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return self.db.execute_query(
+        resource_id = self.db.execute_query(
             query, (owner_id, title, description, category, location,
                    capacity, images, availability_rules, status)
         )
+        self.catalog.refresh(resource_id)
+        self.vectors.refresh(resource_id)
+        return resource_id
 
     def get_resource_by_id(self, resource_id):
         """Get resource by ID."""
@@ -72,18 +81,25 @@ class ResourceDAL:
 
         try:
             self.db.execute_query(query, tuple(values))
-            return True
         except Exception:
             return False
+        self.catalog.refresh(resource_id)
+        self.vectors.refresh(resource_id)
+        if 'status' in updates or 'category' in updates:
+            self.leaderboard.refresh_resource(resource_id)
+        return True
 
     def delete_resource(self, resource_id):
         """Delete a resource."""
         query = "DELETE FROM resources WHERE resource_id = ?"
         try:
             self.db.execute_query(query, (resource_id,))
-            return True
         except Exception:
             return False
+        self.catalog.refresh(resource_id)
+        self.vectors.refresh(resource_id)
+        self.leaderboard.refresh_resource(resource_id)
+        return True
 
     def get_resources_by_owner(self, owner_id):
         """Get all resources owned by a user."""
@@ -156,16 +172,18 @@ class ResourceDAL:
         """
         return self.db.execute_query(query, (resource_id,), fetch_one=True)
 
-    def get_top_rated_resources(self, limit=10):
-        """Get top-rated resources based on average review ratings."""
-        query = """
-            SELECT r.*, AVG(rv.rating) as avg_rating, COUNT(rv.review_id) as review_count
-            FROM resources r
-            LEFT JOIN reviews rv ON r.resource_id = rv.resource_id
-            WHERE r.status = 'published'
-            GROUP BY r.resource_id
-            HAVING COUNT(rv.review_id) > 0
-            ORDER BY avg_rating DESC, review_count DESC
-            LIMIT ?
+    def get_top_rated_resources(self, limit=10, category=None):
+        """
+        Get top-rated resources ranked by Bayesian average rating.
+
+        Reads the materialized leaderboard, so this is a single indexed
+        LIMIT query instead of an aggregate over the reviews table.
+
+        Args:
+            limit: Maximum number of resources
+            category: Optional category for a per-category top-K
+
+        Returns:
+            List of resource records with avg_rating, review_count and bayes_score
         """
-        return self.db.execute_query(query, (limit,), fetch_all=True)
+        return self.leaderboard.get_top_rated(limit=limit, category=category)
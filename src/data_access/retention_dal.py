@@ -0,0 +1,274 @@
+"""
+Data Access Layer for retention of admin_logs and messages.
+
+Rows older than a table's retention period are moved to the same table in
+an archive database file (campus_hub_archive.db next to campus_hub.db),
+CHUNK_SIZE rows per transaction. Each chunk is copied, counted into a
+monthly rollup in the main database and deleted in one transaction that
+spans both files, so a row is never lost or duplicated however a run
+ends. Short transactions also mean other writers wait at most one chunk.
+
+Messages that a thread still needs are kept whatever their age: the last
+message of each thread (the inbox preview) and messages the receiver has
+not read yet. If that last message is deleted later, the thread stays in
+the inbox with an "older messages archived" preview.
+
+After a run that moved rows, the moved tables are re-ANALYZEd and, on a
+database with auto_vacuum=INCREMENTAL, the freed pages are returned to
+the file system with an incremental vacuum. New databases are created in
+that mode; enable_incremental_vacuum() converts an existing one with a
+single full VACUUM.
+
+Archived rows leave the hot tables: the dashboard, thread pages and
+exports show only what is still in the main database, while
+get_monthly_counts() reports whole history from the rollups.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from src.data_access.database import Database
+
+# Rows moved per transaction
+CHUNK_SIZE = 2000
+# Default days a row stays in the main database
+DEFAULT_RETENTION_DAYS = {
+    'admin_logs': 365,
+    'messages': 730,
+}
+
+_COLUMNS = {
+    'admin_logs': 'log_id, admin_id, action, target_table, details, timestamp',
+    'messages': 'message_id, thread_id, sender_id, receiver_id, content, timestamp',
+}
+
+_ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive.admin_logs (
+    log_id INTEGER PRIMARY KEY,
+    admin_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    target_table TEXT,
+    details TEXT,
+    timestamp DATETIME,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS archive.messages (
+    message_id INTEGER PRIMARY KEY,
+    thread_id INTEGER NOT NULL,
+    sender_id INTEGER NOT NULL,
+    receiver_id INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    timestamp DATETIME,
+    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS archive.idx_archive_admin_logs_timestamp ON admin_logs(timestamp);
+CREATE INDEX IF NOT EXISTS archive.idx_archive_messages_thread ON messages(thread_id);
+"""
+
+# Next chunk of expired row ids. admin_logs: every expired row goes, so the
+# timestamp index range is read from its start. messages: kept rows are
+# skipped with a message_id cursor so they are read once per run.
+_EXPIRED = {
+    'admin_logs': """
+        SELECT log_id FROM admin_logs
+        WHERE timestamp < ? AND log_id > ?
+        ORDER BY timestamp
+        LIMIT ?
+    """,
+    'messages': """
+        SELECT m.message_id FROM messages m
+        LEFT JOIN threads t ON t.thread_id = m.thread_id
+        LEFT JOIN thread_participants tp
+               ON tp.thread_id = m.thread_id AND tp.user_id = m.receiver_id
+        WHERE +m.timestamp < ? AND m.message_id > ?
+          AND m.message_id IS NOT t.last_message_id
+          AND NOT (COALESCE(tp.unread_count, 0) > 0
+                   AND m.message_id > COALESCE(tp.last_read_message_id, 0))
+        ORDER BY m.message_id
+        LIMIT ?
+    """,
+}
+
+_ROLLUP = {
+    'admin_logs': """
+        INSERT INTO admin_log_monthly (month, admin_id, target_table, action_count)
+        SELECT strftime('%Y-%m', timestamp), admin_id, COALESCE(target_table, ''), COUNT(*)
+        FROM admin_logs WHERE log_id IN (SELECT id FROM temp.retention_ids)
+        GROUP BY 1, 2, 3
+        ON CONFLICT (month, admin_id, target_table) DO UPDATE SET
+            action_count = action_count + excluded.action_count
+    """,
+    'messages': """
+        INSERT INTO message_monthly (month, sender_id, message_count)
+        SELECT strftime('%Y-%m', timestamp), sender_id, COUNT(*)
+        FROM messages WHERE message_id IN (SELECT id FROM temp.retention_ids)
+        GROUP BY 1, 2
+        ON CONFLICT (month, sender_id) DO UPDATE SET
+            message_count = message_count + excluded.message_count
+    """,
+}
+
+_KEYS = {'admin_logs': 'log_id', 'messages': 'message_id'}
+
+
+def archive_path_for(db_path):
+    """Default archive file of a database: campus_hub.db -> campus_hub_archive.db."""
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_archive{ext or '.db'}"
+
+
+def _cutoff(days):
+    """UTC timestamp days ago, in the format of CURRENT_TIMESTAMP."""
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class RetentionDAL:
+    """Moves expired admin_logs and messages rows into the archive database."""
+
+    def __init__(self, db: Database, archive_path=None, chunk_size=CHUNK_SIZE):
+        """
+        Initialize RetentionDAL.
+
+        Args:
+            db: Main database
+            archive_path: Archive database file (default: archive_path_for(db.db_path))
+            chunk_size: Rows moved per transaction
+        """
+        self.db = db
+        self.archive_path = archive_path or archive_path_for(db.db_path)
+        self.chunk_size = chunk_size
+
+    def _has_expired(self, table, cutoff):
+        """True if at least one row of table would be archived."""
+        row = self.db.execute_query(_EXPIRED[table], (cutoff, 0, 1), fetch_one=True)
+        return row is not None
+
+    def _move_chunk(self, table, cutoff, after_id):
+        """
+        Move the next chunk of expired rows.
+
+        Returns:
+            (rows moved, last id examined) - 0 rows when the table is done
+        """
+        key = _KEYS[table]
+        columns = _COLUMNS[table]
+        with self.db.get_connection() as conn:
+            conn.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+            conn.executescript(_ARCHIVE_SCHEMA)
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_ids (id INTEGER PRIMARY KEY)")
+            ids = [row[0] for row in conn.execute(_EXPIRED[table], (cutoff, after_id, self.chunk_size))]
+            if not ids:
+                return 0, after_id
+            conn.executemany("INSERT INTO temp.retention_ids (id) VALUES (?)", ((i,) for i in ids))
+            conn.execute(f"""
+                INSERT OR IGNORE INTO archive.{table} ({columns})
+                SELECT {columns} FROM main.{table}
+                WHERE {key} IN (SELECT id FROM temp.retention_ids)
+            """)
+            conn.execute(_ROLLUP[table])
+            conn.execute(f"DELETE FROM main.{table} WHERE {key} IN (SELECT id FROM temp.retention_ids)")
+        # admin_logs chunks come in timestamp order and are all deleted, so each
+        # starts from the beginning again; messages move a cursor past kept rows
+        return len(ids), (max(ids) if table == 'messages' else 0)
+
+    def archive_table(self, table, days):
+        """
+        Move rows of table older than days to the archive, chunk by chunk.
+
+        Args:
+            table: 'admin_logs' or 'messages'
+            days: Retention period in days
+
+        Returns:
+            Number of rows moved
+
+        Raises:
+            ValueError: If the table has no retention policy or days < 1
+        """
+        if table not in _EXPIRED:
+            raise ValueError(f"No retention policy for {table} (choose from {', '.join(_EXPIRED)})")
+        if days < 1:
+            raise ValueError("Retention must be at least one day")
+        cutoff = _cutoff(days)
+        # Checked first so a run with nothing to do never creates the archive file
+        if not self._has_expired(table, cutoff):
+            return 0
+        moved, after_id = 0, 0
+        while True:
+            count, after_id = self._move_chunk(table, cutoff, after_id)
+            if not count:
+                return moved
+            moved += count
+
+    def run(self, retention_days=None):
+        """
+        Apply every retention policy, then refresh statistics and free pages.
+
+        Args:
+            retention_days: dict of table -> days, defaulting to DEFAULT_RETENTION_DAYS
+
+        Returns:
+            dict with rows moved per table, pages freed and seconds taken
+        """
+        start = time.perf_counter()
+        policies = dict(DEFAULT_RETENTION_DAYS, **(retention_days or {}))
+        result = {table: self.archive_table(table, days) for table, days in policies.items()}
+        moved_tables = [table for table in policies if result[table]]
+        result['pages_freed'] = self.compact(moved_tables) if moved_tables else 0
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        return result
+
+    def compact(self, tables):
+        """
+        ANALYZE tables and release free pages if incremental vacuum is enabled.
+
+        Returns:
+            Number of pages returned to the file system
+        """
+        with self.db.get_connection() as conn:
+            for table in tables:
+                conn.execute(f"ANALYZE {table}")
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if auto_vacuum != 2:  # NONE or FULL: nothing to do incrementally
+                return 0
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # Each step frees one page; executescript steps it to completion
+            conn.executescript("PRAGMA incremental_vacuum;")
+            return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def enable_incremental_vacuum(self):
+        """
+        Switch an existing database to auto_vacuum=INCREMENTAL.
+
+        Rewrites the whole file with VACUUM and blocks every writer while it
+        runs; do it once, off-hours.
+        """
+        with self.db.get_connection() as conn:
+            conn.isolation_level = None  # VACUUM cannot run inside a transaction
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+
+    def get_monthly_counts(self, table):
+        """
+        Rows per month over whole history: archived rollups plus rows still in the table.
+
+        Args:
+            table: 'admin_logs' or 'messages'
+
+        Returns:
+            List of (month 'YYYY-MM', count), oldest first
+        """
+        rollup, count_column = {
+            'admin_logs': ('admin_log_monthly', 'action_count'),
+            'messages': ('message_monthly', 'message_count'),
+        }[table]
+        rows = self.db.execute_query(f"""
+            SELECT month, SUM(n) AS n FROM (
+                SELECT month, SUM({count_column}) AS n FROM {rollup} GROUP BY month
+                UNION ALL
+                SELECT strftime('%Y-%m', timestamp), COUNT(*) FROM {table} GROUP BY 1
+            )
+            GROUP BY month
+            ORDER BY month
+        """, fetch_all=True)
+        return [(row['month'], row['n']) for row in rows]
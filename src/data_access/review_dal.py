@@ -4,6 +4,8 @@ Encapsulates all database interactions for the reviews table.
 """
 
 from src.data_access.database import Database
+from src.data_access.resource_catalog import get_catalog
+from src.data_access.leaderboard_dal import LeaderboardDAL
 
 
 class ReviewDAL:
@@ -12,6 +14,8 @@ class ReviewDAL:
     def __init__(self, db: Database):
         """Initialize ReviewDAL with database connection."""
         self.db = db
+        self.catalog = get_catalog(db)
+        self.leaderboard = LeaderboardDAL(db)
 
     def create_review(self, resource_id, reviewer_id, rating, comment=None):
         """
@@ -31,10 +35,13 @@ class ReviewDAL:
             VALUES (?, ?, ?, ?)
         """
         try:
-            return self.db.execute_query(query, (resource_id, reviewer_id, rating, comment))
+            review_id = self.db.execute_query(query, (resource_id, reviewer_id, rating, comment))
         except Exception:
             # Likely duplicate review (unique constraint)
             return None
+        self.catalog.refresh(resource_id)
+        self.leaderboard.refresh_resource(resource_id)
+        return review_id
 
     def get_review_by_id(self, review_id):
         """Get review by ID."""
@@ -97,18 +104,30 @@ class ReviewDAL:
         """
         try:
             self.db.execute_query(query, (rating, comment, review_id))
-            return True
         except Exception:
             return False
+        self._refresh_ratings(review_id)
+        return True
 
     def delete_review(self, review_id):
         """Delete a review."""
+        review = self.get_review_by_id(review_id)
         query = "DELETE FROM reviews WHERE review_id = ?"
         try:
             self.db.execute_query(query, (review_id,))
-            return True
         except Exception:
             return False
+        if review:
+            self.catalog.refresh(review['resource_id'])
+            self.leaderboard.refresh_resource(review['resource_id'])
+        return True
+
+    def _refresh_ratings(self, review_id):
+        """Refresh the cached ratings of the resource a review belongs to."""
+        review = self.get_review_by_id(review_id)
+        if review:
+            self.catalog.refresh(review['resource_id'])
+            self.leaderboard.refresh_resource(review['resource_id'])
 
     def get_all_reviews(self, limit=None):
         """Get all reviews (for admin)."""
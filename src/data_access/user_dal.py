@@ -5,6 +5,7 @@ Encapsulates all database interactions for the users table.
 # AI Contribution: Structure suggested by Copilot; implemented and validated by team.
 """
 
+from src.data_access.auth_cache import get_auth_cache
 from src.data_access.database import Database
 from datetime import datetime
 
@@ -15,6 +16,7 @@ class UserDAL:
     def __init__(self, db: Database):
         """Initialize UserDAL with database connection."""
         self.db = db
+        self.auth_cache = get_auth_cache(db)
 
     def create_user(self, name, email, password_hash, role='student', department=None):
         """
@@ -79,14 +81,37 @@ class UserDAL:
         except Exception:
             return False
 
+    def update_role(self, user_id, role):
+        """
+        Change a user's role, revoking their existing sessions.
+
+        Args:
+            user_id: User ID to update
+            role: New role (student, staff, admin)
+
+        Returns:
+            True if the user exists and was updated, False otherwise
+        """
+        query = "UPDATE users SET role = ?, auth_version = auth_version + 1 WHERE user_id = ?"
+        try:
+            with self.db.get_connection() as conn:
+                updated = conn.execute(query, (role, user_id)).rowcount
+        except Exception:
+            return False
+        finally:
+            self.auth_cache.invalidate(user_id)
+        return updated == 1
+
     def delete_user(self, user_id):
-        """Delete a user."""
+        """Delete a user, revoking their existing sessions."""
         query = "DELETE FROM users WHERE user_id = ?"
         try:
             self.db.execute_query(query, (user_id,))
             return True
         except Exception:
             return False
+        finally:
+            self.auth_cache.invalidate(user_id)
 
     def get_all_users(self, role=None):
         """
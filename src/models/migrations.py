@@ -0,0 +1,92 @@
+"""
+Data migrations for Campus Resource Hub.
+
+SCHEMA creates any missing tables and indexes on every start; migrations
+cover what CREATE ... IF NOT EXISTS cannot, such as backfilling new tables
+from existing rows or altering existing tables. Each migration runs once per
+database, in order, and is recorded in schema_migrations.
+"""
+
+
+def backfill_threads(conn):
+    """Create threads and thread_participants rows for existing messages, keeping thread ids."""
+    conn.execute("""
+        INSERT OR IGNORE INTO threads (thread_id, user_low, user_high, last_message_id, last_timestamp)
+        SELECT t.thread_id, t.user_low, t.user_high, t.last_message_id, m.timestamp
+        FROM (
+            SELECT thread_id,
+                   MIN(MIN(sender_id, receiver_id)) as user_low,
+                   MAX(MAX(sender_id, receiver_id)) as user_high,
+                   MAX(message_id) as last_message_id
+            FROM messages
+            GROUP BY thread_id
+        ) t
+        JOIN messages m ON m.message_id = t.last_message_id
+    """)
+    # Existing history counts as read; there was no read tracking before
+    for user_column, other_column in (('user_low', 'user_high'), ('user_high', 'user_low')):
+        conn.execute(f"""
+            INSERT OR IGNORE INTO thread_participants
+                (thread_id, user_id, other_user_id, last_timestamp, unread_count, last_read_message_id)
+            SELECT thread_id, {user_column}, {other_column}, last_timestamp, 0, last_message_id
+            FROM threads
+        """)
+
+
+def backfill_message_counters(conn):
+    """Seed per-user unread totals from thread_participants."""
+    conn.execute("""
+        INSERT OR REPLACE INTO message_counters (user_id, unread_messages, unread_threads, version)
+        SELECT user_id, SUM(unread_count), SUM(unread_count > 0), 1
+        FROM thread_participants
+        GROUP BY user_id
+    """)
+
+
+def build_booking_rollup(conn):
+    """Build the analytics rollup from bookings written before its triggers existed."""
+    from src.data_access.rollup_dal import rebuild_rollup
+    rebuild_rollup(conn)
+
+
+def add_users_auth_version(conn):
+    """Add users.auth_version to databases created before it was in SCHEMA."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+    if 'auth_version' not in columns:
+        conn.execute("ALTER TABLE users ADD COLUMN auth_version INTEGER NOT NULL DEFAULT 1")
+
+
+def key_booking_rollup(conn):
+    """Replace the rollup triggers that keyed changes on current categories, and backfill keys."""
+    for trigger in ('insert', 'update', 'delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_bookings_{trigger}_changes")
+    from src.data_access.rollup_dal import rebuild_rollup
+    rebuild_rollup(conn)
+
+
+# (version, function); append only, never reorder or renumber
+MIGRATIONS = [
+    (1, backfill_threads),
+    (2, backfill_message_counters),
+    (3, build_booking_rollup),
+    (4, add_users_auth_version),
+    (5, key_booking_rollup),
+]
+
+
+def apply_migrations(conn):
+    """Run every migration not yet recorded in schema_migrations."""
+    applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+    if all(version in applied for version, _ in MIGRATIONS):
+        return
+    # Take the write lock before re-reading so concurrent starts run each migration once
+    conn.execute("BEGIN IMMEDIATE")
+    applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+    for version, migration in MIGRATIONS:
+        if version in applied:
+            continue
+        migration(conn)
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+            (version, migration.__name__)
+        )
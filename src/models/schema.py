@@ -13,7 +13,9 @@ CREATE TABLE IF NOT EXISTS users (
     role TEXT NOT NULL CHECK(role IN ('student', 'staff', 'admin')),
     profile_image TEXT,
     department TEXT,
-    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    -- Bumped whenever the user's role changes; sessions from an older version are revoked
+    auth_version INTEGER NOT NULL DEFAULT 1
 );
 
 -- Resources table
@@ -59,6 +61,43 @@ CREATE TABLE IF NOT EXISTS messages (
     FOREIGN KEY (receiver_id) REFERENCES users(user_id)
 );
 
+-- Conversation threads, one per pair of users (user_low < user_high)
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_low INTEGER NOT NULL,
+    user_high INTEGER NOT NULL,
+    last_message_id INTEGER,
+    last_timestamp DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_low) REFERENCES users(user_id),
+    FOREIGN KEY (user_high) REFERENCES users(user_id),
+    FOREIGN KEY (last_message_id) REFERENCES messages(message_id),
+    UNIQUE(user_low, user_high)
+);
+
+-- Per-participant view of a thread: inbox ordering and read position
+CREATE TABLE IF NOT EXISTS thread_participants (
+    thread_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    other_user_id INTEGER NOT NULL,
+    last_timestamp DATETIME,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    last_read_message_id INTEGER,
+    PRIMARY KEY (thread_id, user_id),
+    FOREIGN KEY (thread_id) REFERENCES threads(thread_id),
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    FOREIGN KEY (other_user_id) REFERENCES users(user_id)
+);
+
+-- Per-user unread totals; version changes whenever the totals do (badge ETag)
+CREATE TABLE IF NOT EXISTS message_counters (
+    user_id INTEGER PRIMARY KEY,
+    unread_messages INTEGER NOT NULL DEFAULT 0,
+    unread_threads INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(user_id)
+);
+
 -- Reviews table
 CREATE TABLE IF NOT EXISTS reviews (
     review_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -83,6 +122,201 @@ CREATE TABLE IF NOT EXISTS admin_logs (
     FOREIGN KEY (admin_id) REFERENCES users(user_id)
 );
 
+-- Materialized top-rated leaderboard (Bayesian average), one row per reviewed resource
+CREATE TABLE IF NOT EXISTS resource_leaderboard (
+    resource_id INTEGER PRIMARY KEY,
+    category TEXT,
+    is_published INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    avg_rating REAL,
+    bayes_score REAL NOT NULL DEFAULT 0,
+    FOREIGN KEY (resource_id) REFERENCES resources(resource_id)
+);
+
+-- Global review totals and the prior the leaderboard scores were computed with
+CREATE TABLE IF NOT EXISTS leaderboard_meta (
+    id INTEGER PRIMARY KEY CHECK(id = 1),
+    total_sum INTEGER NOT NULL DEFAULT 0,
+    total_count INTEGER NOT NULL DEFAULT 0,
+    prior_mean REAL NOT NULL
+);
+
+-- Precomputed per-user recommendations (collaborative filtering), best first
+CREATE TABLE IF NOT EXISTS user_recommendations (
+    user_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    resource_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    computed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, rank),
+    FOREIGN KEY (user_id) REFERENCES users(user_id),
+    FOREIGN KEY (resource_id) REFERENCES resources(resource_id)
+);
+
+-- Booking analytics rollup: one row per day x resource x category x department x status.
+-- Category and department are '' when unknown so the primary key stays unique.
+CREATE TABLE IF NOT EXISTS booking_daily_rollup (
+    day TEXT NOT NULL,
+    resource_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    department TEXT NOT NULL,
+    status TEXT NOT NULL,
+    booking_count INTEGER NOT NULL DEFAULT 0,
+    booked_minutes REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, resource_id, category, department, status)
+);
+
+-- Category and department each booking is counted under in the rollup, kept by the triggers
+CREATE TABLE IF NOT EXISTS booking_rollup_keys (
+    booking_id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    department TEXT NOT NULL
+);
+
+-- Change feed of booking writes, filled by triggers and consumed into the rollup
+CREATE TABLE IF NOT EXISTS booking_changes (
+    change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    booking_id INTEGER NOT NULL,
+    old_day TEXT,
+    old_resource_id INTEGER,
+    old_category TEXT,
+    old_department TEXT,
+    old_status TEXT,
+    old_minutes REAL,
+    new_day TEXT,
+    new_resource_id INTEGER,
+    new_category TEXT,
+    new_department TEXT,
+    new_status TEXT,
+    new_minutes REAL
+);
+
+-- Last change_id each consumer of a change feed has applied
+CREATE TABLE IF NOT EXISTS rollup_checkpoints (
+    name TEXT PRIMARY KEY,
+    last_change_id INTEGER NOT NULL DEFAULT 0
+);
+
+-- Booking requests turned away before a booking row was created (e.g. time conflicts)
+CREATE TABLE IF NOT EXISTS booking_attempts (
+    attempt_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resource_id INTEGER NOT NULL,
+    requester_id INTEGER,
+    start_datetime DATETIME NOT NULL,
+    end_datetime DATETIME NOT NULL,
+    outcome TEXT NOT NULL DEFAULT 'conflict',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (resource_id) REFERENCES resources(resource_id),
+    FOREIGN KEY (requester_id) REFERENCES users(user_id)
+);
+
+-- Monthly counts of admin_logs rows moved to the archive database by retention
+CREATE TABLE IF NOT EXISTS admin_log_monthly (
+    month TEXT NOT NULL,
+    admin_id INTEGER NOT NULL,
+    target_table TEXT NOT NULL,
+    action_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, admin_id, target_table)
+);
+
+-- Monthly counts of messages moved to the archive database by retention
+CREATE TABLE IF NOT EXISTS message_monthly (
+    month TEXT NOT NULL,
+    sender_id INTEGER NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, sender_id)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_bookings_insert_rollup AFTER INSERT ON bookings
+BEGIN
+    INSERT OR REPLACE INTO booking_rollup_keys (booking_id, category, department)
+    VALUES (NEW.booking_id,
+            COALESCE((SELECT category FROM resources WHERE resource_id = NEW.resource_id), ''),
+            COALESCE((SELECT department FROM users WHERE user_id = NEW.requester_id), ''));
+    INSERT INTO booking_changes (booking_id, new_day, new_resource_id, new_category,
+                                 new_department, new_status, new_minutes)
+    SELECT NEW.booking_id, date(NEW.start_datetime), NEW.resource_id, k.category, k.department,
+           NEW.status, (julianday(NEW.end_datetime) - julianday(NEW.start_datetime)) * 1440
+    FROM booking_rollup_keys k WHERE k.booking_id = NEW.booking_id;
+END;
+
+-- The old side comes from booking_rollup_keys: the key the rollup counted the booking under
+CREATE TRIGGER IF NOT EXISTS trg_bookings_update_rollup
+AFTER UPDATE OF resource_id, requester_id, start_datetime, end_datetime, status ON bookings
+BEGIN
+    INSERT INTO booking_changes (booking_id, old_day, old_resource_id, old_category, old_department,
+                                 old_status, old_minutes, new_day, new_resource_id, new_category,
+                                 new_department, new_status, new_minutes)
+    SELECT NEW.booking_id, date(OLD.start_datetime), OLD.resource_id,
+           COALESCE(k.category, ''), COALESCE(k.department, ''),
+           OLD.status, (julianday(OLD.end_datetime) - julianday(OLD.start_datetime)) * 1440,
+           date(NEW.start_datetime), NEW.resource_id,
+           CASE WHEN NEW.resource_id IS OLD.resource_id THEN COALESCE(k.category, '')
+                ELSE COALESCE((SELECT category FROM resources WHERE resource_id = NEW.resource_id), '') END,
+           CASE WHEN NEW.requester_id IS OLD.requester_id THEN COALESCE(k.department, '')
+                ELSE COALESCE((SELECT department FROM users WHERE user_id = NEW.requester_id), '') END,
+           NEW.status, (julianday(NEW.end_datetime) - julianday(NEW.start_datetime)) * 1440
+    FROM (SELECT 1) LEFT JOIN booking_rollup_keys k ON k.booking_id = OLD.booking_id;
+    INSERT OR REPLACE INTO booking_rollup_keys (booking_id, category, department)
+    SELECT booking_id, new_category, new_department FROM booking_changes
+    WHERE change_id = last_insert_rowid();
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_bookings_delete_rollup AFTER DELETE ON bookings
+BEGIN
+    INSERT INTO booking_changes (booking_id, old_day, old_resource_id, old_category,
+                                 old_department, old_status, old_minutes)
+    SELECT OLD.booking_id, date(OLD.start_datetime), OLD.resource_id,
+           COALESCE(k.category, ''), COALESCE(k.department, ''),
+           OLD.status, (julianday(OLD.end_datetime) - julianday(OLD.start_datetime)) * 1440
+    FROM (SELECT 1) LEFT JOIN booking_rollup_keys k ON k.booking_id = OLD.booking_id;
+    DELETE FROM booking_rollup_keys WHERE booking_id = OLD.booking_id;
+END;
+
+-- Re-key a recategorized resource's bookings, so usage by category follows the join
+CREATE TRIGGER IF NOT EXISTS trg_resources_category_rollup
+AFTER UPDATE OF category ON resources
+WHEN OLD.category IS NOT NEW.category
+BEGIN
+    INSERT INTO booking_changes (booking_id, old_day, old_resource_id, old_category, old_department,
+                                 old_status, old_minutes, new_day, new_resource_id, new_category,
+                                 new_department, new_status, new_minutes)
+    SELECT b.booking_id, date(b.start_datetime), b.resource_id, k.category, k.department, b.status,
+           (julianday(b.end_datetime) - julianday(b.start_datetime)) * 1440,
+           date(b.start_datetime), b.resource_id, COALESCE(NEW.category, ''), k.department, b.status,
+           (julianday(b.end_datetime) - julianday(b.start_datetime)) * 1440
+    FROM bookings b JOIN booking_rollup_keys k ON k.booking_id = b.booking_id
+    WHERE b.resource_id = NEW.resource_id AND k.category != COALESCE(NEW.category, '');
+    UPDATE booking_rollup_keys SET category = COALESCE(NEW.category, '')
+    WHERE booking_id IN (SELECT booking_id FROM bookings WHERE resource_id = NEW.resource_id);
+END;
+
+-- Re-key the bookings of a user who changed department
+CREATE TRIGGER IF NOT EXISTS trg_users_department_rollup
+AFTER UPDATE OF department ON users
+WHEN OLD.department IS NOT NEW.department
+BEGIN
+    INSERT INTO booking_changes (booking_id, old_day, old_resource_id, old_category, old_department,
+                                 old_status, old_minutes, new_day, new_resource_id, new_category,
+                                 new_department, new_status, new_minutes)
+    SELECT b.booking_id, date(b.start_datetime), b.resource_id, k.category, k.department, b.status,
+           (julianday(b.end_datetime) - julianday(b.start_datetime)) * 1440,
+           date(b.start_datetime), b.resource_id, k.category, COALESCE(NEW.department, ''), b.status,
+           (julianday(b.end_datetime) - julianday(b.start_datetime)) * 1440
+    FROM bookings b JOIN booking_rollup_keys k ON k.booking_id = b.booking_id
+    WHERE b.requester_id = NEW.user_id AND k.department != COALESCE(NEW.department, '');
+    UPDATE booking_rollup_keys SET department = COALESCE(NEW.department, '')
+    WHERE booking_id IN (SELECT booking_id FROM bookings WHERE requester_id = NEW.user_id);
+END;
+
+-- Data migrations applied to this database (see src/models/migrations.py)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_resources_status ON resources(status);
@@ -90,6 +324,13 @@ CREATE INDEX IF NOT EXISTS idx_resources_category ON resources(category);
 CREATE INDEX IF NOT EXISTS idx_bookings_resource ON bookings(resource_id);
 CREATE INDEX IF NOT EXISTS idx_bookings_requester ON bookings(requester_id);
 CREATE INDEX IF NOT EXISTS idx_bookings_dates ON bookings(start_datetime, end_datetime);
+CREATE INDEX IF NOT EXISTS idx_bookings_status_start ON bookings(status, start_datetime, end_datetime, resource_id);
+CREATE INDEX IF NOT EXISTS idx_bookings_updated ON bookings(updated_at);
+CREATE INDEX IF NOT EXISTS idx_rollup_status_day ON booking_daily_rollup(status, day);
 CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id);
+CREATE INDEX IF NOT EXISTS idx_thread_participants_inbox ON thread_participants(user_id, last_timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_admin_logs_timestamp ON admin_logs(timestamp);
 CREATE INDEX IF NOT EXISTS idx_reviews_resource ON reviews(resource_id);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_score ON resource_leaderboard(is_published, bayes_score DESC);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_category ON resource_leaderboard(is_published, category, bayes_score DESC);
 """
@@ -5,6 +5,10 @@ This module provides an AI-powered assistant that helps users find resources,
 understand booking policies, and get system insights. It uses context from the
 database and project documentation to provide accurate, grounded responses.
 
+The concierge is built lazily by get_concierge(); create_app() calls
+preload_concierge() so that happens, with its context warmed, in a
+background thread right after startup rather than at import time.
+
 # AI Contribution: Core architecture designed with Claude Code assistance.
 # This feature demonstrates AI integration requirement for the project.
 """
@@ -13,9 +17,18 @@ from src.data_access.database import Database
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.booking_dal import BookingDAL
 from src.data_access.review_dal import ReviewDAL
-from src.data_access.admin_dal import AdminDAL
+from src.data_access.admin_dal import AdminDAL, STATS_TABLES, STATS_TTL
+from src.data_access.recommendation_dal import RecommendationDAL
+from src.utils.answer_cache import AnswerCache
+from src.utils.intent_router import IntentRouter
+from src.utils.snapshot import Snapshot
 import json
-from datetime import datetime
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
 
 
 class ResourceConcierge:
@@ -34,15 +47,42 @@ class ResourceConcierge:
         self.booking_dal = BookingDAL(self.db)
         self.review_dal = ReviewDAL(self.db)
         self.admin_dal = AdminDAL(self.db)
+        self.recommendation_dal = RecommendationDAL(self.db)
+        self.answer_cache = AnswerCache(self.db)
+        # Not watching resource_leaderboard: reading top resources may build it,
+        # and its contents only change after reviews or resources do
+        self.context_snapshot = Snapshot(
+            self._compute_context_summary, db=self.db, tables=STATS_TABLES, ttl=STATS_TTL
+        )
+        self.router = self._build_router()
+        self._vocabulary_generation = None
+        self._vocabulary_lock = threading.Lock()
+
+    def warm(self):
+        """
+        Load everything the first question would otherwise wait for: the
+        context summary (stats, categories, top resources), the resource
+        catalog behind the router's vocabulary, and the compiled router.
+        """
+        self.get_context_summary()
+        self._refresh_vocabulary()
+        self.router.route('')
 
     def get_context_summary(self):
         """
         Get a summary of current system state for context.
 
+        Served from a snapshot refreshed once its tables change or after
+        STATS_TTL seconds. The result is shared: do not mutate it.
+
         Returns:
             dict: System context including resource counts, categories, etc.
         """
-        stats = self.admin_dal.get_system_stats()
+        return self.context_snapshot.get()
+
+    def _compute_context_summary(self):
+        """Build the context summary (see get_context_summary)."""
+        stats = self.admin_dal.get_cached_system_stats()
         categories = self.resource_dal.get_categories()
         top_resources = self.resource_dal.get_top_rated_resources(limit=5)
 
@@ -91,8 +131,21 @@ class ResourceConcierge:
                 'message': 'Unknown query type. Available types: search_resources, resource_recommendations, availability_check, system_stats, popular_resources, category_info'
             }
 
-    def _search_resources(self, keyword=None, category=None, location=None):
-        """Search for resources based on criteria."""
+    def _search_resources(self, keyword=None, category=None, location=None, mode='keyword', limit=20):
+        """
+        Search for resources based on criteria.
+
+        Args:
+            keyword: Search text
+            category: Optional category filter
+            location: Optional location filter (substring)
+            mode: 'keyword' for substring matching, 'semantic' to rank by
+                  TF-IDF cosine similarity to the keyword text
+            limit: Maximum results in semantic mode
+        """
+        if mode == 'semantic' and keyword:
+            return self._semantic_search(keyword, category, location, limit)
+
         resources = self.resource_dal.search_resources(
             keyword=keyword,
             category=category,
@@ -120,14 +173,76 @@ class ResourceConcierge:
             'message': f"Found {len(results)} resources matching your criteria."
         }
 
-    def _get_recommendations(self, category=None, min_rating=4.0):
-        """Get resource recommendations based on ratings."""
-        top_resources = self.resource_dal.get_top_rated_resources(limit=10)
+    def _semantic_search(self, text, category=None, location=None, limit=20):
+        """Rank published resources by similarity to free text."""
+        # Over-fetch so the category/location filters still leave `limit` results
+        matches = self.resource_dal.vectors.search(text, k=limit * 5 if category or location else limit)
 
-        filtered = []
-        for resource in top_resources:
+        results = []
+        for resource_id, score in matches:
+            resource = self.resource_dal.catalog.get(resource_id)
+            if not resource:
+                continue
             if category and resource['category'] != category:
                 continue
+            if location and location.lower() not in (resource['location'] or '').lower():
+                continue
+            results.append({
+                'resource_id': resource_id,
+                'title': resource['title'],
+                'description': resource['description'],
+                'category': resource['category'],
+                'location': resource['location'],
+                'capacity': resource['capacity'],
+                'avg_rating': resource['avg_rating'],
+                'review_count': resource['review_count'],
+                'similarity': round(score, 3)
+            })
+            if len(results) >= limit:
+                break
+
+        return {
+            'success': True,
+            'count': len(results),
+            'results': results,
+            'message': f"Found {len(results)} resources similar to '{text}'."
+        }
+
+    def _get_recommendations(self, category=None, min_rating=4.0, user_id=None):
+        """
+        Get resource recommendations.
+
+        With a user_id, returns that user's precomputed collaborative-filtering
+        list; otherwise, or for users without booking history, the top rated.
+        """
+        if user_id:
+            personal = self.recommendation_dal.get_recommendations(user_id, category=category)
+            if personal:
+                recommendations = [
+                    {
+                        'resource_id': resource['resource_id'],
+                        'title': resource['title'],
+                        'category': resource['category'],
+                        'location': resource['location'],
+                        'avg_rating': round(resource['avg_rating'], 1),
+                        'review_count': resource['review_count'],
+                        'score': round(resource['score'], 3)
+                    }
+                    for resource in personal
+                ]
+                return {
+                    'success': True,
+                    'count': len(recommendations),
+                    'recommendations': recommendations,
+                    'personalized': True,
+                    'message': f"Here are {len(recommendations)} resources picked for you"
+                              f"{' in ' + category if category else ''}."
+                }
+
+        top_resources = self.resource_dal.get_top_rated_resources(limit=10, category=category)
+
+        filtered = []
+        for resource in top_resources:
             if resource['avg_rating'] >= min_rating:
                 filtered.append({
                     'resource_id': resource['resource_id'],
@@ -142,6 +257,7 @@ class ResourceConcierge:
             'success': True,
             'count': len(filtered),
             'recommendations': filtered,
+            'personalized': False,
             'message': f"Here are {len(filtered)} highly-rated resources"
                       f"{' in ' + category if category else ''}."
         }
@@ -188,7 +304,7 @@ class ResourceConcierge:
 
     def _get_system_stats(self):
         """Get system-wide statistics."""
-        stats = self.admin_dal.get_system_stats()
+        stats = self.admin_dal.get_cached_system_stats()
         context = self.get_context_summary()
 
         return {
@@ -206,7 +322,7 @@ class ResourceConcierge:
 
     def _get_popular_resources(self, limit=5):
         """Get most popular resources by booking count."""
-        stats = self.admin_dal.get_system_stats()
+        stats = self.admin_dal.get_cached_system_stats()
         most_booked = stats.get('most_booked_resources', [])[:limit]
 
         return {
@@ -244,71 +360,237 @@ class ResourceConcierge:
                 'message': f"Found {len(categories)} resource categories."
             }
 
-    def generate_natural_language_response(self, query_text):
+    def _build_router(self):
+        """Register the natural-language intents and their handlers."""
+        router = IntentRouter(fallback=self._answer_help)
+        router.add_intent('recommendations', {
+            r'top rated': 3, r'highly rated': 3, r'best': 2, r'recommend\w*': 3,
+            r'suggest\w*': 2, r'should i (?:book|use|try)': 2, r'good': 1,
+        }, self._cached(self._answer_recommendations,
+                        ('resources', 'reviews', 'user_recommendations'),
+                        lambda route, user_id: (route.entities.get('category'), user_id)))
+        router.add_intent('popular', {
+            r'popular': 3, r'most booked': 3, r'most used': 3, r'busiest': 2,
+            r'trending': 2, r'in demand': 2,
+        }, self._cached(self._answer_popular, STATS_TABLES))
+        router.add_intent('categories', {
+            r'categories': 3, r'category': 2, r'types': 2, r'kinds? of': 2, r'what sorts?': 1,
+        }, self._cached(self._answer_categories, ('resources', 'bookings', 'booking_daily_rollup')))
+        router.add_intent('stats', {
+            r'stats': 3, r'statistics': 3, r'overview': 2, r'how many': 2, r'summary': 1,
+            r'numbers': 1,
+        }, self._cached(self._answer_stats, STATS_TABLES))
+        router.add_intent('search', {
+            r'find': 2, r'search\w*': 2, r'looking for': 2, r'where can i': 2, r'need an?': 1,
+            r'is there an?': 1, r'any': 1, r'free': 1, r'available': 1, r'book': 1,
+        }, self._cached(self._answer_search, ('resources', 'reviews', 'bookings'), self._search_key),
+           entity_weights={'category': 2, 'location': 2})
+        return router
+
+    def _cached(self, handler, tables, key=lambda route, user_id: ()):
+        """
+        Wrap an intent handler with the answer cache.
+
+        Args:
+            handler: Intent handler, a generator of answer pieces
+            tables: Tables the answer reads
+            key: Callable(route, user_id) giving the parameters the answer depends on
+        """
+        def answer(route, user_id=None):
+            return self.answer_cache.stream(
+                (route.intent, key(route, user_id)), tables, lambda: handler(route, user_id=user_id)
+            )
+        return answer
+
+    @staticmethod
+    def _search_key(route, user_id):
+        """Search answers depend on category, location and date, or the text when neither is named."""
+        category, location = route.entities.get('category'), route.entities.get('location')
+        text = None if category or location else route.text
+        return category, location, route.entities.get('date'), text
+
+    def _refresh_vocabulary(self):
+        """Give the router current category and location names once resources change."""
+        if self.db.generation('resources') == self._vocabulary_generation:
+            return
+        # One rebuild at a time, so an older vocabulary never replaces a newer one
+        with self._vocabulary_lock:
+            generation = self.db.generation('resources')
+            if generation != self._vocabulary_generation:
+                catalog = self.resource_dal.catalog
+                self.router.set_vocabulary(catalog.get_categories(), catalog.get_locations())
+                self._vocabulary_generation = generation
+
+    def route_query(self, query_text):
+        """Route a query to its intent (see IntentRouter); no database work beyond vocabulary."""
+        self._refresh_vocabulary()
+        return self.router.route(query_text)
+
+    def stream_natural_language_response(self, query_text, user_id=None, route=None):
+        """
+        Answer a natural language query piece by piece.
+
+        Each intent handler yields its heading as soon as it has the data for
+        it and then one line per result, so callers can forward output while
+        the rest is still being looked up. Cached answers come as one piece.
+
+        Args:
+            query_text: Natural language query from user
+            user_id: Optional asking user, for personalized recommendations
+            route: Route from route_query(), if the caller already routed the query
+
+        Yields:
+            str: Consecutive pieces of the response
+        """
+        route = route or self.route_query(query_text)
+        yield from route.handler(route, user_id=user_id)
+
+    def generate_natural_language_response(self, query_text, user_id=None):
         """
         Generate a natural language response to a user query.
 
-        This is a simplified version that maps common questions to query types.
-        In a production system, this would use an LLM to parse intent.
+        The query is routed to an intent by the IntentRouter (weighted
+        phrases plus category, location and date entities); the intent's
+        handler answers it from the database, or from the answer cache when
+        the same question was answered since its tables last changed.
 
         Args:
             query_text: Natural language query from user
+            user_id: Optional asking user, for personalized recommendations
 
         Returns:
             str: Natural language response
         """
-        query_lower = query_text.lower()
-
-        # Simple keyword-based routing
-        if 'top rated' in query_lower or 'best' in query_lower or 'recommend' in query_lower:
-            result = self.answer_query('resource_recommendations')
-            if result['success'] and result['recommendations']:
-                response = f"Here are the top-rated resources:\n\n"
-                for r in result['recommendations'][:5]:
-                    response += f"- {r['title']} ({r['category']}) - Rating: {r['avg_rating']}/5 at {r['location']}\n"
-                return response
-            return "I couldn't find any highly-rated resources at the moment."
-
-        elif 'popular' in query_lower or 'most booked' in query_lower:
-            result = self.answer_query('popular_resources')
-            if result['success'] and result['popular_resources']:
-                response = f"Most popular resources by bookings:\n\n"
-                for r in result['popular_resources']:
-                    response += f"- {r['title']}: {r['booking_count']} bookings\n"
-                return response
-            return "No booking data available yet."
-
-        elif 'category' in query_lower or 'categories' in query_lower or 'types' in query_lower:
-            result = self.answer_query('category_info')
-            if result['success']:
-                response = f"Available resource categories:\n\n"
-                for c in result['categories']:
-                    response += f"- {c['category']}: {c['booking_count']} bookings\n"
-                return response
-            return "No categories found."
-
-        elif 'stats' in query_lower or 'statistics' in query_lower or 'overview' in query_lower:
-            result = self.answer_query('system_stats')
-            if result['success']:
-                stats = result['stats']
-                response = f"Campus Resource Hub Statistics:\n\n"
-                response += f"- Total Users: {stats['total_users']}\n"
-                response += f"- Published Resources: {stats['published_resources']}\n"
-                response += f"- Categories: {', '.join(stats['categories'])}\n"
-                return response
-            return "Statistics unavailable."
-
+        return ''.join(self.stream_natural_language_response(query_text, user_id))
+
+    def _answer_recommendations(self, route, user_id=None):
+        """Top-rated (or personalized) resources, in the named category if any."""
+        category = route.entities.get('category')
+        result = self.answer_query('resource_recommendations', user_id=user_id, category=category)
+        if not result['success'] or not result['recommendations']:
+            yield "I couldn't find any highly-rated resources at the moment."
+            return
+        if result['personalized']:
+            yield "Based on your bookings, you might like:\n\n"
         else:
-            # Default help message
-            return """I'm the Campus Resource Hub AI Concierge! I can help you with:
+            yield f"Here are the top-rated resources{' in ' + category if category else ''}:\n\n"
+        for r in result['recommendations'][:5]:
+            yield f"- {r['title']} ({r['category']}) - Rating: {r['avg_rating']}/5 at {r['location']}\n"
+
+    def _answer_popular(self, route, user_id=None):
+        """Most booked resources."""
+        result = self.answer_query('popular_resources')
+        if not result['success'] or not result['popular_resources']:
+            yield "No booking data available yet."
+            return
+        yield "Most popular resources by bookings:\n\n"
+        for r in result['popular_resources']:
+            yield f"- {r['title']}: {r['booking_count']} bookings\n"
+
+    def _answer_categories(self, route, user_id=None):
+        """Categories with their booking counts."""
+        result = self.answer_query('category_info')
+        if not result['success']:
+            yield "No categories found."
+            return
+        yield "Available resource categories:\n\n"
+        for c in result['categories']:
+            yield f"- {c['category']}: {c['booking_count']} bookings\n"
+
+    def _answer_stats(self, route, user_id=None):
+        """System statistics."""
+        result = self.answer_query('system_stats')
+        if not result['success']:
+            yield "Statistics unavailable."
+            return
+        stats = result['stats']
+        yield "Campus Resource Hub Statistics:\n\n"
+        yield f"- Total Users: {stats['total_users']}\n"
+        yield f"- Published Resources: {stats['published_resources']}\n"
+        yield f"- Categories: {', '.join(stats['categories'])}\n"
+
+    def _answer_search(self, route, user_id=None):
+        """
+        Resources matching the named category and location; free text is
+        ranked semantically when neither is named. With a date, each result
+        says whether it has bookings that day (one query per line, so those
+        lines stream as they are checked).
+        """
+        category = route.entities.get('category')
+        location = route.entities.get('location')
+        if category or location:
+            result = self.answer_query('search_resources', category=category, location=location)
+        else:
+            result = self.answer_query('search_resources', keyword=route.text, mode='semantic', limit=5)
+        if not result['success'] or not result['results']:
+            yield "I couldn't find any resources matching that."
+            return
+
+        day = route.entities.get('date')
+        where = ''.join(f" {label} {value}" for label, value in (('in', category), ('at', location)) if value)
+        yield f"Resources{where}{' for ' + day.strftime('%A %d %B') if day else ''}:\n\n"
+        for r in result['results'][:5]:
+            line = f"- {r['title']} ({r['category']}) at {r['location']}"
+            if day:
+                start = f"{day.isoformat()}T00:00:00"
+                end = f"{(day + timedelta(days=1)).isoformat()}T00:00:00"
+                booked = self.booking_dal.check_booking_conflict(r['resource_id'], start, end)
+                line += ' - has bookings that day' if booked else ' - free all day'
+            yield line + "\n"
+
+    def _answer_help(self, route, user_id=None):
+        """Default help message for queries matching no intent."""
+        yield """I'm the Campus Resource Hub AI Concierge! I can help you with:
 
 - Finding top-rated resources ("Show me the best resources")
 - Viewing popular resources ("What are the most booked resources?")
 - Exploring categories ("What categories are available?")
+- Finding a place ("Find a study room in the library tomorrow")
 - System statistics ("Show me system stats")
 
 What would you like to know?"""
 
 
-# Initialize global concierge instance
-concierge = ResourceConcierge()
+_concierge = None
+_concierge_lock = threading.Lock()
+
+
+def get_concierge():
+    """
+    Get the process-wide concierge, constructing it on first use.
+
+    Importing this module no longer opens a Database or builds the DALs;
+    the first caller does (once, under a lock), normally the preload thread.
+    """
+    global _concierge
+    concierge = _concierge
+    if concierge is None:
+        with _concierge_lock:
+            if _concierge is None:
+                _concierge = ResourceConcierge()
+            concierge = _concierge
+    return concierge
+
+
+def _preload():
+    """Thread body: construct the concierge and warm its context."""
+    try:
+        started = time.perf_counter()
+        get_concierge().warm()
+        logger.info("Concierge preloaded in %.2fs", time.perf_counter() - started)
+    except Exception:
+        logger.exception("Concierge preload failed; it will load on first use")
+
+
+def preload_concierge():
+    """Construct and warm the concierge in a background thread so requests find it ready."""
+    thread = threading.Thread(target=_preload, name='concierge-preload', daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name):
+    """Keep `from src.utils.ai_concierge import concierge` working, now lazily."""
+    if name == 'concierge':
+        return get_concierge()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,131 @@
+"""
+LRU cache of concierge answers.
+
+Identical questions ("show me the best resources") used to recompute the
+whole answer, re-running the top-rated, stats and category queries every
+time. Answers are now cached under a key of intent plus normalized
+parameters (entities, and the asking user where the answer is personal).
+
+Each entry is stamped with the generation of the tables its answer read
+(Database.generation, kept in memory), so a hit costs a dict lookup and a
+tuple comparison and never touches SQLite. An entry is recomputed once
+any of its tables is written through this process, or after ttl seconds,
+which bounds staleness from writes made by other processes. The least
+recently used entries are evicted beyond max_entries.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Answers kept before the least recently used are evicted
+MAX_ENTRIES = 2048
+# Seconds an answer is served when none of its tables changed
+DEFAULT_TTL = 60.0
+
+
+class AnswerCache:
+    """Maps (intent, params) to an answer stamped with its tables' generation."""
+
+    def __init__(self, db, max_entries=MAX_ENTRIES, ttl=DEFAULT_TTL):
+        """Initialize an empty cache for a database."""
+        self.db = db
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, tables, compute):
+        """
+        Get a cached answer, computing and storing it on a miss.
+
+        Args:
+            key: Hashable (intent, params) key
+            tables: Tables the answer reads; a write to any of them invalidates it
+            compute: Zero-argument callable producing the answer
+
+        Returns:
+            The answer (shared: do not mutate it)
+        """
+        generation = self.db.generation(*tables)
+        value = self._lookup(key, generation)
+        if value is None:
+            # Stamped with the generation read before computing: a write racing
+            # the computation makes the entry stale rather than wrongly fresh
+            value = compute()
+            self._store(key, value, generation)
+        return value
+
+    def _lookup(self, key, generation):
+        """The fresh cached answer for key, or None (counting the hit or miss)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stamp, expires = entry
+                if stamp == generation and now < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def _store(self, key, value, generation):
+        """Cache an answer computed at generation, evicting beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (value, generation, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stream(self, key, tables, produce):
+        """
+        Streaming form of get_or_compute.
+
+        A hit yields the cached answer in one piece. A miss forwards each
+        piece from produce() as it comes and caches the joined answer once
+        the stream completes (an abandoned stream caches nothing).
+
+        Args:
+            key: Hashable (intent, params) key
+            tables: Tables the answer reads
+            produce: Zero-argument callable returning an iterator of str pieces
+
+        Yields:
+            str: Pieces of the answer
+        """
+        generation = self.db.generation(*tables)
+        value = self._lookup(key, generation)
+        if value is not None:
+            yield value
+            return
+        pieces = []
+        for piece in produce():
+            pieces.append(piece)
+            yield piece
+        self._store(key, ''.join(pieces), generation)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit-rate metrics."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+        }
@@ -1,24 +1,65 @@
 """
 Authentication utilities for password hashing and validation.
 Uses bcrypt for secure password hashing.
+
+The bcrypt cost comes from BCRYPT_ROUNDS (default 12); hashes made at
+another cost are upgraded on the user's next login (see needs_rehash).
+Hashing and checking run on the shared HashPool sized by HASH_POOL_SIZE
+(default: CPU count, 0 for inline) and HASH_POOL_KIND ('thread' or
+'process'); both raise HashPoolBusy when the pool's queue is full.
 """
 
+import os
+import threading
 import bcrypt
+from src.utils.hash_pool import HashPool
+
+# bcrypt cost factor for new hashes: each step doubles the time per hash
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hash_pool():
+    """Get the process-wide hashing pool, creating it from the environment on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            size = os.getenv('HASH_POOL_SIZE')
+            _pool = HashPool(
+                workers=int(size) if size else None,
+                kind=os.getenv('HASH_POOL_KIND', 'thread')
+            )
+        return _pool
 
 
-def hash_password(password):
+def configure_hash_pool(pool):
+    """Replace the process-wide hashing pool (shutting the old one down)."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, pool
+    if old is not None:
+        old.shutdown()
+
+
+def hash_password(password, rounds=None):
     """
     Hash a password using bcrypt.
 
     Args:
         password: Plain text password
+        rounds: Cost factor (default: BCRYPT_ROUNDS)
 
     Returns:
         Hashed password as string
+
+    Raises:
+        HashPoolBusy: If the hashing pool is saturated
     """
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
+    hashed = get_hash_pool().hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
@@ -32,10 +73,31 @@ def verify_password(password, hashed_password):
 
     Returns:
         True if password matches, False otherwise
+
+    Raises:
+        HashPoolBusy: If the hashing pool is saturated
     """
     password_bytes = password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return get_hash_pool().checkpw(password_bytes, hashed_bytes)
+
+
+def needs_rehash(hashed_password, rounds=None):
+    """
+    Check whether a hash was made at a different cost than the current one.
+
+    Args:
+        hashed_password: Stored bcrypt hash ('$2b$12$...')
+        rounds: Wanted cost factor (default: BCRYPT_ROUNDS)
+
+    Returns:
+        True if the hash should be replaced after the next successful login
+    """
+    try:
+        cost = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != (rounds or BCRYPT_ROUNDS)
 
 
 def validate_password_strength(password):
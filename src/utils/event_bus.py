@@ -0,0 +1,116 @@
+"""
+In-process publish/subscribe bus for pushing events to connected users.
+
+Publishers (message sends, booking status changes) call publish() with the
+user ids an event concerns; each Server-Sent Events connection holds one
+Subscription. Publishing never blocks: every subscription has a bounded
+queue, and a client that falls that far behind is marked overflowed
+instead of slowing the publisher down. Its stream then tells the browser to
+resync and closes, and EventSource reconnects to a fresh queue.
+
+An idle subscription costs one small queue plus the thread or greenlet
+serving its stream, so a worker on threads or gevent holds a few thousand.
+Events only reach subscribers in the same process; run one worker process
+(with many threads or greenlets) for push to reach every client.
+"""
+
+import itertools
+import queue
+import threading
+import time
+
+# Events buffered per connection before it is considered too slow
+MAX_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """One connected client's bounded event queue."""
+
+    def __init__(self, user_id, maxsize=MAX_QUEUE_SIZE):
+        """Initialize an empty subscription for a user."""
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def offer(self, event):
+        """Queue an event without blocking; flag the subscription if it is full."""
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def next_event(self, timeout):
+        """Wait up to timeout seconds for the next event, or return None."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """Routes published events to the subscriptions of the users they concern."""
+
+    def __init__(self, maxsize=MAX_QUEUE_SIZE):
+        """Initialize a bus with no subscribers."""
+        self.maxsize = maxsize
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, user_id):
+        """Register a new connection for a user and return its Subscription."""
+        subscription = Subscription(user_id, self.maxsize)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a connection once its stream ends."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_ids, event_type, data):
+        """
+        Deliver an event to every connection of the given users.
+
+        Args:
+            user_ids: Users the event concerns
+            event_type: SSE event name, e.g. 'message'
+            data: JSON-serializable payload
+
+        Returns:
+            Number of connections the event was queued for
+        """
+        event = {'id': next(self._ids), 'type': event_type, 'data': data, 'time': time.time()}
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in set(user_ids)
+                for subscription in self._subscriptions.get(user_id, ())
+            ]
+        delivered = 0
+        for subscription in targets:
+            was_overflowed = subscription.overflowed
+            subscription.offer(event)
+            if subscription.overflowed:
+                if not was_overflowed:
+                    self.overflows += 1
+            else:
+                delivered += 1
+        self.published += 1
+        return delivered
+
+    def connection_count(self):
+        """Number of open subscriptions."""
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+# Process-wide bus shared by publishers and the SSE endpoint
+event_bus = EventBus()
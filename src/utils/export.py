@@ -0,0 +1,196 @@
+"""
+Streaming CSV and Parquet encoders for data exports, plus a CLI.
+
+Both encoders consume ExportDAL.iter_batches() and yield encoded chunks as
+they go, so an export of millions of rows holds one batch (CSV) or one row
+group (Parquet) in memory. Parquet needs pyarrow, which is optional.
+
+Usage:
+    python -m src.utils.export bookings --output bookings.csv
+    python -m src.utils.export bookings --format parquet --start 2030-01-01 \\
+        --end 2030-06-30 --status approved --output approved.parquet
+"""
+
+import argparse
+import csv
+import io
+import sys
+from src.data_access.database import Database
+from src.data_access.export_dal import EXPORTS, ExportDAL
+from src.utils.validators import validate_date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+# Rows gathered into each Parquet row group
+PARQUET_ROW_GROUP = 100_000
+
+
+def parquet_available():
+    """True if pyarrow is installed."""
+    return pa is not None
+
+
+def csv_chunks(spec, batches):
+    """
+    Encode batches as CSV text.
+
+    Yields:
+        The header line, then one str chunk per batch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(spec.column_names)
+    yield buffer.getvalue()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last take()."""
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def take(self):
+        """Return and forget the bytes written so far."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema(spec):
+    """pyarrow schema of an export."""
+    types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in spec.columns])
+
+
+def parquet_chunks(spec, batches, row_group=PARQUET_ROW_GROUP):
+    """
+    Encode batches as a Parquet file.
+
+    Yields:
+        bytes chunks, one per row group plus the footer
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if not parquet_available():
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    schema = _arrow_schema(spec)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def write(rows):
+        columns = list(zip(*rows))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        ))
+
+    pending = []
+    for rows in batches:
+        pending.extend(rows)
+        if len(pending) >= row_group:
+            write(pending)
+            pending = []
+            yield sink.take()
+    if pending:
+        write(pending)
+    writer.close()
+    yield sink.take()
+
+
+def export_chunks(db, dataset, fmt='csv', start_day=None, end_day=None, status=None):
+    """
+    Stream an export as encoded chunks.
+
+    Args:
+        db: Database to read from
+        dataset: Key of EXPORTS ('bookings', 'reviews' or 'admin_logs')
+        fmt: 'csv' or 'parquet'
+        start_day, end_day: Optional inclusive date range (date objects)
+        status: Optional status filter
+
+    Returns:
+        Generator of str (CSV) or bytes (Parquet) chunks
+
+    Raises:
+        ValueError: If the dataset, format or filter is invalid
+        RuntimeError: If Parquet is requested without pyarrow
+    """
+    export_dal = ExportDAL(db)
+    spec = export_dal.get_spec(dataset)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt} (choose from {', '.join(FORMATS)})")
+    if fmt == 'parquet' and not parquet_available():
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    if status and not spec.status_column:
+        raise ValueError(f"{dataset} cannot be filtered by status")
+    batches = export_dal.iter_batches(dataset, start_day, end_day, status)
+    return csv_chunks(spec, batches) if fmt == 'csv' else parquet_chunks(spec, batches)
+
+
+def _date_arg(value):
+    """argparse type for YYYY-MM-DD dates."""
+    is_valid, result = validate_date(value)
+    if not is_valid:
+        raise argparse.ArgumentTypeError(result)
+    return result
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Export bookings, reviews or admin logs.')
+    parser.add_argument('dataset', choices=list(EXPORTS))
+    parser.add_argument('--format', choices=list(FORMATS), default='csv')
+    parser.add_argument('--start', type=_date_arg, help='first day, YYYY-MM-DD')
+    parser.add_argument('--end', type=_date_arg, help='last day, YYYY-MM-DD')
+    parser.add_argument('--status', help='only rows with this status (bookings)')
+    parser.add_argument('--output', help='file to write (default: stdout)')
+    parser.add_argument('--db', default='campus_hub.db', help='database file')
+    args = parser.parse_args(argv)
+
+    try:
+        chunks = export_chunks(Database(args.db), args.dataset, args.format,
+                               args.start, args.end, args.status)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    if args.output:
+        mode, encoding = ('w', 'utf-8') if args.format == 'csv' else ('wb', None)
+        with open(args.output, mode, encoding=encoding, newline='' if encoding else None) as out:
+            for chunk in chunks:
+                out.write(chunk)
+    else:
+        out = sys.stdout if args.format == 'csv' else sys.stdout.buffer
+        for chunk in chunks:
+            out.write(chunk)
+
+
+if __name__ == '__main__':
+    main()
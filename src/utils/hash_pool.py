@@ -0,0 +1,164 @@
+"""
+Bounded worker pool for bcrypt hashing and checking.
+
+bcrypt is deliberately slow (a few hundred ms at cost 12), so a burst of
+logins at class change would otherwise put every request thread on the
+CPU at once: all of them slow down together and nothing else gets served.
+A HashPool runs at most `workers` bcrypt calls at a time. Callers wait for
+their result in a queue of at most `max_pending`, and once that is full
+further calls fail fast with HashPoolBusy instead of queueing without
+bound; the login page answers those with 503 and the user retries.
+
+- kind 'thread': bcrypt releases the GIL while hashing, so threads run in
+  parallel on separate cores and share the process's memory.
+- kind 'process': separate interpreters, for bcrypt builds that hold the
+  GIL or to keep hashing off the serving process entirely.
+- workers 0: hash inline on the calling thread (the old behaviour).
+
+stats() reports queue depth, its high-water mark, wait and run times and
+rejections so the pool can be sized from production numbers.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+# Calls allowed to wait for a worker, per worker
+PENDING_PER_WORKER = 8
+
+
+class HashPoolBusy(Exception):
+    """Raised when the pool's queue is full."""
+
+
+def _hashpw(password_bytes, salt):
+    """bcrypt.hashpw, importable by process workers."""
+    return bcrypt.hashpw(password_bytes, salt)
+
+
+def _checkpw(password_bytes, hashed_bytes):
+    """bcrypt.checkpw, importable by process workers."""
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class HashPool:
+    """Runs bcrypt calls on a bounded number of workers."""
+
+    def __init__(self, workers=None, kind='thread', max_pending=None):
+        """
+        Initialize the pool; workers start on first use.
+
+        Args:
+            workers: Concurrent bcrypt calls (default: CPU count); 0 runs them inline
+            kind: 'thread' or 'process'
+            max_pending: Calls allowed to wait (default: PENDING_PER_WORKER per worker)
+
+        Raises:
+            ValueError: If kind is unknown
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown hash pool kind: {kind} (choose from thread, process)")
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.kind = kind
+        self.max_pending = PENDING_PER_WORKER * max(self.workers, 1) if max_pending is None else max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        # Calls submitted and not finished, i.e. running plus waiting
+        self._outstanding = 0
+        self.max_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _get_executor(self):
+        """Create the executor on first use (caller holds the lock)."""
+        if self._executor is None:
+            executor_class = ThreadPoolExecutor if self.kind == 'thread' else ProcessPoolExecutor
+            self._executor = executor_class(max_workers=self.workers)
+        return self._executor
+
+    def _timed(self, function, args, queued_at):
+        """Thread-pool body: run function, recording time waited and time run."""
+        started = time.perf_counter()
+        result = function(*args)
+        return result, started - queued_at, time.perf_counter() - started
+
+    def run(self, function, *args):
+        """
+        Run function(*args) on a worker and wait for its result.
+
+        Raises:
+            HashPoolBusy: If max_pending calls are already waiting
+        """
+        if self.workers == 0:
+            started = time.perf_counter()
+            result = function(*args)
+            with self._lock:
+                self.completed += 1
+                self.run_seconds += time.perf_counter() - started
+            return result
+
+        with self._lock:
+            if self._outstanding >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise HashPoolBusy("Too many password checks in progress")
+            self._outstanding += 1
+            self.max_depth = max(self.max_depth, self._outstanding - self.workers)
+            executor = self._get_executor()
+        queued_at = time.perf_counter()
+        try:
+            if self.kind == 'thread':
+                result, waited, ran = executor.submit(self._timed, function, args, queued_at).result()
+            else:
+                # Process workers have their own clocks: the whole round trip counts as waiting
+                result = executor.submit(function, *args).result()
+                waited, ran = time.perf_counter() - queued_at, 0.0
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+        with self._lock:
+            self.completed += 1
+            self.wait_seconds += waited
+            self.run_seconds += ran
+        return result
+
+    def hashpw(self, password_bytes, salt):
+        """bcrypt.hashpw on a worker."""
+        return self.run(_hashpw, password_bytes, salt)
+
+    def checkpw(self, password_bytes, hashed_bytes):
+        """bcrypt.checkpw on a worker."""
+        return self.run(_checkpw, password_bytes, hashed_bytes)
+
+    def stats(self):
+        """
+        Get pool metrics.
+
+        Returns:
+            dict with workers, kind, queue_depth (calls waiting now), max_depth,
+            max_pending, completed, rejected, avg_wait_ms and avg_run_ms
+        """
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                'workers': self.workers,
+                'kind': self.kind,
+                'queue_depth': max(self._outstanding - self.workers, 0),
+                'max_depth': self.max_depth,
+                'max_pending': self.max_pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(self.wait_seconds / completed * 1000, 2),
+                'avg_run_ms': round(self.run_seconds / completed * 1000, 2),
+            }
+
+    def shutdown(self):
+        """Stop the workers after the calls in progress."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,268 @@
+"""
+Intent routing for the concierge's natural-language questions.
+
+A query is normalized (NFKC, lower case, punctuation to spaces, single
+spaces) and scanned once by a compiled regex alternation of every intent
+phrase, longest phrases first, each in its own named group. Every match
+adds its phrase's weight to its intent. Intents can also gain weight from
+extracted entities (e.g. search gains when a category is named). The
+highest score wins; ties go to the intent registered first. A query
+matching nothing goes to the fallback.
+
+Entities come from a second alternation built from the vocabulary
+(categories and locations of published resources, set with
+set_vocabulary) and from date patterns (today, tomorrow, weekdays,
+"this weekend", "next week", ISO dates, "5 december" / "dec 5" with a
+full or abbreviated month name).
+
+Intents are pluggable: add_intent(name, patterns, handler) or the
+@router.intent(...) decorator. Each handler is called with the Route and
+the keyword arguments passed to dispatch().
+"""
+
+import re
+import threading
+import unicodedata
+from datetime import date, timedelta
+
+_PUNCTUATION = re.compile(r"[^\w\s'-]+")
+_SPACES = re.compile(r"\s+")
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+MONTHS = ('january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+          'september', 'october', 'november', 'december')
+# Full month names and their usual abbreviations only, so "juniors" or "decks" is not a month
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+_DATES = re.compile(
+    rf"\b(?:(?P<iso>\d{{4}}-\d{{2}}-\d{{2}})"
+    rf"|(?P<relative>today|tonight|day after tomorrow|tomorrow|this weekend|next week)"
+    rf"|(?P<next>next )?(?P<weekday>{'|'.join(WEEKDAYS)})"
+    rf"|(?P<day>\d{{1,2}})(?:st|nd|rd|th)? (?:of )?(?P<month>{_MONTH})"
+    rf"|(?P<month2>{_MONTH}) (?P<day2>\d{{1,2}})(?:st|nd|rd|th)?)\b"
+)
+# Words too common in location names to identify one on their own
+GENERIC_LOCATION_WORDS = frozenset({'building', 'hall', 'center', 'centre', 'room', 'floor', 'campus',
+                                    'the', 'and', 'of', 'east', 'west', 'north', 'south', 'main'})
+
+
+def normalize(text):
+    """Normalize a query for matching: NFKC, lower case, no punctuation, single spaces."""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return _SPACES.sub(' ', _PUNCTUATION.sub(' ', text)).strip()
+
+
+def _month_number(name):
+    """1-12 for a month name or its three-letter prefix."""
+    return next(number for number, month in enumerate(MONTHS, 1) if month.startswith(name[:3]))
+
+
+def parse_date(match, today):
+    """Turn a _DATES match into a date (None if it names an impossible day)."""
+    if match.group('iso'):
+        try:
+            return date.fromisoformat(match.group('iso'))
+        except ValueError:
+            return None
+    relative = match.group('relative')
+    if relative:
+        offsets = {'today': 0, 'tonight': 0, 'tomorrow': 1, 'day after tomorrow': 2,
+                   'this weekend': (5 - today.weekday()) % 7, 'next week': 7 - today.weekday()}
+        return today + timedelta(days=offsets[relative])
+    if match.group('weekday'):
+        ahead = (WEEKDAYS.index(match.group('weekday')) - today.weekday()) % 7
+        if match.group('next') and ahead == 0:
+            ahead = 7
+        return today + timedelta(days=ahead)
+    month = _month_number(match.group('month') or match.group('month2'))
+    day = int(match.group('day') or match.group('day2'))
+    try:
+        found = date(today.year, month, day)
+    except ValueError:
+        return None
+    # A day already past this year means next year's
+    return found if found >= today else found.replace(year=today.year + 1)
+
+
+class Intent:
+    """A named intent: weighted phrases and the handler answering it."""
+
+    def __init__(self, name, patterns, handler, entity_weights=None, order=0):
+        """
+        Describe an intent.
+
+        Args:
+            name: Intent name
+            patterns: dict of regex phrase (over normalized text) -> weight
+            handler: Callable(route, **kwargs) answering the intent
+            entity_weights: dict of entity name -> weight added when it is present
+            order: Registration order, the tie-breaker
+        """
+        self.name = name
+        self.patterns = dict(patterns)
+        self.handler = handler
+        self.entity_weights = dict(entity_weights or {})
+        self.order = order
+
+
+class Route:
+    """Result of routing one query."""
+
+    def __init__(self, intent, handler, score, entities, text):
+        self.intent = intent
+        self.handler = handler
+        self.score = score
+        self.entities = entities
+        self.text = text
+
+    def __repr__(self):
+        return f"Route({self.intent!r}, score={self.score}, entities={self.entities})"
+
+
+class IntentRouter:
+    """Routes normalized queries to intent handlers with one compiled matcher."""
+
+    def __init__(self, fallback=None):
+        """
+        Initialize a router with no intents.
+
+        Args:
+            fallback: Handler for queries matching no intent
+        """
+        self.fallback = fallback
+        self._intents = {}
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._groups = {}
+        # (compiled alternation or None, group name -> (kind, value)), swapped as one
+        self._vocabulary = (None, {})
+
+    def add_intent(self, name, patterns, handler, entity_weights=None):
+        """
+        Register or replace an intent.
+
+        Raises:
+            ValueError: If a pattern is not a valid regex
+        """
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern for intent {name}: {pattern!r} ({e})")
+        with self._lock:
+            order = self._intents[name].order if name in self._intents else len(self._intents)
+            self._intents[name] = Intent(name, patterns, handler, entity_weights, order)
+            self._matcher = None
+
+    def intent(self, name, patterns, entity_weights=None):
+        """Decorator form of add_intent."""
+        def decorator(handler):
+            self.add_intent(name, patterns, handler, entity_weights)
+            return handler
+        return decorator
+
+    @property
+    def intents(self):
+        """Registered intent names, in registration order."""
+        return list(self._intents)
+
+    def _compile(self):
+        """Build the phrase matcher: one named group per phrase, longest first."""
+        with self._lock:
+            if self._matcher is not None:
+                return self._matcher, self._groups
+            phrases = [(pattern, intent.name, weight)
+                       for intent in self._intents.values()
+                       for pattern, weight in intent.patterns.items()]
+            phrases.sort(key=lambda phrase: -len(phrase[0]))
+            groups = {f'p{i}': (name, weight) for i, (_, name, weight) in enumerate(phrases)}
+            alternation = '|'.join(f'(?P<p{i}>{pattern})' for i, (pattern, _, _) in enumerate(phrases))
+            self._matcher = re.compile(rf'\b(?:{alternation})\b') if phrases else None
+            self._groups = groups
+            return self._matcher, groups
+
+    def set_vocabulary(self, categories=(), locations=()):
+        """
+        Set the category and location names entities are extracted from.
+
+        Categories match with an optional plural 's'. Locations match by full
+        name or by any distinctive word of it ('library' for 'Library Building').
+        """
+        alternatives = {}
+        for category in categories:
+            key = normalize(category)
+            if key:
+                alternatives.setdefault(re.escape(key) + '(?:e?s)?', ('category', category))
+        for location in locations:
+            key = normalize(location)
+            if not key:
+                continue
+            alternatives.setdefault(re.escape(key), ('location', location))
+            for word in key.split():
+                if len(word) > 2 and word not in GENERIC_LOCATION_WORDS:
+                    alternatives.setdefault(re.escape(word), ('location', word))
+        ordered = sorted(alternatives, key=len, reverse=True)
+        groups = {f'e{i}': alternatives[pattern] for i, pattern in enumerate(ordered)}
+        alternation = '|'.join(f'(?P<e{i}>{pattern})' for i, pattern in enumerate(ordered))
+        # One assignment, so extract_entities never pairs a regex with another vocabulary's groups
+        self._vocabulary = (re.compile(rf'\b(?:{alternation})\b') if ordered else None, groups)
+
+    def extract_entities(self, text, today=None):
+        """
+        Find the first category, location and date in normalized text.
+
+        Returns:
+            dict with any of 'category', 'location' (as named in the
+            vocabulary, or the matched word) and 'date' (a datetime.date)
+        """
+        entities = {}
+        vocabulary, groups = self._vocabulary
+        if vocabulary is not None:
+            for match in vocabulary.finditer(text):
+                kind, value = groups[match.lastgroup]
+                entities.setdefault(kind, value)
+        for match in _DATES.finditer(text):
+            found = parse_date(match, today or date.today())
+            if found:
+                entities['date'] = found
+                break
+        return entities
+
+    def route(self, query_text, today=None):
+        """
+        Pick the intent for a query.
+
+        Args:
+            query_text: Raw query
+            today: Date relative dates are resolved against (default: today)
+
+        Returns:
+            Route; its intent is None (and handler the fallback) if nothing matched
+        """
+        text = normalize(query_text)
+        matcher, groups = self._compile()
+        entities = self.extract_entities(text, today)
+        scores = {}
+        if matcher is not None:
+            for match in matcher.finditer(text):
+                name, weight = groups[match.lastgroup]
+                scores[name] = scores.get(name, 0) + weight
+        for intent in list(self._intents.values()):
+            bonus = sum(weight for entity, weight in intent.entity_weights.items() if entity in entities)
+            if bonus:
+                scores[intent.name] = scores.get(intent.name, 0) + bonus
+        if not scores:
+            return Route(None, self.fallback, 0, entities, text)
+        best = min(scores, key=lambda name: (-scores[name], self._intents[name].order))
+        return Route(best, self._intents[best].handler, scores[best], entities, text)
+
+    def dispatch(self, query_text, today=None, **kwargs):
+        """
+        Route a query and call its handler with the Route and kwargs.
+
+        Raises:
+            LookupError: If nothing matched and there is no fallback
+        """
+        route = self.route(query_text, today)
+        if route.handler is None:
+            raise LookupError(f"No intent matches {query_text!r}")
+        return route.handler(route, **kwargs)
@@ -0,0 +1,442 @@
+"""
+Token-bucket rate limiting for login and other expensive endpoints.
+
+Each Rule is a bucket of `capacity` tokens refilled at capacity / period
+tokens per second, kept per client IP, per account, per account and IP,
+or once per route. A request takes one token from every one of its
+route's buckets, or from none: an empty bucket rejects it with 429 (JSON)
+or a flash and redirect (forms) and a Retry-After header, and the other
+buckets keep their tokens. A rejection happens before the view runs, so
+it costs a few dictionary operations: no bcrypt, no database write.
+
+Login attempts are limited per (email, IP), and failed ones also per
+email across every address. That second bucket is a failures_only rule:
+it is checked before the view but only the view takes from it, through
+record_failure() after a wrong password, so the owner's own successful
+logins never use it up. A browser that has logged in to the account
+before carries a signed known-device cookie (remember_device) and skips
+failures_only rules, so failed attempts from elsewhere cannot lock the
+owner out while a guessing attack spread over many addresses still runs
+dry.
+
+Client addresses are request.remote_addr. Behind reverse proxies, set
+TRUSTED_PROXIES in app.py to the number of proxies in front of the app so
+that ProxyFix takes the address from X-Forwarded-For; otherwise every
+client shares the proxy's buckets. Per-IP limits assume one client per
+address: everyone behind a NAT (a campus network) shares one bucket, which
+is why logins and bookings are also limited per account.
+
+Stores:
+- MemoryStore (default): an LRU-bounded dict per process. Under a key
+  flood the least recently used buckets are dropped, which only ever
+  resets a client to a full bucket.
+- SQLiteStore: a small separate database file shared by every worker
+  process on the host, so limits hold across processes. A rejection only
+  reads it; an allowed request writes its bucket back.
+
+Configured with RATE_LIMIT_ENABLED (default 1) and RATE_LIMIT_STORE
+('memory' or the path of a SQLite file).
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, flash, jsonify, redirect, request, session
+from itsdangerous import BadData, URLSafeTimedSerializer
+
+# Buckets kept by a MemoryStore before the least recently used are dropped
+MAX_KEYS = 100_000
+# Known-device cookie: how long it lasts and how many accounts it remembers (shared computers)
+KNOWN_DEVICE_COOKIE = 'known_device'
+KNOWN_DEVICE_DAYS = 180
+KNOWN_DEVICE_ACCOUNTS = 5
+# A SQLiteStore drops buckets idle this many seconds (full again by then) every PURGE_EVERY writes
+PURGE_AFTER = 86400
+PURGE_EVERY = 1000
+
+
+class Rule:
+    """A token bucket: capacity requests, refilled evenly over period seconds."""
+
+    def __init__(self, name, scope, capacity, period, failures_only=False):
+        """
+        Describe a bucket.
+
+        Args:
+            name: Bucket name, unique per route
+            scope: 'ip', 'account', 'account_ip' or 'route'
+            capacity: Requests allowed in a burst
+            period: Seconds to refill from empty to capacity
+            failures_only: Only record_failure() takes tokens; requests just
+                need one left, and known devices skip the rule
+
+        Raises:
+            ValueError: If scope is unknown
+        """
+        if scope not in ('ip', 'account', 'account_ip', 'route'):
+            raise ValueError(f"Unknown rate limit scope: {scope} (choose from ip, account, account_ip, route)")
+        self.name = name
+        self.scope = scope
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.failures_only = failures_only
+
+
+def _refill(tokens, updated_at, capacity, rate, now):
+    """Tokens in a bucket last left with `tokens` at `updated_at`."""
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+class MemoryStore:
+    """Token buckets in an LRU-bounded dict, for a single process."""
+
+    def __init__(self, max_keys=MAX_KEYS):
+        """Initialize an empty store holding at most max_keys buckets."""
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        """
+        Take one token from a bucket.
+
+        Returns:
+            (allowed, seconds until a token is available)
+        """
+        allowed, retry_after, _ = self.take_all([(key, capacity, rate)], now)
+        return allowed, retry_after
+
+    def peek_all(self, buckets, now):
+        """Check every bucket has a token without taking any; returns like take_all."""
+        with self._lock:
+            for index, (key, capacity, rate) in enumerate(buckets):
+                state = self._buckets.get(key)
+                tokens = capacity if state is None else _refill(*state, capacity, rate, now)
+                if tokens < 1:
+                    return False, (1 - tokens) / rate, index
+            return True, 0.0, None
+
+    def take_all(self, buckets, now):
+        """
+        Take one token from every bucket, or from none if any is empty.
+
+        Args:
+            buckets: List of (key, capacity, rate)
+            now: Current time in seconds
+
+        Returns:
+            (allowed, seconds until a token is available, index of the first empty bucket or None)
+        """
+        with self._lock:
+            levels = []
+            for index, (key, capacity, rate) in enumerate(buckets):
+                state = self._buckets.get(key)
+                tokens = capacity if state is None else _refill(*state, capacity, rate, now)
+                if tokens < 1:
+                    if state is not None:
+                        self._buckets.move_to_end(key)
+                    return False, (1 - tokens) / rate, index
+                levels.append(tokens)
+            for (key, _, _), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens - 1, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return True, 0.0, None
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteStore:
+    """Token buckets in a SQLite file shared by the worker processes of a host."""
+
+    def __init__(self, path):
+        """Initialize the store, creating its table if needed."""
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def _connection(self):
+        """This thread's connection (opened once; buckets are cheap to lose, so no fsync)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = OFF")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate, now):
+        """
+        Take one token from a bucket.
+
+        Returns:
+            (allowed, seconds until a token is available)
+        """
+        allowed, retry_after, _ = self.take_all([(key, capacity, rate)], now)
+        return allowed, retry_after
+
+    @staticmethod
+    def _levels(conn, buckets, now):
+        """Tokens in each bucket, stopping at the first empty one."""
+        levels = []
+        for key, capacity, rate in buckets:
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?",
+                               (key,)).fetchone()
+            levels.append(capacity if row is None else _refill(*row, capacity, rate, now))
+            if levels[-1] < 1:
+                break
+        return levels
+
+    def peek_all(self, buckets, now):
+        """Check every bucket has a token without taking any; returns like take_all."""
+        levels = self._levels(self._connection(), buckets, now)
+        if levels and levels[-1] < 1:
+            return False, (1 - levels[-1]) / buckets[len(levels) - 1][2], len(levels) - 1
+        return True, 0.0, None
+
+    def take_all(self, buckets, now):
+        """
+        Take one token from every bucket, or from none if any is empty.
+
+        Args:
+            buckets: List of (key, capacity, rate)
+            now: Current time in seconds
+
+        Returns:
+            (allowed, seconds until a token is available, index of the first empty bucket or None)
+        """
+        conn = self._connection()
+        # A rejection only reads
+        rejection = self.peek_all(buckets, now)
+        if not rejection[0]:
+            return rejection
+        # Re-read under the write lock: another worker may have taken the last token
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            levels = self._levels(conn, buckets, now)
+            allowed = not levels or levels[-1] >= 1
+            if allowed:
+                conn.executemany("""
+                    INSERT INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at
+                """, [(key, tokens - 1, now) for (key, _, _), tokens in zip(buckets, levels)])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if not allowed:
+            return False, (1 - levels[-1]) / buckets[len(levels) - 1][2], len(levels) - 1
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.purge(PURGE_AFTER)
+        return True, 0.0, None
+
+    def purge(self, older_than):
+        """Delete buckets untouched for older_than seconds (they would be full anyway)."""
+        conn = self._connection()
+        conn.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (time.time() - older_than,))
+
+
+class RateLimiter:
+    """Applies Rules to requests using a store."""
+
+    def __init__(self, store=None, enabled=True):
+        """Initialize a limiter (default: a MemoryStore)."""
+        self.store = store if store is not None else MemoryStore()
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = {}
+
+    @staticmethod
+    def _key(route, rule, ip, account):
+        """Bucket key of a rule for a request, or None if the rule does not apply."""
+        if rule.scope == 'ip':
+            return f"{route}:{rule.name}:{ip}"
+        if rule.scope in ('account', 'account_ip'):
+            if account is None:
+                return None
+            key = f"{route}:{rule.name}:{account}"
+            return f"{key}:{ip}" if rule.scope == 'account_ip' else key
+        return f"{route}:{rule.name}"
+
+    def check(self, route, rules, ip, account=None, known_device=False):
+        """
+        Take a token from each of a request's buckets, or from none of them.
+
+        Every bucket is checked before any token is taken, so a request
+        rejected by one rule does not use up the others. failures_only
+        rules are checked but not taken from, and skipped for a known device.
+
+        Args:
+            route: Route name, part of every bucket key
+            rules: Rules to apply, in order
+            ip: Client address
+            account: Account identifier, or None to skip account rules
+            known_device: The client has logged in to the account before
+
+        Returns:
+            (allowed, retry_after seconds, name of the first rejecting rule or None)
+        """
+        if not self.enabled:
+            return True, 0.0, None
+        taken, peeked = [], []
+        for rule in rules:
+            key = self._key(route, rule, ip, account)
+            if key is None or (rule.failures_only and known_device):
+                continue
+            (peeked if rule.failures_only else taken).append((rule, (key, rule.capacity, rule.rate)))
+        now = time.time()
+        allowed, retry_after, index = self.store.peek_all([bucket for _, bucket in peeked], now)
+        rejecting = peeked
+        if allowed:
+            allowed, retry_after, index = self.store.take_all([bucket for _, bucket in taken], now)
+            rejecting = taken
+        if not allowed:
+            name = rejecting[index][0].name
+            self.rejected[name] = self.rejected.get(name, 0) + 1
+            return False, retry_after, name
+        self.allowed += 1
+        return True, 0.0, None
+
+    def record_failure(self, route, rules, ip, account=None):
+        """Take a token from each failures_only bucket of a request that failed (e.g. a wrong password)."""
+        if not self.enabled:
+            return
+        now = time.time()
+        for rule in rules:
+            key = self._key(route, rule, ip, account)
+            if rule.failures_only and key is not None:
+                self.store.take(key, rule.capacity, rule.rate, now)
+
+
+# Buckets per route. Accounts are the submitted email before login, the user id after.
+LIMITS = {
+    'login': [Rule('ip', 'ip', 20, 60), Rule('account', 'account_ip', 10, 900),
+              Rule('account_failures', 'account', 50, 3600, failures_only=True)],
+    'register': [Rule('ip', 'ip', 10, 3600)],
+    'concierge_ask': [Rule('account', 'account', 20, 60), Rule('route', 'route', 600, 60)],
+    'concierge_query': [Rule('account', 'account', 60, 60), Rule('route', 'route', 1200, 60)],
+    'booking_create': [Rule('account', 'account', 30, 600), Rule('ip', 'ip', 60, 600)],
+}
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Get the process-wide limiter, configured from the environment on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            store_setting = os.getenv('RATE_LIMIT_STORE', 'memory')
+            store = MemoryStore() if store_setting == 'memory' else SQLiteStore(store_setting)
+            _limiter = RateLimiter(store, enabled=os.getenv('RATE_LIMIT_ENABLED', '1') != '0')
+        return _limiter
+
+
+def set_rate_limiter(limiter):
+    """Replace the process-wide limiter (tests, or custom stores)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
+
+
+def session_account():
+    """Account of a logged-in request: its user id."""
+    return session.get('user_id')
+
+
+def form_email():
+    """Account of a login form: the submitted email address."""
+    return request.form.get('email', '').strip().lower() or None
+
+
+def _device_serializer():
+    """Signs known-device cookies with the app's secret key."""
+    return URLSafeTimedSerializer(current_app.secret_key, salt='known-device')
+
+
+def _device_id(account):
+    """Account as stored in a known-device cookie (a digest, not the email itself)."""
+    return hashlib.sha256(str(account).encode()).hexdigest()[:16]
+
+
+def _device_accounts():
+    """Account digests in the request's known-device cookie (none if missing, forged or expired)."""
+    token = request.cookies.get(KNOWN_DEVICE_COOKIE)
+    if not token:
+        return []
+    try:
+        return _device_serializer().loads(token, max_age=KNOWN_DEVICE_DAYS * 86400)
+    except BadData:
+        return []
+
+
+def is_known_device(account):
+    """Whether the request comes from a browser that has logged in to account before."""
+    return account is not None and _device_id(account) in _device_accounts()
+
+
+def remember_device(response, account):
+    """Mark the browser as known for account (call on a successful login); returns response."""
+    accounts = [_device_id(account)] + [known for known in _device_accounts() if known != _device_id(account)]
+    response.set_cookie(KNOWN_DEVICE_COOKIE, _device_serializer().dumps(accounts[:KNOWN_DEVICE_ACCOUNTS]),
+                        max_age=KNOWN_DEVICE_DAYS * 86400, httponly=True, samesite='Lax',
+                        secure=request.is_secure)
+    return response
+
+
+def record_failure(route, account):
+    """Count a failed request (e.g. a wrong password) against LIMITS[route]'s failures_only rules."""
+    get_rate_limiter().record_failure(route, LIMITS[route], request.remote_addr, account)
+
+
+def rate_limited(route, account=session_account, methods=('POST',)):
+    """
+    Decorator applying LIMITS[route] to a view before it runs.
+
+    Args:
+        route: Key of LIMITS
+        account: Callable returning the request's account id, or None
+        methods: HTTP methods that are limited (others pass freely)
+    """
+    rules = LIMITS[route]
+    checks_devices = any(rule.failures_only for rule in rules)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method not in methods:
+                return f(*args, **kwargs)
+            account_id = account()
+            allowed, retry_after, _ = get_rate_limiter().check(
+                route, rules, request.remote_addr, account_id,
+                known_device=checks_devices and is_known_device(account_id)
+            )
+            if allowed:
+                return f(*args, **kwargs)
+            message = 'Too many requests. Please wait a moment and try again.'
+            if request.is_json:
+                response = jsonify({'success': False, 'message': message})
+                response.status_code = 429
+            else:
+                flash(message, 'warning')
+                response = redirect(request.url)
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+            return response
+        return decorated_function
+    return decorator
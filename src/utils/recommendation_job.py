@@ -0,0 +1,87 @@
+"""
+Background job that recomputes personalized recommendations.
+
+Runs RecommendationDAL.recompute() on a daemon thread at a fixed interval
+so request handlers only ever read the stored per-user lists.
+
+Usage (one-off recompute, e.g. from cron):
+    python -m src.utils.recommendation_job
+"""
+
+import logging
+import threading
+import time
+from src.data_access.database import Database
+from src.data_access.recommendation_dal import RecommendationDAL
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between recomputes
+DEFAULT_INTERVAL = 3600
+
+
+class RecommendationJob:
+    """Periodically recomputes user_recommendations on a daemon thread."""
+
+    def __init__(self, db: Database, interval=DEFAULT_INTERVAL):
+        """Initialize the job for a database and interval in seconds."""
+        self.recommendation_dal = RecommendationDAL(db)
+        self.interval = interval
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """
+        Recompute recommendations now.
+
+        Returns:
+            dict with users, resources, rows and seconds taken
+        """
+        start = time.perf_counter()
+        result = self.recommendation_dal.recompute()
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        self.last_run = result
+        return result
+
+    def _run(self):
+        """Thread body: recompute, then sleep until the next interval or stop()."""
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                logger.info("Recomputed recommendations: %s", result)
+            except Exception:
+                logger.exception("Recommendation recompute failed")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread if it is not already running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='recommendation-job', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Ask the background thread to exit after the current run."""
+        self._stop.set()
+
+
+_job = None
+_job_lock = threading.Lock()
+
+
+def start_recommendation_job(db: Database, interval=DEFAULT_INTERVAL):
+    """Start the process-wide recommendation job once; later calls return it."""
+    global _job
+    with _job_lock:
+        if _job is None:
+            _job = RecommendationJob(db, interval)
+            _job.start()
+        return _job
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    print(RecommendationJob(Database()).run_once())
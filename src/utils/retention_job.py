@@ -0,0 +1,113 @@
+"""
+Background job that archives old admin logs and messages.
+
+Runs RetentionDAL.run() on a daemon thread at a fixed interval so the hot
+tables keep only recent rows.
+
+Usage (one-off run, e.g. from cron):
+    python -m src.utils.retention_job [--admin-logs-days N] [--messages-days N]
+    python -m src.utils.retention_job --enable-incremental-vacuum
+"""
+
+import argparse
+import logging
+import threading
+from src.data_access.database import Database
+from src.data_access.retention_dal import DEFAULT_RETENTION_DAYS, RetentionDAL
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between runs
+DEFAULT_INTERVAL = 86400
+
+
+class RetentionJob:
+    """Periodically moves expired rows to the archive database on a daemon thread."""
+
+    def __init__(self, db: Database, interval=DEFAULT_INTERVAL, retention_days=None):
+        """
+        Initialize the job.
+
+        Args:
+            db: Main database
+            interval: Seconds between runs
+            retention_days: dict of table -> days overriding DEFAULT_RETENTION_DAYS
+        """
+        self.retention_dal = RetentionDAL(db)
+        self.interval = interval
+        self.retention_days = retention_days
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """
+        Archive expired rows now.
+
+        Returns:
+            dict with rows moved per table, pages freed and seconds taken
+        """
+        result = self.retention_dal.run(self.retention_days)
+        self.last_run = result
+        return result
+
+    def _run(self):
+        """Thread body: run, then sleep until the next interval or stop()."""
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                logger.info("Applied retention: %s", result)
+            except Exception:
+                logger.exception("Retention run failed")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread if it is not already running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='retention-job', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Ask the background thread to exit after the current run."""
+        self._stop.set()
+
+
+_job = None
+_job_lock = threading.Lock()
+
+
+def start_retention_job(db: Database, interval=DEFAULT_INTERVAL, retention_days=None):
+    """Start the process-wide retention job once; later calls return it."""
+    global _job
+    with _job_lock:
+        if _job is None:
+            _job = RetentionJob(db, interval, retention_days)
+            _job.start()
+        return _job
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Archive old admin logs and messages.')
+    parser.add_argument('--admin-logs-days', type=int, default=DEFAULT_RETENTION_DAYS['admin_logs'])
+    parser.add_argument('--messages-days', type=int, default=DEFAULT_RETENTION_DAYS['messages'])
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help='convert the database with one full VACUUM first')
+    parser.add_argument('--db', default='campus_hub.db', help='database file')
+    args = parser.parse_args(argv)
+
+    retention_dal = RetentionDAL(Database(args.db))
+    if args.enable_incremental_vacuum:
+        retention_dal.enable_incremental_vacuum()
+    try:
+        print(retention_dal.run({'admin_logs': args.admin_logs_days, 'messages': args.messages_days}))
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,126 @@
+"""
+Cached snapshots of expensive read-only computations.
+
+A Snapshot holds the last computed value with the time and table
+generation it was computed at. Reads are a couple of attribute lookups:
+
+- fresh (within the TTL and no watched table written since): returned as is
+- stale: returned immediately while one background thread recomputes it
+  (stale-while-revalidate)
+- missing, or older than max_stale: computed in the caller, with concurrent
+  callers waiting on that one computation (single-flight)
+
+Callers share the returned value and must not mutate it.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """A TTL- and change-invalidated cache of one computed value."""
+
+    def __init__(self, compute, db=None, tables=(), ttl=30.0, max_stale=300.0):
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            compute: Zero-argument callable producing the value
+            db: Database whose writes invalidate the value
+            tables: Tables to watch in db
+            ttl: Seconds a value stays fresh when nothing changed
+            max_stale: Seconds after which a stale value is no longer served
+        """
+        self.compute = compute
+        self.db = db
+        self.tables = tuple(tables)
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._value = None
+        self._computed_at = None
+        self._generation = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.hits = 0
+        self.stale_hits = 0
+        self.computations = 0
+
+    def _current_generation(self):
+        """Generation token of the watched tables."""
+        return self.db.generation(*self.tables) if self.db is not None else None
+
+    def _is_fresh(self, now):
+        """True if the cached value can be served without any refresh."""
+        return (now - self._computed_at < self.ttl
+                and self._generation == self._current_generation())
+
+    def _refresh(self):
+        """Compute and store a new value (caller holds the right to refresh)."""
+        generation = self._current_generation()
+        value = self.compute()
+        self.computations += 1
+        # Publish value and stamps together: readers check _computed_at first
+        self._value, self._generation, self._computed_at = value, generation, time.monotonic()
+        return value
+
+    def _refresh_in_background(self):
+        """Thread body for stale-while-revalidate refreshes."""
+        try:
+            self._refresh()
+        except Exception:
+            logger.exception("Snapshot refresh failed; serving the previous value")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self):
+        """Get the cached value, refreshing it as described in the module docstring."""
+        computed_at = self._computed_at
+        if computed_at is not None:
+            now = time.monotonic()
+            if self._is_fresh(now):
+                self.hits += 1
+                return self._value
+            if now - computed_at < self.max_stale:
+                with self._lock:
+                    start = not self._refreshing
+                    self._refreshing = True
+                if start:
+                    threading.Thread(
+                        target=self._refresh_in_background, name='snapshot-refresh', daemon=True
+                    ).start()
+                self.stale_hits += 1
+                return self._value
+
+        # Nothing servable: one caller computes, the rest wait for its result
+        with self._lock:
+            if self._computed_at is not None and time.monotonic() - self._computed_at < self.max_stale:
+                return self._value
+            return self._refresh()
+
+    def invalidate(self):
+        """Force the next read to refresh."""
+        self._generation = object()
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(key, compute, **options):
+    """Get the process-wide snapshot for key, creating it on first use."""
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = Snapshot(compute, **options)
+            _snapshots[key] = snapshot
+        return snapshot
+
+
+def clear_snapshots():
+    """Forget all snapshots (used when a database file is recreated)."""
+    with _snapshots_lock:
+        _snapshots.clear()
@@ -0,0 +1,262 @@
+"""
+Bulk user provisioning from CSV, plus a CLI.
+
+Columns: name, email, role (default student), department, password
+(optional). Import runs in three passes over the whole file:
+
+1. Validate: each column goes through validate_name / validate_email /
+   validate_role (and validate_password_strength for given passwords)
+   in one pass, then emails are checked for duplicates within the file and
+   against users in one query.
+2. Hash: passwords of valid rows are hashed on a process pool, so every
+   core runs bcrypt. Rows without a password get a random initial one
+   (reported back once). Random passwords are not guessable, so they are
+   hashed at INITIAL_ROUNDS rather than BCRYPT_ROUNDS; rehash-on-login
+   raises them to the configured cost at the user's first login.
+3. Insert: executemany in transactions of CHUNK_SIZE rows. An email
+   registered meanwhile is skipped, not fatal to its chunk.
+
+The result is one report row per input row: created (with user_id),
+exists or error (with the reasons).
+
+Usage:
+    python -m src.utils.user_import cohort.csv --report cohort-report.csv
+"""
+
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+from src.data_access.database import Database
+from src.utils.auth import BCRYPT_ROUNDS, validate_password_strength
+from src.utils.validators import validate_email, validate_name, validate_role
+
+# Users inserted per transaction
+CHUNK_SIZE = 1000
+# bcrypt cost of generated initial passwords (upgraded at first login)
+INITIAL_ROUNDS = 6
+# Largest file accepted
+MAX_ROWS = 100_000
+REPORT_COLUMNS = ['line', 'email', 'status', 'user_id', 'initial_password', 'errors']
+
+
+def _hash(args):
+    """Process-pool body: bcrypt hash of (password, rounds)."""
+    password, rounds = args
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def read_rows(text):
+    """
+    Parse CSV text into row dicts with normalized values.
+
+    Raises:
+        ValueError: If the header lacks name or email, or the file is too long
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    fields = {field.strip().lower() for field in reader.fieldnames or []}
+    missing = {'name', 'email'} - fields
+    if missing:
+        raise ValueError(f"CSV header is missing: {', '.join(sorted(missing))}")
+    rows = []
+    for record in reader:
+        record = {(key or '').strip().lower(): (value or '').strip() for key, value in record.items()}
+        rows.append({
+            'line': reader.line_num,
+            'name': record.get('name', ''),
+            'email': record.get('email', '').lower(),
+            'role': record.get('role', '').lower() or 'student',
+            'department': record.get('department') or None,
+            'password': record.get('password', ''),
+        })
+        if len(rows) > MAX_ROWS:
+            raise ValueError(f"At most {MAX_ROWS} users can be imported at once")
+    return rows
+
+
+def validate_rows(db, rows):
+    """
+    Validate every row; return one list of error messages per row.
+
+    Column-wise: each validator runs over its whole column, and existing
+    emails are found with one query.
+    """
+    columns = [
+        map(validate_name, (row['name'] for row in rows)),
+        map(validate_email, (row['email'] for row in rows)),
+        map(validate_role, (row['role'] for row in rows)),
+        ((True, None) if not row['password'] else validate_password_strength(row['password'])
+         for row in rows),
+    ]
+    errors = [[message for ok, message in results if not ok] for results in zip(*columns)]
+
+    seen = {}
+    for index, row in enumerate(rows):
+        if row['email'] in seen:
+            errors[index].append(f"Duplicate of line {rows[seen[row['email']]]['line']}")
+        else:
+            seen[row['email']] = index
+    existing = {row['email'] for row in db.execute_query("SELECT email FROM users", fetch_all=True)}
+    for index, row in enumerate(rows):
+        if row['email'] in existing and not errors[index]:
+            errors[index].append('exists')
+    return errors
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash (password, rounds) pairs on a process pool.
+
+    Args:
+        passwords: List of (password, rounds)
+        workers: Processes (default: CPU count); 1 hashes in this process
+
+    Returns:
+        List of hashes in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < 2:
+        return [_hash(item) for item in passwords]
+    # spawn, not fork: the web process has background threads whose locks a fork would copy
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        chunksize = max(1, len(passwords) // (workers * 8))
+        return list(pool.map(_hash, passwords, chunksize=chunksize))
+
+
+def insert_users(db, users):
+    """
+    Insert users with executemany, CHUNK_SIZE per transaction.
+
+    Args:
+        users: List of (name, email, password_hash, role, department)
+
+    Returns:
+        dict of email -> user_id for the rows this call inserted
+    """
+    created = {}
+    for start in range(0, len(users), CHUNK_SIZE):
+        chunk = users[start:start + CHUNK_SIZE]
+        with db.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO users (name, email, password_hash, role, department)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (email) DO NOTHING
+            """, chunk)
+            hashes = {user[1]: user[2] for user in chunk}
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS import_emails (email TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.import_emails")
+            conn.executemany("INSERT INTO temp.import_emails (email) VALUES (?)", ((email,) for email in hashes))
+            for user_id, email, password_hash in conn.execute("""
+                SELECT user_id, email, password_hash FROM users
+                WHERE email IN (SELECT email FROM temp.import_emails)
+            """):
+                # A different hash means someone else registered the email first
+                if hashes[email] == password_hash:
+                    created[email] = user_id
+    return created
+
+
+def import_users(db, text, workers=None):
+    """
+    Import users from CSV text.
+
+    Args:
+        db: Database to insert into
+        text: CSV content
+        workers: Hashing processes (default: CPU count)
+
+    Returns:
+        (report rows, summary dict with created, exists, errors and seconds per phase)
+
+    Raises:
+        ValueError: If the CSV header or size is invalid
+    """
+    timings = {}
+    start = time.perf_counter()
+    rows = read_rows(text)
+    errors = validate_rows(db, rows)
+    timings['validate_seconds'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    valid = [index for index, row_errors in enumerate(errors) if not row_errors]
+    generated = {}
+    passwords = []
+    for index in valid:
+        password = rows[index]['password']
+        if password:
+            passwords.append((password, BCRYPT_ROUNDS))
+        else:
+            generated[index] = secrets.token_urlsafe(12)
+            passwords.append((generated[index], INITIAL_ROUNDS))
+    hashes = hash_passwords(passwords, workers)
+    timings['hash_seconds'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    created = insert_users(db, [
+        (rows[index]['name'], rows[index]['email'], password_hash, rows[index]['role'], rows[index]['department'])
+        for index, password_hash in zip(valid, hashes)
+    ])
+    timings['insert_seconds'] = round(time.perf_counter() - start, 3)
+
+    report = []
+    for index, row in enumerate(rows):
+        entry = {'line': row['line'], 'email': row['email'], 'status': 'error',
+                 'user_id': '', 'initial_password': '', 'errors': '; '.join(errors[index])}
+        if errors[index] == ['exists']:
+            entry.update(status='exists', errors='')
+        elif not errors[index]:
+            if row['email'] in created:
+                entry.update(status='created', user_id=created[row['email']],
+                             initial_password=generated.get(index, ''))
+            else:
+                entry.update(status='exists')
+        report.append(entry)
+
+    summary = {status: sum(entry['status'] == status for entry in report)
+               for status in ('created', 'exists', 'error')}
+    summary.update(timings)
+    return report, summary
+
+
+def report_csv(report):
+    """Render an import report as CSV text."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(report)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Create users in bulk from a CSV file.')
+    parser.add_argument('csv_file', help='CSV with name, email[, role, department, password]')
+    parser.add_argument('--report', help='write the per-row report here (default: stdout)')
+    parser.add_argument('--workers', type=int, help='hashing processes (default: CPU count)')
+    parser.add_argument('--db', default='campus_hub.db', help='database file')
+    args = parser.parse_args(argv)
+
+    with open(args.csv_file, encoding='utf-8-sig', newline='') as f:
+        text = f.read()
+    try:
+        report, summary = import_users(Database(args.db), text, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8', newline='') as out:
+            out.write(report_csv(report))
+    else:
+        print(report_csv(report), end='')
+    print(summary, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -131,6 +131,25 @@ def validate_datetime(datetime_str):
         return False, "Invalid datetime format"
 
 
+def validate_date(date_str):
+    """
+    Validate a calendar date string.
+
+    Args:
+        date_str: Date string in YYYY-MM-DD format
+
+    Returns:
+        Tuple of (is_valid, date_object or error_message)
+    """
+    if not date_str:
+        return False, "Date is required"
+
+    try:
+        return True, datetime.strptime(date_str, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return False, "Invalid date format (use YYYY-MM-DD)"
+
+
 def validate_booking_times(start_datetime, end_datetime):
     """
     Validate booking start and end times.
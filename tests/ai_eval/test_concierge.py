@@ -147,3 +147,23 @@ def test_concierge_recommendations_quality(setup_test_data):
         assert 'avg_rating' in rec
         assert 'review_count' in rec
         assert rec['avg_rating'] >= 0
+
+
+def test_intent_routing_corpus():
+    """Test every corpus query routes to its labelled intent and entities."""
+    import json
+    from datetime import date
+    with open(os.path.join(os.path.dirname(__file__), 'intent_corpus.json')) as f:
+        corpus = json.load(f)
+    router = ResourceConcierge().router
+    router.set_vocabulary(**corpus['vocabulary'])
+    today = date.fromisoformat(corpus['today'])
+
+    for case in corpus['queries']:
+        route = router.route(case['query'], today)
+        entities = {k: v.isoformat() if k == 'date' else v for k, v in route.entities.items()}
+        assert route.intent == case['intent'], case['query']
+        for name, value in case.get('entities', {}).items():
+            assert entities.get(name) == value, case['query']
+        for name in case.get('absent', []):
+            assert name not in entities, case['query']
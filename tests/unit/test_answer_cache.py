@@ -0,0 +1,83 @@
+"""
+Unit tests for the concierge answer cache.
+Tests hits without database reads, invalidation by table generation and
+TTL, LRU eviction, and the concierge serving repeated questions from it.
+"""
+
+import pytest
+import os
+import time
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.utils import ai_concierge
+from src.utils.answer_cache import AnswerCache
+from src.utils.snapshot import clear_snapshots
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with one published resource."""
+    db = Database('test_answer_cache.db')
+    owner = UserDAL(db).create_user('Owner', 'owner@example.com', 'x', 'staff')
+    ResourceDAL(db).create_resource(owner_id=owner, title='Study Room A', description='Quiet',
+                                    category='Study Room', location='Library Building',
+                                    capacity=4, status='published')
+    yield db
+    clear_catalogs()
+    clear_snapshots()
+    if os.path.exists('test_answer_cache.db'):
+        os.remove('test_answer_cache.db')
+
+
+def test_hit_until_a_table_is_written(test_db):
+    """Test an answer is reused until one of its tables changes."""
+    cache = AnswerCache(test_db)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_compute(('stats', ()), ('users',), compute) == 1
+    assert cache.get_or_compute(('stats', ()), ('users',), compute) == 1
+    test_db.execute_query("UPDATE resources SET capacity = 5")
+    assert cache.get_or_compute(('stats', ()), ('users',), compute) == 1
+    UserDAL(test_db).create_user('New', 'new@example.com', 'x', 'student')
+    assert cache.get_or_compute(('stats', ()), ('users',), compute) == 2
+    assert cache.stats()['hits'] == 2 and cache.stats()['invalidations'] == 1
+
+
+def test_ttl_and_lru(test_db):
+    """Test entries expire after the TTL and the least recently used is evicted."""
+    cache = AnswerCache(test_db, max_entries=2, ttl=0.05)
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get_or_compute(key, (), lambda: key)
+    assert cache.stats()['evictions'] == 1
+    assert cache.get_or_compute('a', (), lambda: 'new') == 'a'
+    assert cache.get_or_compute('b', (), lambda: 'new') == 'new'
+    time.sleep(0.06)
+    assert cache.get_or_compute('a', (), lambda: 'expired') == 'expired'
+
+
+def test_repeated_question_skips_the_database(test_db, monkeypatch):
+    """Test the concierge answers a repeated question without running a query."""
+    monkeypatch.setattr(ai_concierge, 'Database', lambda: test_db)
+    concierge = ai_concierge.ResourceConcierge()
+    first = concierge.generate_natural_language_response('What categories are there?')
+    assert 'Study Room' in first
+
+    queries = []
+    monkeypatch.setattr(test_db, 'execute_query', lambda *args, **kwargs: queries.append(args))
+    assert concierge.generate_natural_language_response('what CATEGORIES are there') == first
+    assert queries == []
+    assert concierge.answer_cache.stats()['hits'] == 1
+
+
+def test_answers_are_keyed_by_entities_and_user(test_db, monkeypatch):
+    """Test different categories, or different users asking for recommendations, get separate entries."""
+    monkeypatch.setattr(ai_concierge, 'Database', lambda: test_db)
+    concierge = ai_concierge.ResourceConcierge()
+    for query, user_id in (('find a study room', 1), ('find a study room', 2),
+                           ('find something in the library', 1), ('recommend something', 1),
+                           ('recommend something', 2)):
+        concierge.generate_natural_language_response(query, user_id=user_id)
+    stats = concierge.answer_cache.stats()
+    assert (stats['hits'], stats['entries']) == (1, 4)
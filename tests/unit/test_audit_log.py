@@ -0,0 +1,133 @@
+"""
+Unit tests for the asynchronous audit log writer.
+Tests batching, flush, the synchronous fallback of a full queue, retries
+and the final flush on close.
+"""
+
+import pytest
+import os
+import threading
+from src.data_access.database import Database
+from src.data_access.admin_dal import AdminDAL
+from src.data_access.user_dal import UserDAL
+from src.data_access import audit_log
+from src.data_access.audit_log import AuditLogWriter, clear_audit_writers
+from src.utils.snapshot import clear_snapshots
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with one admin."""
+    db = Database('test_audit_log.db')
+    UserDAL(db).create_user('Admin', 'admin@example.com', 'x', 'admin')
+    yield db
+    clear_audit_writers()
+    clear_snapshots()
+    if os.path.exists('test_audit_log.db'):
+        os.remove('test_audit_log.db')
+
+
+def count_logs(db):
+    return db.execute_query("SELECT COUNT(*) AS n FROM admin_logs", fetch_one=True)['n']
+
+
+def test_records_written_in_batches(test_db):
+    """Test queued records are committed together by flush()."""
+    writer = AuditLogWriter(test_db, batch_size=100, flush_interval=60)
+    for i in range(250):
+        writer.log(1, f'Action {i}', 'users')
+    assert writer.flush()
+    assert count_logs(test_db) == 250
+    assert writer.batches == 3
+    assert writer.sync_writes == 0
+    writer.close()
+
+
+def test_admin_logs_read_their_own_writes(test_db):
+    """Test get_admin_logs includes an action logged just before."""
+    admin_dal = AdminDAL(test_db)
+    admin_dal.log_action(1, 'Deleted user: x@example.com', 'users', details='id=7')
+    logs = admin_dal.get_admin_logs()
+    assert [(log['action'], log['details'], log['admin_name']) for log in logs] == [
+        ('Deleted user: x@example.com', 'id=7', 'Admin')
+    ]
+    assert logs[0]['timestamp']
+
+
+def test_full_queue_writes_synchronously(test_db):
+    """Test overflowing the bounded queue of a stuck writer never drops a record."""
+    writer = AuditLogWriter(test_db, batch_size=1, flush_interval=0.01, maxsize=2)
+    write = writer._write
+    unstick = threading.Event()
+
+    def stuck_write(records):
+        if threading.current_thread() is writer._thread:
+            unstick.wait(5)
+        write(records)
+
+    writer._write = stuck_write
+    for i in range(10):
+        writer.log(1, f'Action {i}', 'users')
+    assert 1 <= writer.sync_writes <= 8
+    assert count_logs(test_db) == writer.sync_writes
+    unstick.set()
+    writer.close()
+    assert count_logs(test_db) == 10
+
+
+def test_failed_batch_is_retried(test_db, monkeypatch):
+    """Test a batch that fails to write is kept and written on retry."""
+    monkeypatch.setattr(audit_log, 'RETRY_INTERVAL', 0.01)
+    writer = AuditLogWriter(test_db, flush_interval=0.01)
+    write = writer._write
+    calls = []
+
+    def flaky_write(records):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise RuntimeError('disk I/O error')
+        write(records)
+
+    writer._write = flaky_write
+    writer.log(1, 'Action', 'users')
+    assert writer.flush(timeout=5)
+    assert writer.failures == 1
+    assert count_logs(test_db) == 1
+    writer.close()
+
+
+def test_close_writes_queue_and_later_logs(test_db):
+    """Test close() commits queued records and later records go straight to disk."""
+    writer = AuditLogWriter(test_db, batch_size=100, flush_interval=60)
+    writer.log(1, 'Before close', 'users')
+    writer.close()
+    assert count_logs(test_db) == 1
+    writer.log(1, 'After close', 'users')
+    assert count_logs(test_db) == 2
+    assert writer.sync_writes == 1
+
+
+def test_flush_during_a_write_leaves_the_writer_idle(test_db):
+    """Test a flush overlapping a slow write does not leave the thread spinning."""
+    writer = AuditLogWriter(test_db, flush_interval=0.01)
+    write = writer._write
+    writing = threading.Event()
+
+    def slow_write(records):
+        writing.set()
+        threading.Event().wait(0.1)
+        write(records)
+
+    writer._write = slow_write
+    writer.log(1, 'First', 'users')
+    writing.wait(5)
+    assert writer.flush(timeout=5)  # leaves a _WAKE queued behind the batch in flight
+
+    fill = writer._fill
+    calls = []
+    writer._fill = lambda batch: calls.append(1) or fill(batch)
+    threading.Event().wait(0.3)
+    assert not writer._hurry.is_set()
+    assert len(calls) < 100  # blocking on the queue, not spinning
+    assert count_logs(test_db) == 1
+    writer.close()
@@ -0,0 +1,95 @@
+"""
+Unit tests for cached role checks.
+Tests the auth cache, role changes and deletions revoking sessions, and
+the auth_version migration.
+"""
+
+import pytest
+import os
+from flask import Blueprint, Flask
+from src.controllers import auth_controller
+from src.controllers.auth_controller import auth_bp, role_required
+from src.data_access.auth_cache import AuthVersionCache, clear_auth_caches
+from src.data_access.database import Database
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with an admin."""
+    db = Database('test_auth_cache.db')
+    UserDAL(db).create_user('Admin', 'admin@example.com', 'x', 'admin')
+    yield db
+    clear_auth_caches()
+    if os.path.exists('test_auth_cache.db'):
+        os.remove('test_auth_cache.db')
+
+
+@pytest.fixture
+def client(test_db, monkeypatch):
+    """App with one admin-only route, checked against the test database."""
+    monkeypatch.setattr(auth_controller, 'auth_cache', UserDAL(test_db).auth_cache)
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(auth_bp)
+    main_bp = Blueprint('main', __name__)
+    main_bp.add_url_rule('/', 'index', lambda: 'home')
+    app.register_blueprint(main_bp)
+
+    @app.route('/admin-only')
+    @role_required('admin')
+    def admin_only():
+        return 'secret'
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session.update(user_id=1, user_role='admin', auth_version=1)
+    return client
+
+
+def test_cache_answers_without_reading_users(test_db):
+    """Test repeated checks hit memory until the TTL passes."""
+    cache = AuthVersionCache(test_db, ttl=60)
+    assert cache.get(1) == ('admin', 1)
+    assert cache.get(1) == ('admin', 1)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get(99) is None
+
+
+def test_role_change_revokes_session(client, test_db):
+    """Test a role change ends the session on the next request."""
+    assert client.get('/admin-only').data == b'secret'
+    assert UserDAL(test_db).update_role(1, 'student')
+
+    response = client.get('/admin-only')
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/auth/login')
+    with client.session_transaction() as session:
+        assert 'user_id' not in session
+
+
+def test_deleted_user_is_revoked(client, test_db):
+    """Test a deleted user's session no longer authorizes anything."""
+    assert client.get('/admin-only').data == b'secret'
+    UserDAL(test_db).delete_user(1)
+    assert client.get('/admin-only').headers['Location'].endswith('/auth/login')
+
+
+def test_wrong_role_is_refused(client, test_db):
+    """Test a current session with another role is sent home, not logged out."""
+    UserDAL(test_db).create_user('Student', 'student@example.com', 'x', 'student')
+    with client.session_transaction() as session:
+        session.update(user_id=2, user_role='student', auth_version=1)
+    assert client.get('/admin-only').headers['Location'].endswith('/')
+    with client.session_transaction() as session:
+        assert session['user_id'] == 2
+
+
+def test_migration_adds_auth_version(test_db):
+    """Test databases created before auth_version gain the column."""
+    with test_db.get_connection() as conn:
+        conn.execute("ALTER TABLE users DROP COLUMN auth_version")
+        conn.execute("DELETE FROM schema_migrations WHERE version = 4")
+
+    Database('test_auth_cache.db')
+    assert UserDAL(test_db).get_user_by_id(1)['auth_version'] == 1
@@ -0,0 +1,158 @@
+"""
+Unit tests for the booking analytics rollup.
+Tests that inserts, status changes and deletes flow through the change feed
+and that a rebuild matches the incrementally maintained rollup.
+"""
+
+import pytest
+import os
+from src.data_access.database import Database
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.rollup_dal import BookingRollupDAL
+from src.data_access.user_dal import UserDAL
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.vector_index import clear_vector_indexes
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with two resources and two departments."""
+    db = Database('test_booking_rollup.db')
+    users = UserDAL(db)
+    users.create_user('Owner', 'owner@example.com', 'x', 'staff', department='Facilities')
+    users.create_user('Student', 'student@example.com', 'x', 'student', department='Physics')
+    resources = ResourceDAL(db)
+    resources.create_resource(1, 'Room A', 'Study room', 'Study Rooms', 'Library', 4, status='published')
+    resources.create_resource(1, 'Lab B', 'Lab', 'Labs', 'Science', 20, status='published')
+    yield db
+    clear_catalogs()
+    clear_vector_indexes()
+    if os.path.exists('test_booking_rollup.db'):
+        os.remove('test_booking_rollup.db')
+
+
+def _usage(rollups, **kwargs):
+    """Category usage as {category: (count, hours)}."""
+    return {
+        row['category']: (row['booking_count'], row['booked_hours'])
+        for row in rollups.get_usage_by_category(**kwargs)
+    }
+
+
+def test_bookings_reach_rollup_once_approved(test_db):
+    """Test pending bookings are not usage until approved."""
+    bookings = BookingDAL(test_db)
+    rollups = BookingRollupDAL(test_db)
+    booking_id = bookings.create_booking(1, 2, '2030-03-01 10:00', '2030-03-01 12:00')
+
+    assert _usage(rollups) == {}
+
+    bookings.update_booking_status(booking_id, 'approved')
+    assert _usage(rollups) == {'Study Rooms': (1, 2.0)}
+    assert [dict(row) for row in rollups.get_usage_by_department()] == [
+        {'department': 'Physics', 'booking_count': 1, 'booked_hours': 2.0}
+    ]
+
+
+def test_cancel_and_delete_remove_usage(test_db):
+    """Test status changes away from approved and deletes subtract from the rollup."""
+    bookings = BookingDAL(test_db)
+    rollups = BookingRollupDAL(test_db)
+    first = bookings.create_booking(1, 2, '2030-03-01 10:00', '2030-03-01 11:00')
+    second = bookings.create_booking(2, 2, '2030-03-02 10:00', '2030-03-02 11:30')
+    bookings.update_booking_status(first, 'approved')
+    bookings.update_booking_status(second, 'approved')
+    assert _usage(rollups) == {'Study Rooms': (1, 1.0), 'Labs': (1, 1.5)}
+
+    bookings.update_booking_status(first, 'cancelled')
+    bookings.delete_booking(second)
+    assert _usage(rollups) == {}
+    # Only the cancelled booking's row is left
+    rows = test_db.execute_query("SELECT status, booking_count FROM booking_daily_rollup", fetch_all=True)
+    assert [tuple(row) for row in rows] == [('cancelled', 1)]
+
+
+def test_date_range_filter(test_db):
+    """Test usage is limited to the requested days."""
+    bookings = BookingDAL(test_db)
+    rollups = BookingRollupDAL(test_db)
+    for day in ('2030-03-01', '2030-03-15', '2030-04-01'):
+        booking_id = bookings.create_booking(1, 2, f'{day} 09:00', f'{day} 10:00')
+        bookings.update_booking_status(booking_id, 'completed')
+
+    assert _usage(rollups, start_day='2030-03-01', end_day='2030-03-31') == {'Study Rooms': (2, 2.0)}
+    assert _usage(rollups, start_day='2030-03-10') == {'Study Rooms': (2, 2.0)}
+    assert [row['day'] for row in rollups.get_daily_usage(end_day='2030-03-15')] == [
+        '2030-03-01', '2030-03-15'
+    ]
+
+
+def test_changes_applied_exactly_once(test_db):
+    """Test the checkpoint stops changes from being counted twice."""
+    bookings = BookingDAL(test_db)
+    rollups = BookingRollupDAL(test_db)
+    booking_id = bookings.create_booking(1, 2, '2030-03-01 10:00', '2030-03-01 11:00')
+    bookings.update_booking_status(booking_id, 'approved')
+
+    assert rollups.apply_changes() == 2
+    assert rollups.apply_changes() == 0
+    assert _usage(rollups) == {'Study Rooms': (1, 1.0)}
+
+
+def test_rebuild_matches_incremental(test_db):
+    """Test a full rebuild produces the same rollup as the change feed."""
+    bookings = BookingDAL(test_db)
+    rollups = BookingRollupDAL(test_db)
+    statuses = ['approved', 'completed', 'rejected', 'cancelled', 'approved']
+    for i, status in enumerate(statuses):
+        booking_id = bookings.create_booking(1 + i % 2, 2, f'2030-03-0{i + 1} 10:00', f'2030-03-0{i + 1} 11:00')
+        bookings.update_booking_status(booking_id, status)
+    bookings.delete_booking(1)
+
+    rollups.apply_changes()
+    query = "SELECT * FROM booking_daily_rollup ORDER BY day, resource_id, status"
+    incremental = [tuple(row) for row in test_db.execute_query(query, fetch_all=True)]
+
+    rollups.rebuild()
+    rebuilt = [tuple(row) for row in test_db.execute_query(query, fetch_all=True)]
+
+    assert rebuilt == incremental
+    assert rollups.apply_changes() == 0
+
+
+def test_recategorized_resource_moves_its_usage(test_db):
+    """Test a change after recategorizing subtracts from the category it was counted under."""
+    bookings = BookingDAL(test_db)
+    rollups = BookingRollupDAL(test_db)
+    booking_id = bookings.create_booking(2, 2, '2030-04-01 10:00', '2030-04-01 12:00')
+    bookings.update_booking_status(booking_id, 'approved')
+    rollups.apply_changes()
+    assert _usage(rollups) == {'Labs': (1, 2.0)}
+
+    ResourceDAL(test_db).update_resource(2, category='Studio')
+    UserDAL(test_db).update_user(2, department='Chemistry')
+    bookings.update_booking_status(booking_id, 'completed')
+    rollups.apply_changes()
+
+    negative = test_db.execute_query(
+        "SELECT COUNT(*) AS n FROM booking_daily_rollup WHERE booking_count < 0 OR booked_minutes < 0",
+        fetch_one=True)
+    assert negative['n'] == 0
+    assert _usage(rollups) == {'Studio': (1, 2.0)}
+    baseline = test_db.execute_query("""
+        SELECT r.category, u.department, COUNT(*) AS n FROM bookings b
+        JOIN resources r ON r.resource_id = b.resource_id
+        JOIN users u ON u.user_id = b.requester_id
+        GROUP BY r.category, u.department
+    """, fetch_all=True)
+    keyed = test_db.execute_query("""
+        SELECT category, department, SUM(booking_count) AS n FROM booking_daily_rollup
+        GROUP BY category, department
+    """, fetch_all=True)
+    assert [tuple(row) for row in keyed] == [tuple(row) for row in baseline] == [('Studio', 'Chemistry', 1)]
+
+    query = "SELECT * FROM booking_daily_rollup ORDER BY day, resource_id, status"
+    incremental = [tuple(row) for row in test_db.execute_query(query, fetch_all=True)]
+    rollups.rebuild()
+    assert [tuple(row) for row in test_db.execute_query(query, fetch_all=True)] == incremental
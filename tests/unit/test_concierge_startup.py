@@ -0,0 +1,79 @@
+"""
+Unit tests for lazy concierge construction.
+Tests that importing builds nothing, that concurrent first use builds one
+concierge, and that the preload leaves its context warm.
+"""
+
+import pytest
+import os
+import subprocess
+import sys
+import threading
+import time
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.utils import ai_concierge
+from src.utils.snapshot import clear_snapshots
+
+
+@pytest.fixture
+def test_db(monkeypatch):
+    """Create a test database with one resource; the concierge is built on it."""
+    db = Database('test_concierge_startup.db')
+    owner = UserDAL(db).create_user('Owner', 'owner@example.com', 'x', 'staff')
+    ResourceDAL(db).create_resource(owner_id=owner, title='Study Room A', description='Quiet',
+                                    category='Study Room', location='Library Building',
+                                    capacity=4, status='published')
+    monkeypatch.setattr(ai_concierge, 'Database', lambda: db)
+    monkeypatch.setattr(ai_concierge, '_concierge', None)
+    yield db
+    clear_catalogs()
+    clear_snapshots()
+    if os.path.exists('test_concierge_startup.db'):
+        os.remove('test_concierge_startup.db')
+
+
+def test_import_builds_nothing():
+    """Test importing the concierge blueprint leaves the concierge unbuilt."""
+    code = ("import src.controllers.concierge_controller\n"
+            "from src.utils import ai_concierge\n"
+            "print(ai_concierge._concierge is None)")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'True'
+
+
+def test_concurrent_first_use_builds_once(monkeypatch):
+    """Test racing callers all get the one concierge."""
+    built = []
+
+    class SlowConcierge:
+        def __init__(self):
+            built.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(ai_concierge, 'ResourceConcierge', SlowConcierge)
+    monkeypatch.setattr(ai_concierge, '_concierge', None)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(ai_concierge.get_concierge())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+    assert all(result is built[0] for result in results)
+    assert ai_concierge.concierge is built[0]
+
+
+def test_preload_warms_context_and_vocabulary(test_db, monkeypatch):
+    """Test after the preload the context and router vocabulary need no query."""
+    ai_concierge.preload_concierge().join(timeout=10)
+    concierge = ai_concierge.get_concierge()
+
+    queries = []
+    monkeypatch.setattr(test_db, 'execute_query', lambda *args, **kwargs: queries.append(args))
+    assert concierge.get_context_summary()['categories'] == ['Study Room']
+    concierge._refresh_vocabulary()
+    assert concierge.router.route('find a study room').entities == {'category': 'Study Room'}
+    assert queries == []
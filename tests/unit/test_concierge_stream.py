@@ -0,0 +1,81 @@
+"""
+Unit tests for streamed concierge answers.
+Tests that streamed pieces add up to the plain answer, that cached
+answers stream too, and the server-sent events endpoint.
+"""
+
+import pytest
+import json
+import os
+from flask import Flask
+from src.controllers import concierge_controller
+from src.controllers.auth_controller import auth_bp
+from src.controllers.concierge_controller import concierge_bp
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.utils import ai_concierge
+from src.utils.rate_limit import RateLimiter, set_rate_limiter
+from src.utils.snapshot import clear_snapshots
+
+
+@pytest.fixture
+def concierge(monkeypatch):
+    """Concierge on a test database with three study rooms."""
+    db = Database('test_concierge_stream.db')
+    owner = UserDAL(db).create_user('Owner', 'owner@example.com', 'x', 'staff')
+    for name in 'ABC':
+        ResourceDAL(db).create_resource(owner_id=owner, title=f'Study Room {name}', description='Quiet',
+                                        category='Study Room', location='Library Building',
+                                        capacity=4, status='published')
+    monkeypatch.setattr(ai_concierge, 'Database', lambda: db)
+    yield ai_concierge.ResourceConcierge()
+    clear_catalogs()
+    clear_snapshots()
+    if os.path.exists('test_concierge_stream.db'):
+        os.remove('test_concierge_stream.db')
+
+
+def test_stream_adds_up_to_the_answer(concierge):
+    """Test the stream yields a heading and one piece per result, then caches the whole."""
+    pieces = list(concierge.stream_natural_language_response('find a study room tomorrow'))
+    assert len(pieces) == 4
+    assert pieces[0].startswith('Resources in Study Room for ')
+    assert all(piece.endswith(' - free all day\n') for piece in pieces[1:])
+    assert concierge.generate_natural_language_response('find a study room tomorrow') == ''.join(pieces)
+    assert concierge.answer_cache.stats()['hits'] == 1
+
+
+def test_abandoned_stream_is_not_cached(concierge):
+    """Test a stream closed part way leaves no partial answer in the cache."""
+    stream = concierge.stream_natural_language_response('find a study room')
+    next(stream)
+    stream.close()
+    assert concierge.answer_cache.stats()['entries'] == 0
+
+
+def test_sse_endpoint(concierge, monkeypatch):
+    """Test /ask/stream sends the intent, the pieces in order, then done."""
+    monkeypatch.setattr(concierge_controller, 'get_concierge', lambda: concierge)
+    set_rate_limiter(RateLimiter(enabled=False))
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(concierge_bp)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+
+    response = client.post('/concierge/ask/stream', json={'query': 'find a study room'})
+    assert response.mimetype == 'text/event-stream'
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines.get('event', 'message'), json.loads(lines['data'])))
+    assert events[0] == ('intent', {'intent': 'search'})
+    assert events[-1] == ('done', {})
+    text = ''.join(data['text'] for event, data in events if event == 'message')
+    assert text == concierge.generate_natural_language_response('find a study room')
+    assert client.post('/concierge/ask/stream', json={'query': ' '}).status_code == 400
+    set_rate_limiter(None)
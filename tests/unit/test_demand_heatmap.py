@@ -0,0 +1,128 @@
+"""
+Unit tests for the hour-of-week demand heatmap.
+Tests binning, conflicted attempts, per-dimension sums and that refreshes
+only read rows added since the last one.
+"""
+
+import pytest
+import os
+import numpy as np
+from app import create_app
+from src.controllers import admin_controller, auth_controller
+from src.data_access.admin_dal import AdminDAL
+from src.data_access.database import Database
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.data_access.demand_heatmap import DemandHeatmap, week_minutes, clear_demand_heatmaps
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.vector_index import clear_vector_indexes
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with a lab and a study room."""
+    db = Database('test_demand_heatmap.db')
+    UserDAL(db).create_user('Student', 'student@example.com', 'x', 'student')
+    resources = ResourceDAL(db)
+    resources.create_resource(1, 'Lab', '', 'Labs', 'Science Hall', 20, status='published')
+    resources.create_resource(1, 'Room', '', 'Study Rooms', 'Library', 4, status='published')
+    yield db
+    clear_demand_heatmaps()
+    clear_catalogs()
+    clear_vector_indexes()
+    if os.path.exists('test_demand_heatmap.db'):
+        os.remove('test_demand_heatmap.db')
+
+
+def _julian(text):
+    """julianday() of a 'YYYY-MM-DD HH:MM' string, as SQLite computes it."""
+    moment = np.datetime64(text.replace(' ', 'T'))
+    return (moment - np.datetime64('2000-01-01T00:00')) / np.timedelta64(1, 'D') + 2451544.5
+
+
+def test_week_minutes_bins_and_wraps():
+    """Test requests split over hours and wrap from Sunday night to Monday."""
+    # 2030-03-05 is a Tuesday, 2030-03-10 a Sunday
+    grid = week_minutes(
+        np.array([0, 0]),
+        np.array([_julian('2030-03-05 14:30'), _julian('2030-03-10 23:00')]),
+        np.array([_julian('2030-03-05 16:00'), _julian('2030-03-11 01:00')]),
+        1
+    )
+    assert grid[0, 24 + 14] == 30 and grid[0, 24 + 15] == 60
+    assert grid[0, 6 * 24 + 23] == 60 and grid[0, 0] == 60
+    assert grid.sum() == 90 + 120
+
+
+def test_heatmap_counts_rejected_and_conflicting_requests(test_db):
+    """Test every request counts as demand, with conflicts reported separately."""
+    bookings = BookingDAL(test_db)
+    booking_id = bookings.create_booking(1, 1, '2030-03-05 14:00', '2030-03-05 16:00')
+    bookings.update_booking_status(booking_id, 'rejected')
+    bookings.create_booking(2, 1, '2030-03-06 09:00', '2030-03-06 10:00')
+    bookings.record_attempt(1, 1, '2030-03-12 14:00', '2030-03-12 15:00')
+
+    heatmap = DemandHeatmap(test_db)
+    labs = heatmap.get('category', 'Labs')
+    assert labs['demand'][1][14] == 2 and labs['demand'][1][15] == 1
+    assert labs['conflicts'][1][14] == 1
+    assert labs['peak'] == {'day': 'Tue', 'hour': 14, 'hours': 2}
+    assert labs['keys'] == ['Labs', 'Study Rooms']
+
+    assert heatmap.get('location', 'Library')['demand'][2][9] == 1
+    assert heatmap.get('resource', '2')['total_hours'] == 1
+    assert heatmap.get()['total_hours'] == 4
+    assert heatmap.get('category', 'Nothing')['peak'] is None
+
+
+def test_refresh_reads_only_new_rows(test_db):
+    """Test a refresh folds in new requests without re-reading history."""
+    bookings = BookingDAL(test_db)
+    for day in range(1, 6):
+        bookings.create_booking(1, 1, f'2030-03-0{day} 10:00', f'2030-03-0{day} 11:00')
+    heatmap = DemandHeatmap(test_db)
+    assert heatmap.get()['total_hours'] == 5
+    assert heatmap.rows_read == 5
+
+    heatmap.get()
+    assert heatmap.rows_read == 5
+
+    bookings.create_booking(1, 1, '2030-03-08 10:00', '2030-03-08 11:30')
+    assert heatmap.get()['total_hours'] == 6.5
+    assert heatmap.rows_read == 6
+
+
+def test_recategorized_resource_moves_between_categories(test_db):
+    """Test category heatmaps follow a resource's current category."""
+    BookingDAL(test_db).create_booking(2, 1, '2030-03-05 10:00', '2030-03-05 11:00')
+    heatmap = DemandHeatmap(test_db)
+    assert heatmap.get('category', 'Labs')['total_hours'] == 0
+
+    ResourceDAL(test_db).update_resource(2, category='Labs')
+    assert heatmap.get('category', 'Labs')['total_hours'] == 1
+
+
+def test_unknown_dimension_rejected(test_db):
+    """Test an unknown dimension raises ValueError."""
+    with pytest.raises(ValueError):
+        DemandHeatmap(test_db).get('department')
+
+
+def test_admin_dashboard_renders_the_heatmap(test_db, monkeypatch):
+    """Test the admin dashboard renders, with a pending booking, and holds the heatmap table."""
+    admin_id = UserDAL(test_db).create_user('Admin', 'admin@example.com', 'x', 'admin')
+    BookingDAL(test_db).create_booking(1, 1, '2030-03-05 14:00', '2030-03-05 16:00')
+    monkeypatch.setattr(admin_controller, 'admin_dal', AdminDAL(test_db))
+    monkeypatch.setattr(admin_controller, 'booking_dal', BookingDAL(test_db))
+    monkeypatch.setattr(auth_controller, 'auth_cache', UserDAL(test_db).auth_cache)
+    app = create_app()
+    app.config['TESTING'] = True
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session.update(user_id=admin_id, user_role='admin', auth_version=1)
+
+    response = client.get('/admin/')
+    assert response.status_code == 200
+    assert b'id="heatmap"' in response.data
+    assert b'/bookings/1' in response.data
@@ -0,0 +1,103 @@
+"""
+Unit tests for the event bus and the SSE stream.
+Tests routing, backpressure, heartbeats and DAL publishing.
+"""
+
+import pytest
+import os
+from src.data_access.database import Database
+from src.data_access.message_dal import MessageDAL
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.vector_index import clear_vector_indexes
+from src.data_access.user_dal import UserDAL
+from src.controllers.events_controller import event_stream
+from src.utils.event_bus import EventBus, event_bus
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_events.db')
+    yield db
+    clear_catalogs()
+    clear_vector_indexes()
+    if os.path.exists('test_events.db'):
+        os.remove('test_events.db')
+
+
+def test_publish_routes_to_concerned_users():
+    """Test events reach every connection of the target users and no one else."""
+    bus = EventBus()
+    first, second, other = bus.subscribe(1), bus.subscribe(1), bus.subscribe(2)
+
+    assert bus.publish([1], 'message', {'n': 1}) == 2
+    assert first.next_event(0)['data'] == {'n': 1}
+    assert second.next_event(0)['type'] == 'message'
+    assert other.next_event(0) is None
+
+    bus.unsubscribe(first)
+    bus.unsubscribe(second)
+    assert bus.connection_count() == 1
+
+
+def test_slow_client_overflows_and_resyncs():
+    """Test a full queue never blocks the publisher and ends the stream with a resync."""
+    bus = EventBus(maxsize=2)
+    subscription = bus.subscribe(1)
+
+    for n in range(5):
+        bus.publish([1], 'message', {'n': n})
+
+    assert subscription.overflowed
+    assert bus.overflows == 1
+    frames = list(event_stream(subscription, heartbeat=0))
+    assert frames[-1].startswith('event: resync')
+
+
+def test_stream_frames_and_heartbeat():
+    """Test the stream emits retry, event and heartbeat frames."""
+    bus = EventBus()
+    subscription = bus.subscribe(1)
+    stream = event_stream(subscription, heartbeat=0.01)
+
+    assert next(stream).startswith('retry:')
+    assert next(stream) == ': heartbeat\n\n'
+    bus.publish([1], 'booking_status', {'status': 'approved'})
+    frame = next(stream)
+    assert 'event: booking_status' in frame and '"approved"' in frame
+    stream.close()
+
+
+def test_dals_publish_messages_and_booking_changes(test_db):
+    """Test sending a message and changing a booking notify the right users."""
+    user_dal = UserDAL(test_db)
+    owner = user_dal.create_user('Owner', 'owner@example.com', 'x', 'staff')
+    student = user_dal.create_user('Student', 'student@example.com', 'x', 'student')
+    resource_id = ResourceDAL(test_db).create_resource(
+        owner_id=owner, title='Lab', description='', category='Lab',
+        location='A', capacity=2, status='published'
+    )
+    booking_dal = BookingDAL(test_db)
+    booking_id = booking_dal.create_booking(resource_id, student, '2030-01-01 10:00', '2030-01-01 11:00')
+    owner_stream, student_stream = event_bus.subscribe(owner), event_bus.subscribe(student)
+    try:
+        message_dal = MessageDAL(test_db)
+        thread_id = message_dal.get_or_create_thread_id(student, owner)
+        message_dal.create_message(thread_id, student, owner, 'Can I book it?')
+        booking_dal.update_booking_status(booking_id, 'approved')
+
+        owner_events = [owner_stream.next_event(0) for _ in range(2)]
+        student_events = [student_stream.next_event(0) for _ in range(2)]
+    finally:
+        event_bus.unsubscribe(owner_stream)
+        event_bus.unsubscribe(student_stream)
+
+    for events in (owner_events, student_events):
+        assert [e['type'] for e in events] == ['message', 'booking_status']
+        assert events[0]['data']['content'] == 'Can I book it?'
+        assert events[1]['data'] == {
+            'booking_id': booking_id, 'resource_id': resource_id,
+            'resource_title': 'Lab', 'status': 'approved'
+        }
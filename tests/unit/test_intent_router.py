@@ -0,0 +1,82 @@
+"""
+Unit tests for the intent router.
+Tests normalization, weighted scoring and ties, entity extraction and
+dispatch to handlers.
+"""
+
+import pytest
+from datetime import date
+from src.utils.intent_router import IntentRouter, normalize
+
+MONDAY = date(2026, 10, 19)
+
+
+@pytest.fixture
+def router():
+    """Router with two intents and a small vocabulary."""
+    router = IntentRouter(fallback=lambda route, **kwargs: 'help')
+    router.add_intent('best', {r'best': 2, r'top rated': 3}, lambda route, **kwargs: ('best', kwargs))
+    router.add_intent('search', {r'find': 2}, lambda route, **kwargs: ('search', route.entities),
+                      entity_weights={'category': 2})
+    router.set_vocabulary(['Study Room'], ['Library Building'])
+    return router
+
+
+def test_normalize():
+    """Test case, punctuation, compatibility forms and spacing are normalized."""
+    assert normalize("  What's   the BEST！room?? ") == "what's the best room"
+    assert normalize(None) == ''
+
+
+def test_scores_add_up_and_ties_go_to_first_intent(router):
+    """Test weights sum per intent and equal scores prefer registration order."""
+    assert router.route('find the top rated').intent == 'best'
+    assert router.route('find study rooms').intent == 'search'
+    assert router.route('best study room').intent == 'best'
+    assert router.route('bestest').intent is None  # whole words only
+
+
+def test_entities(router):
+    """Test category plurals, location words and relative and absolute dates."""
+    entities = router.route('find study rooms in the library on friday', MONDAY).entities
+    assert entities == {'category': 'Study Room', 'location': 'library', 'date': date(2026, 10, 23)}
+    assert router.route('tomorrow', MONDAY).entities['date'] == date(2026, 10, 20)
+    assert router.route('next monday', MONDAY).entities['date'] == date(2026, 10, 26)
+    assert router.route('on 3 jan', MONDAY).entities['date'] == date(2027, 1, 3)
+    assert 'date' not in router.route('on 2026-02-30', MONDAY).entities
+    assert router.route('lab on sept 3rd', MONDAY).entities['date'] == date(2027, 9, 3)
+    # Words that merely start like a month are not months
+    for query in ('room for 4 juniors', 'any lab with 2 decks', 'i need 3 markers'):
+        assert 'date' not in router.route(query, MONDAY).entities, query
+
+
+def test_dispatch_and_replacing_an_intent(router):
+    """Test handlers get the route's kwargs, the fallback catches the rest, and intents can be replaced."""
+    assert router.dispatch('best', user_id=7) == ('best', {'user_id': 7})
+    assert router.dispatch('hello') == 'help'
+    router.add_intent('best', {r'greatest': 1}, lambda route, **kwargs: 'replaced')
+    assert router.dispatch('greatest') == 'replaced'
+    assert router.route('best').intent is None
+    with pytest.raises(ValueError):
+        router.add_intent('bad', {r'(': 1}, None)
+
+
+
+def test_vocabulary_swap_is_one_assignment():
+    """Test a reader landing right after the vocabulary is stored sees its matching entity groups."""
+    seen = []
+
+    class ProbingRouter(IntentRouter):
+        """Extracts entities whenever the vocabulary attribute is stored, as a concurrent reader could."""
+        probing = False
+
+        def __setattr__(self, name, value):
+            super().__setattr__(name, value)
+            if self.probing and (name == '_vocabulary' or name == '_entity_groups'):
+                seen.append(self.extract_entities('a lab please'))
+
+    router = ProbingRouter()
+    router.set_vocabulary(['Lab'], [])
+    router.probing = True
+    router.set_vocabulary([f'Category {i}' for i in range(20)] + ['Lab'], [f'Hall {i}' for i in range(20)])
+    assert seen and all(entities == {'category': 'Lab'} for entities in seen)
@@ -0,0 +1,159 @@
+"""
+Unit tests for the Bayesian top-rated leaderboard.
+Tests ranking, per-category reads and incremental maintenance.
+"""
+
+import pytest
+import os
+import sys
+import threading
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access import leaderboard_dal
+from src.data_access.leaderboard_dal import LeaderboardDAL, bayesian_average, PRIOR_WEIGHT
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.review_dal import ReviewDAL
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_leaderboard.db')
+    yield db
+    clear_catalogs()
+    if os.path.exists('test_leaderboard.db'):
+        os.remove('test_leaderboard.db')
+
+
+@pytest.fixture
+def setup_data(test_db):
+    """Create one resource with a single 5-star review and one with many 4-5 star reviews."""
+    user_dal = UserDAL(test_db)
+    resource_dal = ResourceDAL(test_db)
+    review_dal = ReviewDAL(test_db)
+
+    owner_id = user_dal.create_user('Owner', 'owner@example.com', 'x', 'staff')
+    reviewers = [
+        user_dal.create_user(f'Reviewer {i}', f'r{i}@example.com', 'x', 'student')
+        for i in range(10)
+    ]
+
+    def make(title, category):
+        return resource_dal.create_resource(
+            owner_id=owner_id, title=title, description='', category=category,
+            location='Building A', capacity=5, status='published'
+        )
+
+    lucky = make('One Review Room', 'Study Room')
+    proven = make('Popular Lab', 'Lab')
+    weak = make('Weak Lab', 'Lab')
+
+    review_dal.create_review(lucky, reviewers[0], 5)
+    for i, reviewer in enumerate(reviewers):
+        review_dal.create_review(proven, reviewer, 4 if i % 5 == 0 else 5)
+    review_dal.create_review(weak, reviewers[1], 2)
+
+    return {
+        'db': test_db,
+        'resource_dal': resource_dal,
+        'review_dal': review_dal,
+        'lucky': lucky,
+        'proven': proven,
+        'weak': weak,
+        'reviewers': reviewers,
+    }
+
+
+def test_bayesian_ranking(setup_data):
+    """Test that many good reviews outrank a single perfect one."""
+    top = setup_data['resource_dal'].get_top_rated_resources(limit=10)
+
+    assert [r['resource_id'] for r in top] == [
+        setup_data['proven'], setup_data['lucky'], setup_data['weak']
+    ]
+    assert top[0]['review_count'] == 10
+    assert top[0]['avg_rating'] == pytest.approx(4.8)
+
+
+def test_top_rated_per_category(setup_data):
+    """Test the per-category top-K read."""
+    top = setup_data['resource_dal'].get_top_rated_resources(limit=5, category='Lab')
+
+    assert [r['resource_id'] for r in top] == [setup_data['proven'], setup_data['weak']]
+
+
+def test_incremental_matches_rebuild(setup_data):
+    """Test that incremental maintenance agrees with a full rebuild."""
+    resource_dal = setup_data['resource_dal']
+    review_dal = setup_data['review_dal']
+
+    review_id = review_dal.create_review(setup_data['weak'], setup_data['reviewers'][2], 1)
+    review_dal.update_review(review_id, 3, 'Better than I thought')
+    resource_dal.update_resource(setup_data['lucky'], status='archived')
+
+    incremental = [(r['resource_id'], round(r['bayes_score'], 6))
+                   for r in resource_dal.get_top_rated_resources(limit=10)]
+    LeaderboardDAL(setup_data['db']).rebuild()
+    rebuilt = [(r['resource_id'], round(r['bayes_score'], 6))
+               for r in resource_dal.get_top_rated_resources(limit=10)]
+
+    assert [rid for rid, _ in incremental] == [setup_data['proven'], setup_data['weak']]
+    assert incremental == rebuilt
+
+
+def test_bayesian_average_formula():
+    """Test the Bayesian average pulls small samples toward the prior."""
+    assert bayesian_average(5, 1, 3.0) == pytest.approx((PRIOR_WEIGHT * 3.0 + 5) / (PRIOR_WEIGHT + 1))
+    assert bayesian_average(0, 0, 3.5) == pytest.approx(3.5)
+
+
+def test_concurrent_refreshes_keep_global_totals(setup_data, monkeypatch):
+    """Test concurrent review writes each land in the global totals."""
+    # No drift rebuilds, which would recount the totals and hide a lost delta
+    monkeypatch.setattr(leaderboard_dal, 'PRIOR_DRIFT', float('inf'))
+    db = setup_data['db']
+    user_dal = UserDAL(db)
+    review_dal = setup_data['review_dal']
+    resources = [setup_data['lucky'], setup_data['proven'], setup_data['weak']]
+    reviewers = [user_dal.create_user(f'Extra {i}', f'extra{i}@example.com', 'x', 'student')
+                 for i in range(24)]
+
+    def review(reviewer):
+        for i, resource_id in enumerate(resources):
+            review_dal.create_review(resource_id, reviewer, 1 + (reviewer + i) % 5)
+
+    # Switch threads often so refreshes interleave between reading and writing the totals
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=review, args=(reviewer,)) for reviewer in reviewers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    meta = db.execute_query("SELECT total_sum, total_count FROM leaderboard_meta WHERE id = 1", fetch_one=True)
+    actual = db.execute_query("SELECT SUM(rating) AS total_sum, COUNT(*) AS total_count FROM reviews",
+                              fetch_one=True)
+    assert (meta['total_sum'], meta['total_count']) == (actual['total_sum'], actual['total_count'])
+
+
+def test_catalog_ranks_with_the_leaderboard_prior(setup_data):
+    """Test the catalog ranks like the leaderboard when unpublished reviews raise the mean."""
+    resource_dal = setup_data['resource_dal']
+    review_dal = setup_data['review_dal']
+    hidden = resource_dal.create_resource(
+        owner_id=1, title='Hidden Room', description='', category='Lab',
+        location='Building B', capacity=5, status='published'
+    )
+    for reviewer in setup_data['reviewers']:
+        review_dal.create_review(hidden, reviewer, 5)
+    resource_dal.update_resource(hidden, status='archived')
+
+    leaderboard = [r['resource_id'] for r in resource_dal.get_top_rated_resources(limit=10)]
+    catalog = [r['resource_id'] for r in resource_dal.catalog.top_rated(limit=10)]
+    assert leaderboard[0] == setup_data['lucky']
+    assert catalog == leaderboard
@@ -0,0 +1,187 @@
+"""
+Unit tests for message threads.
+Tests thread ids, the inbox query, unread counts and the legacy backfill.
+"""
+
+import pytest
+import os
+import sys
+import threading
+from src.data_access.database import Database
+from src.data_access.message_dal import MessageDAL
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_messages.db')
+    yield db
+    if os.path.exists('test_messages.db'):
+        os.remove('test_messages.db')
+
+
+@pytest.fixture
+def setup_data(test_db):
+    """Create three users."""
+    user_dal = UserDAL(test_db)
+    users = [user_dal.create_user(f'User {i}', f'u{i}@example.com', 'x', 'student') for i in range(3)]
+    return {'users': users, 'message_dal': MessageDAL(test_db)}
+
+
+def test_thread_id_is_stable_per_pair(setup_data):
+    """Test both directions of a pair share one thread and other pairs do not."""
+    message_dal = setup_data['message_dal']
+    alice, bob, carol = setup_data['users']
+
+    thread_id = message_dal.get_or_create_thread_id(alice, bob)
+
+    assert message_dal.get_or_create_thread_id(bob, alice) == thread_id
+    assert message_dal.get_or_create_thread_id(alice, carol) != thread_id
+
+
+def test_inbox_order_last_message_and_unread(setup_data):
+    """Test the inbox shows the latest message per thread and per-participant unread counts."""
+    message_dal = setup_data['message_dal']
+    alice, bob, carol = setup_data['users']
+
+    with_bob = message_dal.get_or_create_thread_id(alice, bob)
+    with_carol = message_dal.get_or_create_thread_id(alice, carol)
+    message_dal.create_message(with_bob, alice, bob, 'Hi Bob')
+    message_dal.create_message(with_bob, bob, alice, 'Hi Alice')
+    message_dal.create_message(with_bob, bob, alice, 'Are you free?')
+    message_dal.create_message(with_carol, carol, alice, 'Room booked')
+
+    inbox = message_dal.get_user_threads(alice)
+    by_thread = {thread['thread_id']: thread for thread in inbox}
+
+    assert [t['thread_id'] for t in inbox] == sorted(by_thread, key=lambda t: by_thread[t]['last_timestamp'], reverse=True)
+    assert by_thread[with_bob]['last_message'] == 'Are you free?'
+    assert by_thread[with_bob]['other_user_name'] == 'User 1'
+    assert by_thread[with_bob]['unread_count'] == 2
+    assert by_thread[with_carol]['unread_count'] == 1
+    assert message_dal.get_user_threads(bob)[0]['unread_count'] == 0
+
+    assert message_dal.mark_thread_read(with_bob, alice) == 2
+    assert message_dal.mark_thread_read(with_bob, alice) == 0
+    inbox = {t['thread_id']: t for t in message_dal.get_user_threads(alice)}
+    assert inbox[with_bob]['unread_count'] == 0
+
+
+def test_delete_last_message_moves_pointer(setup_data):
+    """Test deleting the newest message keeps the thread in the inbox with the previous one."""
+    message_dal = setup_data['message_dal']
+    alice, bob, _ = setup_data['users']
+
+    thread_id = message_dal.get_or_create_thread_id(alice, bob)
+    message_dal.create_message(thread_id, alice, bob, 'First')
+    last_id = message_dal.create_message(thread_id, alice, bob, 'Second')
+    message_dal.delete_message(last_id)
+
+    assert message_dal.get_user_threads(bob)[0]['last_message'] == 'First'
+
+
+def test_backfill_keeps_legacy_thread_ids(test_db, setup_data):
+    """Test the migration builds threads for messages written before the threads table."""
+    alice, bob, _ = setup_data['users']
+    legacy_id = min(alice, bob) * 100000 + max(alice, bob)
+    with test_db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO messages (thread_id, sender_id, receiver_id, content) VALUES (?, ?, ?, ?)",
+            [(legacy_id, alice, bob, 'Old hello'), (legacy_id, bob, alice, 'Old reply')]
+        )
+        conn.execute("DELETE FROM schema_migrations")
+
+    Database('test_messages.db')
+    message_dal = setup_data['message_dal']
+
+    assert message_dal.get_or_create_thread_id(bob, alice) == legacy_id
+    inbox = message_dal.get_user_threads(alice)
+    assert [(t['thread_id'], t['last_message'], t['unread_count']) for t in inbox] == [
+        (legacy_id, 'Old reply', 0)
+    ]
+
+
+def test_unread_counters_follow_sends_and_reads(setup_data):
+    """Test per-user unread totals and their version change incrementally."""
+    message_dal = setup_data['message_dal']
+    alice, bob, carol = setup_data['users']
+
+    with_bob = message_dal.get_or_create_thread_id(alice, bob)
+    with_carol = message_dal.get_or_create_thread_id(alice, carol)
+    message_dal.create_message(with_bob, bob, alice, 'One')
+    message_dal.create_message(with_bob, bob, alice, 'Two')
+    unread_id = message_dal.create_message(with_carol, carol, alice, 'Three')
+
+    counts = message_dal.get_unread_counts(alice)
+    assert (counts['unread_messages'], counts['unread_threads']) == (3, 2)
+    assert message_dal.get_unread_counts(bob)['unread_messages'] == 0
+
+    version = counts['version']
+    message_dal.mark_thread_read(with_bob, alice)
+    counts = message_dal.get_unread_counts(alice)
+    assert (counts['unread_messages'], counts['unread_threads']) == (1, 1)
+    assert counts['version'] > version
+
+    message_dal.delete_message(unread_id)
+    counts = message_dal.get_unread_counts(alice)
+    assert (counts['unread_messages'], counts['unread_threads']) == (0, 0)
+
+
+def test_thread_pages_and_participant_lookup(setup_data):
+    """Test cursor pages walk a thread newest first and participants resolve without history."""
+    message_dal = setup_data['message_dal']
+    alice, bob, carol = setup_data['users']
+
+    thread_id = message_dal.get_or_create_thread_id(alice, bob)
+    sent = [message_dal.create_message(thread_id, alice, bob, f'Message {n}') for n in range(7)]
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = message_dal.get_thread_page(thread_id, before_id=cursor, limit=3)
+        pages.append([m['message_id'] for m in page])
+        if cursor is None:
+            break
+
+    assert pages == [sent[6:3:-1], sent[3:0:-1], sent[0:1]]
+    assert message_dal.get_other_participant(thread_id, alice) == bob
+    assert message_dal.get_other_participant(thread_id, bob) == alice
+    assert message_dal.get_other_participant(thread_id, carol) is None
+
+
+def test_concurrent_reads_and_sends_keep_counters_consistent(setup_data):
+    """Test two tabs marking a thread read while messages arrive leave totals matching the threads."""
+    message_dal = setup_data['message_dal']
+    alice, bob, carol = setup_data['users']
+    with_bob = message_dal.get_or_create_thread_id(alice, bob)
+    with_carol = message_dal.get_or_create_thread_id(alice, carol)
+
+    def send(sender, thread_id):
+        for i in range(30):
+            message_dal.create_message(thread_id, sender, alice, f'Message {i}')
+
+    def read():
+        for _ in range(30):
+            message_dal.mark_thread_read(with_bob, alice)
+            message_dal.mark_thread_read(with_carol, alice)
+
+    # Switch threads often so reads land between other transactions' statements
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=send, args=(bob, with_bob)),
+                   threading.Thread(target=send, args=(carol, with_carol)),
+                   threading.Thread(target=read), threading.Thread(target=read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    expected = message_dal.db.execute_query("""
+        SELECT SUM(unread_count) AS messages, SUM(unread_count > 0) AS threads
+        FROM thread_participants WHERE user_id = ?
+    """, (alice,), fetch_one=True)
+    counts = message_dal.get_unread_counts(alice)
+    assert (counts['unread_messages'], counts['unread_threads']) == (expected['messages'], expected['threads'])
@@ -0,0 +1,67 @@
+"""
+Unit tests for password hashing.
+Tests the cost factor, rehash detection, and the bounded hashing pool.
+"""
+
+import pytest
+import threading
+from src.utils.auth import hash_password, verify_password, needs_rehash
+from src.utils.hash_pool import HashPool, HashPoolBusy
+
+
+def test_hash_uses_requested_cost():
+    """Test hashes carry their cost and verify regardless of it."""
+    hashed = hash_password('TestPass123', rounds=5)
+    assert hashed.startswith('$2b$05$')
+    assert verify_password('TestPass123', hashed)
+    assert not verify_password('WrongPass123', hashed)
+
+
+def test_needs_rehash_when_cost_differs():
+    """Test only hashes at another cost (or unparseable ones) need a rehash."""
+    hashed = hash_password('TestPass123', rounds=5)
+    assert not needs_rehash(hashed, rounds=5)
+    assert needs_rehash(hashed, rounds=6)
+    assert needs_rehash('not-a-bcrypt-hash', rounds=5)
+
+
+def test_full_pool_rejects_fast():
+    """Test calls beyond workers + max_pending raise HashPoolBusy instead of queueing."""
+    pool = HashPool(workers=1, max_pending=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.run(slow))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    while pool.stats()['queue_depth'] < 1:
+        pass
+
+    with pytest.raises(HashPoolBusy):
+        pool.run(slow)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    stats = pool.stats()
+    assert results == ['done', 'done']
+    assert stats['rejected'] == 1
+    assert stats['max_depth'] == 1
+    assert stats['queue_depth'] == 0
+    assert stats['completed'] == 2
+    pool.shutdown()
+
+
+def test_inline_pool_checks_on_caller_thread():
+    """Test workers=0 runs bcrypt inline and still counts calls."""
+    pool = HashPool(workers=0)
+    hashed = hash_password('TestPass123', rounds=4).encode()
+    assert pool.checkpw(b'TestPass123', hashed)
+    assert pool.stats()['completed'] == 1
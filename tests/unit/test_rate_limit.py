@@ -0,0 +1,170 @@
+"""
+Unit tests for rate limiting.
+Tests token-bucket refill, the LRU bound, the shared SQLite store, the
+view decorator, failed-login limits and trusted proxies.
+"""
+
+import pytest
+import os
+from flask import Flask, jsonify, request
+from app import create_app
+from src.utils import rate_limit
+from src.utils.rate_limit import (MemoryStore, RateLimiter, Rule, SQLiteStore, form_email, rate_limited,
+                                  record_failure, remember_device, set_rate_limiter)
+
+
+@pytest.fixture
+def sqlite_path():
+    """Path of a throwaway SQLite store."""
+    yield 'test_rate_limit.db'
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists('test_rate_limit.db' + suffix):
+            os.remove('test_rate_limit.db' + suffix)
+
+
+def test_bucket_allows_burst_then_refills():
+    """Test capacity requests pass, the next waits, and tokens come back over time."""
+    store = MemoryStore()
+    rate = 2 / 10  # 2 requests per 10 s
+    assert store.take('k', 2, rate, 100.0) == (True, 0.0)
+    assert store.take('k', 2, rate, 100.0) == (True, 0.0)
+    allowed, retry_after = store.take('k', 2, rate, 101.0)
+    assert not allowed and retry_after == pytest.approx(4.0)
+    assert store.take('k', 2, rate, 105.0)[0]
+
+
+def test_memory_store_is_lru_bounded():
+    """Test the store drops its least recently used bucket past max_keys."""
+    store = MemoryStore(max_keys=2)
+    store.take('a', 1, 1.0, 0.0)
+    store.take('b', 1, 1.0, 0.0)
+    store.take('a', 1, 1.0, 0.0)  # rejected, but marks 'a' recently used
+    store.take('c', 1, 1.0, 0.0)
+    assert len(store) == 2
+    assert not store.take('a', 1, 1.0, 0.0)[0]
+    assert store.take('b', 1, 1.0, 0.0)[0]  # evicted, so full again
+
+
+def test_sqlite_store_is_shared_and_rejections_do_not_write(sqlite_path):
+    """Test two stores on one file share buckets and a rejection leaves the file untouched."""
+    first, second = SQLiteStore(sqlite_path), SQLiteStore(sqlite_path)
+    assert first.take('k', 2, 0.001, 100.0)[0]
+    assert second.take('k', 2, 0.001, 100.0)[0]
+    conn = second._connection()
+    changes = conn.total_changes
+    assert not first.take('k', 2, 0.001, 100.0)[0]
+    assert not second.take('k', 2, 0.001, 100.0)[0]
+    assert conn.total_changes == changes
+
+
+def test_limiter_takes_tokens_only_when_every_bucket_allows():
+    """Test rules apply per ip, per account and per route, and a rejection takes no tokens."""
+    limiter = RateLimiter()
+    rules = [Rule('ip', 'ip', 3, 60), Rule('account', 'account', 1, 60)]
+    assert limiter.check('login', rules, '10.0.0.1', 'a@x.edu')[0]
+    assert limiter.check('login', rules, '10.0.0.1', 'a@x.edu')[2] == 'account'
+    assert limiter.check('login', rules, '10.0.0.1', 'b@x.edu')[0]
+    # The rejected request above left the ip bucket its third token
+    assert limiter.check('login', rules, '10.0.0.1', 'c@x.edu')[0]
+    assert limiter.check('login', rules, '10.0.0.1', 'd@x.edu')[2] == 'ip'
+    assert limiter.check('login', rules, '10.0.0.2', 'd@x.edu')[0]
+    assert limiter.rejected == {'account': 1, 'ip': 1}
+
+
+def test_sqlite_store_takes_all_or_nothing(sqlite_path):
+    """Test a SQLite rejection by a later bucket leaves the earlier ones untouched."""
+    store = SQLiteStore(sqlite_path)
+    assert store.take('empty', 1, 0.001, 100.0)[0]
+    allowed, _, index = store.take_all([('full', 2, 0.001), ('empty', 1, 0.001)], 100.0)
+    assert not allowed and index == 1
+    # Both of full's tokens are still there
+    assert store.take('full', 2, 0.001, 100.0)[0]
+    assert store.take('full', 2, 0.001, 100.0)[0]
+
+
+def test_decorator_rejects_before_the_view(monkeypatch):
+    """Test rejected requests never reach the view and get Retry-After."""
+    monkeypatch.setitem(rate_limit.LIMITS, 'test', [Rule('ip', 'ip', 1, 60)])
+    set_rate_limiter(RateLimiter())
+    calls = []
+    app = Flask(__name__)
+    app.secret_key = 'test'
+
+    @app.route('/form', methods=['GET', 'POST'])
+    @rate_limited('test')
+    def form():
+        calls.append(1)
+        return jsonify({'success': True})
+
+    client = app.test_client()
+    assert client.post('/form').status_code == 200
+    form_response = client.post('/form')
+    json_response = client.post('/form', json={'query': 'x'})
+    assert form_response.status_code == 302 and form_response.headers['Retry-After'] == '60'
+    assert json_response.status_code == 429
+    assert client.get('/form').status_code == 200  # GET is not limited
+    assert len(calls) == 2
+    set_rate_limiter(None)
+
+
+def test_failed_logins_elsewhere_do_not_lock_the_account_out():
+    """Test another IP exhausting its attempts on an email leaves the owner able to log in."""
+    set_rate_limiter(RateLimiter())
+    app = Flask(__name__)
+    app.secret_key = 'test'
+
+    @app.route('/login', methods=['POST'])
+    @rate_limited('login', account=form_email)
+    def login():
+        return jsonify({'success': True})
+
+    client = app.test_client()
+    attacker = {'REMOTE_ADDR': '203.0.113.9'}
+    statuses = [client.post('/login', data={'email': 'victim@x.edu', 'password': 'guess'},
+                            environ_base=attacker).status_code for _ in range(11)]
+    assert statuses[:10] == [200] * 10 and statuses[10] == 302
+    victim = client.post('/login', data={'email': 'Victim@x.edu', 'password': 'right'},
+                         environ_base={'REMOTE_ADDR': '10.0.0.1'})
+    assert victim.status_code == 200
+    set_rate_limiter(None)
+
+
+def test_failed_logins_across_addresses_run_dry_except_on_known_devices():
+    """Test the per-account bucket counts only failures, from any address, and skips known devices."""
+    set_rate_limiter(RateLimiter())
+    app = Flask(__name__)
+    app.secret_key = 'test'
+
+    @app.route('/login', methods=['POST'])
+    @rate_limited('login', account=form_email)
+    def login():
+        if request.form['password'] != 'right':
+            record_failure('login', form_email())
+            return jsonify({'success': False})
+        return remember_device(jsonify({'success': True}), form_email())
+
+    victim, attacker, stranger = app.test_client(), app.test_client(), app.test_client()
+    for _ in range(3):  # Successful logins use none of the account's failure budget
+        assert victim.post('/login', data={'email': 'victim@x.edu', 'password': 'right'}).status_code == 200
+    statuses = [attacker.post('/login', data={'email': 'victim@x.edu', 'password': 'guess'},
+                              environ_base={'REMOTE_ADDR': f'203.0.113.{i}'}).status_code for i in range(51)]
+    assert statuses[:50] == [200] * 50 and statuses[50] == 302
+
+    # A browser without the known-device cookie is held back, the owner's is not
+    assert stranger.post('/login', data={'email': 'victim@x.edu', 'password': 'right'},
+                         environ_base={'REMOTE_ADDR': '198.51.100.7'}).status_code == 302
+    assert victim.post('/login', data={'email': 'victim@x.edu', 'password': 'right'},
+                       environ_base={'REMOTE_ADDR': '198.51.100.8'}).status_code == 200
+    set_rate_limiter(None)
+
+
+def test_trusted_proxies_give_each_client_its_address(monkeypatch):
+    """Test TRUSTED_PROXIES makes rate limits see the forwarded client address, not the proxy's."""
+    for name in ('RECOMMENDATION_INTERVAL', 'RETENTION_INTERVAL', 'CONCIERGE_PRELOAD'):
+        monkeypatch.setenv(name, '0')
+    forwarded = {'REMOTE_ADDR': '10.0.0.1', 'HTTP_X_FORWARDED_FOR': '198.51.100.7'}
+    for trusted, expected in (('0', '10.0.0.1'), ('1', '198.51.100.7')):
+        monkeypatch.setenv('TRUSTED_PROXIES', trusted)
+        app = create_app()
+        app.add_url_rule('/address', 'address', lambda: request.remote_addr)
+        assert app.test_client().get('/address', environ_base=forwarded).get_data(as_text=True) == expected
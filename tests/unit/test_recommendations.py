@@ -0,0 +1,125 @@
+"""
+Unit tests for collaborative-filtering recommendations.
+Tests item-item ranking, exclusions and stored per-user lists.
+"""
+
+import pytest
+import os
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.vector_index import clear_vector_indexes
+from src.data_access.recommendation_dal import RecommendationDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.review_dal import ReviewDAL
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_recommendations.db')
+    yield db
+    clear_catalogs()
+    clear_vector_indexes()
+    if os.path.exists('test_recommendations.db'):
+        os.remove('test_recommendations.db')
+
+
+@pytest.fixture
+def setup_data(test_db):
+    """Create users whose booking histories overlap."""
+    user_dal = UserDAL(test_db)
+    resource_dal = ResourceDAL(test_db)
+    booking_dal = BookingDAL(test_db)
+
+    owner_id = user_dal.create_user('Owner', 'owner@example.com', 'x', 'staff')
+    users = [user_dal.create_user(f'User {i}', f'u{i}@example.com', 'x', 'student') for i in range(4)]
+    resources = {
+        title: resource_dal.create_resource(
+            owner_id=owner_id, title=title, description='', category=category,
+            location='Building A', capacity=4, status='published'
+        )
+        for title, category in [
+            ('Physics Lab', 'Lab'), ('Optics Lab', 'Lab'), ('Laser Bench', 'Equipment'),
+            ('Piano Room', 'Studio'), ('Drum Room', 'Studio'),
+        ]
+    }
+
+    def book(user_id, title, status='approved'):
+        booking_id = booking_dal.create_booking(
+            resources[title], user_id, '2030-01-01 10:00:00', '2030-01-01 11:00:00'
+        )
+        booking_dal.update_booking_status(booking_id, status)
+
+    # Two physics users, two music users; user 3 has only booked the physics lab
+    for user_id in users[:2]:
+        book(user_id, 'Physics Lab')
+        book(user_id, 'Optics Lab')
+        book(user_id, 'Laser Bench')
+    book(users[2], 'Piano Room')
+    book(users[2], 'Drum Room')
+    book(users[3], 'Physics Lab')
+    book(users[3], 'Piano Room', status='rejected')
+
+    return {
+        'users': users, 'resources': resources, 'resource_dal': resource_dal,
+        'recommendation_dal': RecommendationDAL(test_db), 'review_dal': ReviewDAL(test_db)
+    }
+
+
+def test_recommends_co_booked_resources(setup_data):
+    """Test a user is recommended what similar users booked, not what they already have."""
+    recommendation_dal = setup_data['recommendation_dal']
+    resources = setup_data['resources']
+    user_id = setup_data['users'][3]
+
+    stats = recommendation_dal.recompute()
+    recommended = [r['resource_id'] for r in recommendation_dal.get_recommendations(user_id)]
+
+    assert stats['users'] == 4
+    assert set(recommended) == {resources['Optics Lab'], resources['Laser Bench']}
+    assert resources['Physics Lab'] not in recommended
+    # Rejected bookings are not interactions
+    assert resources['Drum Room'] not in recommended
+
+
+def test_category_filter_and_unpublished_resources(setup_data):
+    """Test reads honour the category filter and skip resources unpublished since recompute."""
+    recommendation_dal = setup_data['recommendation_dal']
+    resources = setup_data['resources']
+    user_id = setup_data['users'][3]
+
+    recommendation_dal.recompute()
+    labs = recommendation_dal.get_recommendations(user_id, category='Lab')
+    setup_data['resource_dal'].update_resource(resources['Laser Bench'], status='archived')
+    remaining = recommendation_dal.get_recommendations(user_id)
+
+    assert [r['resource_id'] for r in labs] == [resources['Optics Lab']]
+    assert [r['resource_id'] for r in remaining] == [resources['Optics Lab']]
+
+
+def test_poor_review_cancels_interaction(setup_data):
+    """Test a 1-star review offsets a booking of the same resource."""
+    recommendation_dal = setup_data['recommendation_dal']
+    resources = setup_data['resources']
+    music_user, new_user = setup_data['users'][2], setup_data['users'][3]
+
+    setup_data['review_dal'].create_review(resources['Piano Room'], music_user, 1)
+    recommendation_dal.recompute()
+
+    assert recommendation_dal.get_recommendations(music_user) == []
+    assert recommendation_dal.get_recommendations(new_user)
+
+
+def test_poorly_rated_resource_is_not_recommended_back(setup_data):
+    """Test a 1-star review marks a resource as seen although its weight clips to zero."""
+    recommendation_dal = setup_data['recommendation_dal']
+    resources = setup_data['resources']
+    user_id = setup_data['users'][3]
+
+    setup_data['review_dal'].create_review(resources['Optics Lab'], user_id, 1)
+    recommendation_dal.recompute()
+    recommended = [r['resource_id'] for r in recommendation_dal.get_recommendations(user_id)]
+
+    assert recommended == [resources['Laser Bench']]
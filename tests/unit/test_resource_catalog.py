@@ -0,0 +1,159 @@
+"""
+Unit tests for the in-memory resource catalog.
+Tests filtering, sorting, pagination, facets, typeahead and incremental refresh.
+"""
+
+import pytest
+import os
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs, SORT_RATING, SORT_TITLE
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.review_dal import ReviewDAL
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_catalog.db')
+    yield db
+    clear_catalogs()
+    if os.path.exists('test_catalog.db'):
+        os.remove('test_catalog.db')
+
+
+@pytest.fixture
+def setup_data(test_db):
+    """Set up a few published and draft resources."""
+    user_dal = UserDAL(test_db)
+    resource_dal = ResourceDAL(test_db)
+    review_dal = ReviewDAL(test_db)
+
+    owner_id = user_dal.create_user('Owner', 'owner@example.com', 'x', 'staff')
+    reviewer_id = user_dal.create_user('Reviewer', 'reviewer@example.com', 'x', 'student')
+
+    ids = {}
+    for title, category, location in [
+        ('Quiet Study Room', 'Study Room', 'Library, Floor 2'),
+        ('Chemistry Lab', 'Lab', 'Science Building'),
+        ('Physics Lab', 'Lab', 'Science Building'),
+    ]:
+        ids[title] = resource_dal.create_resource(
+            owner_id=owner_id, title=title, description=f'{title} description',
+            category=category, location=location, capacity=10, status='published'
+        )
+    ids['Draft Room'] = resource_dal.create_resource(
+        owner_id=owner_id, title='Draft Room', description='Not visible',
+        category='Study Room', location='Library', capacity=4, status='draft'
+    )
+
+    review_dal.create_review(ids['Physics Lab'], reviewer_id, 5)
+
+    return {
+        'ids': ids,
+        'owner_id': owner_id,
+        'reviewer_id': reviewer_id,
+        'resource_dal': resource_dal,
+        'review_dal': review_dal,
+    }
+
+
+def test_catalog_matches_published_resources(setup_data):
+    """Test the catalog holds only published resources."""
+    catalog = setup_data['resource_dal'].catalog
+
+    resources, total = catalog.search()
+
+    assert total == 3
+    assert {r['title'] for r in resources} == {'Quiet Study Room', 'Chemistry Lab', 'Physics Lab'}
+    assert sorted(catalog.get_categories()) == ['Lab', 'Study Room']
+
+
+def test_catalog_filters(setup_data):
+    """Test category, location and keyword filters."""
+    catalog = setup_data['resource_dal'].catalog
+
+    _, total = catalog.search(category='Lab')
+    assert total == 2
+
+    resources, total = catalog.search(location='library')
+    assert total == 1
+    assert resources[0]['title'] == 'Quiet Study Room'
+
+    resources, total = catalog.search(keyword='chemistry', category='Lab')
+    assert total == 1
+    assert resources[0]['title'] == 'Chemistry Lab'
+
+
+def test_catalog_sort_and_pagination(setup_data):
+    """Test sorting and page slicing."""
+    catalog = setup_data['resource_dal'].catalog
+
+    resources, _ = catalog.search(sort=SORT_RATING)
+    assert resources[0]['title'] == 'Physics Lab'
+    assert resources[0]['avg_rating'] == 5
+    assert resources[0]['review_count'] == 1
+
+    page1, total = catalog.search(sort=SORT_TITLE, page=1, per_page=2)
+    page2, _ = catalog.search(sort=SORT_TITLE, page=2, per_page=2)
+    assert total == 3
+    assert [r['title'] for r in page1 + page2] == ['Chemistry Lab', 'Physics Lab', 'Quiet Study Room']
+
+
+def test_catalog_incremental_refresh(setup_data):
+    """Test that DAL writes keep a loaded catalog current."""
+    resource_dal = setup_data['resource_dal']
+    review_dal = setup_data['review_dal']
+    ids = setup_data['ids']
+    catalog = resource_dal.catalog
+    catalog.ensure_loaded()
+
+    resource_dal.update_resource(ids['Draft Room'], status='published')
+    resource_dal.update_resource(ids['Chemistry Lab'], category='Teaching Lab')
+    resource_dal.delete_resource(ids['Quiet Study Room'])
+    review_dal.create_review(ids['Chemistry Lab'], setup_data['reviewer_id'], 3)
+
+    resources, total = catalog.search(sort=SORT_TITLE)
+    assert total == 3
+    assert [r['title'] for r in resources] == ['Chemistry Lab', 'Draft Room', 'Physics Lab']
+    assert resources[0]['category'] == 'Teaching Lab'
+    assert resources[0]['review_count'] == 1
+    assert catalog.search(category='Lab')[1] == 1
+    assert [r['title'] for r in catalog.top_rated(limit=5)] == ['Physics Lab', 'Chemistry Lab']
+
+
+def test_catalog_facet_counts(setup_data):
+    """Test facet counts are computed over the whole match set."""
+    catalog = setup_data['resource_dal'].catalog
+
+    result = catalog.faceted_search(per_page=1)
+    assert len(result['resources']) == 1
+    assert result['total'] == 3
+    assert result['facets']['category'] == [('Lab', 2), ('Study Room', 1)]
+    assert result['facets']['location'] == [('Science Building', 2), ('Library, Floor 2', 1)]
+    assert result['facets']['capacity'] == [('5-10', 3)]
+
+    result = catalog.faceted_search(category='Lab', capacity='5-10')
+    assert result['total'] == 2
+    assert result['facets']['category'] == [('Lab', 2)]
+    assert catalog.faceted_search(capacity='51+')['total'] == 0
+
+
+def test_catalog_suggestions(setup_data):
+    """Test typeahead suggestions follow resource changes."""
+    resource_dal = setup_data['resource_dal']
+    ids = setup_data['ids']
+    catalog = resource_dal.catalog
+
+    suggestions = catalog.suggest('lab')
+    assert {'type': 'title', 'value': 'Chemistry Lab', 'resource_id': ids['Chemistry Lab']} in suggestions
+    assert {'type': 'category', 'value': 'Lab'} in suggestions
+    assert catalog.suggest('sci') == [{'type': 'location', 'value': 'Science Building'}]
+    assert catalog.suggest('draft') == []
+
+    resource_dal.update_resource(ids['Chemistry Lab'], title='Organic Chemistry Lab')
+    resource_dal.delete_resource(ids['Physics Lab'])
+
+    assert [s['value'] for s in catalog.suggest('chem')] == ['Organic Chemistry Lab']
+    assert catalog.suggest('physics') == []
+    assert catalog.suggest('sci') == [{'type': 'location', 'value': 'Science Building'}]
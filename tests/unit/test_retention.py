@@ -0,0 +1,136 @@
+"""
+Unit tests for retention of admin logs and messages.
+Tests moving rows to the archive database, the rows messages keep, the
+monthly rollups and incremental vacuum.
+"""
+
+import pytest
+import os
+import sqlite3
+from app import create_app
+from src.controllers import message_controller
+from src.data_access.database import Database
+from src.data_access.message_dal import MessageDAL
+from src.data_access.retention_dal import RetentionDAL
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with two users."""
+    db = Database('test_retention.db')
+    user_dal = UserDAL(db)
+    user_dal.create_user('Admin', 'admin@example.com', 'x', 'admin')
+    user_dal.create_user('Student', 'student@example.com', 'x', 'student')
+    yield db
+    for path in ('test_retention.db', 'test_retention_archive.db'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def add_logs(db, timestamps):
+    """Insert one admin log per timestamp."""
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO admin_logs (admin_id, action, target_table, timestamp) VALUES (1, 'Action', 'users', ?)",
+            [(timestamp,) for timestamp in timestamps]
+        )
+
+
+def archived(table, key):
+    """Ids of a table in the archive file."""
+    with sqlite3.connect('test_retention_archive.db') as conn:
+        return [row[0] for row in conn.execute(f"SELECT {key} FROM {table} ORDER BY {key}")]
+
+
+def test_old_admin_logs_move_in_chunks(test_db):
+    """Test expired logs move to the archive across several chunks and recent ones stay."""
+    add_logs(test_db, ['2020-01-05 10:00:00'] * 3 + ['2020-02-01 09:00:00'] * 2 + ['2999-01-01 00:00:00'])
+    moved = RetentionDAL(test_db, chunk_size=2).archive_table('admin_logs', 30)
+
+    assert moved == 5
+    assert archived('admin_logs', 'log_id') == [1, 2, 3, 4, 5]
+    remaining = test_db.execute_query("SELECT log_id FROM admin_logs", fetch_all=True)
+    assert [row['log_id'] for row in remaining] == [6]
+    rollup = test_db.execute_query(
+        "SELECT month, action_count FROM admin_log_monthly ORDER BY month", fetch_all=True
+    )
+    assert [tuple(row) for row in rollup] == [('2020-01', 3), ('2020-02', 2)]
+
+
+def test_messages_keep_last_and_unread(test_db):
+    """Test a thread keeps its last message and unread messages however old."""
+    message_dal = MessageDAL(test_db)
+    thread_id = message_dal.get_or_create_thread_id(1, 2)
+    ids = [message_dal.create_message(thread_id, 1, 2, f'Message {i}') for i in range(4)]
+    message_dal.mark_thread_read(thread_id, 2)
+    unread = message_dal.create_message(thread_id, 1, 2, 'Not read yet')
+    last = message_dal.create_message(thread_id, 1, 2, 'Latest')
+    test_db.execute_query("UPDATE messages SET timestamp = '2020-01-01 00:00:00'")
+
+    moved = RetentionDAL(test_db, chunk_size=3).archive_table('messages', 30)
+
+    assert moved == 4
+    assert archived('messages', 'message_id') == ids
+    assert [m['message_id'] for m in message_dal.get_thread_page(thread_id)[0]] == [last, unread]
+    assert message_dal.get_user_threads(1)[0]['last_message'] == 'Latest'
+
+
+def test_thread_stays_in_inbox_after_its_kept_message_is_deleted(test_db, monkeypatch):
+    """Test deleting the one message retention kept leaves the thread listed with an archived preview."""
+    message_dal = MessageDAL(test_db)
+    thread_id = message_dal.get_or_create_thread_id(1, 2)
+    for i in range(3):
+        message_dal.create_message(thread_id, 1, 2, f'Message {i}')
+    message_dal.mark_thread_read(thread_id, 2)
+    test_db.execute_query("UPDATE messages SET timestamp = '2020-01-01 00:00:00'")
+    test_db.execute_query("UPDATE threads SET last_timestamp = '2020-01-01 00:00:00'")
+    assert RetentionDAL(test_db).archive_table('messages', 30) == 2
+
+    last = message_dal.get_thread_page(thread_id)[0][0]['message_id']
+    assert message_dal.delete_message(last)
+
+    inbox = message_dal.get_user_threads(2)
+    assert [(t['thread_id'], t['last_message'], t['last_timestamp']) for t in inbox] == [
+        (thread_id, None, '2020-01-01 00:00:00')
+    ]
+    monkeypatch.setattr(message_controller, 'message_dal', message_dal)
+    for name in ('RECOMMENDATION_INTERVAL', 'RETENTION_INTERVAL', 'CONCIERGE_PRELOAD'):
+        monkeypatch.setenv(name, '0')
+    client = create_app().test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 2
+    response = client.get('/messages/')
+    assert response.status_code == 200
+    assert b'Older messages archived' in response.data
+
+
+def test_run_with_nothing_expired_creates_no_archive(test_db):
+    """Test a run with no expired rows leaves no archive file behind."""
+    add_logs(test_db, ['2999-01-01 00:00:00'])
+    result = RetentionDAL(test_db).run()
+    assert result['admin_logs'] == 0 and result['messages'] == 0
+    assert not os.path.exists('test_retention_archive.db')
+
+
+def test_monthly_counts_span_archive_and_hot_rows(test_db):
+    """Test whole-history counts combine the rollup and the rows still in the table."""
+    add_logs(test_db, ['2020-01-05 10:00:00', '2020-01-06 10:00:00', '2999-01-01 00:00:00'])
+    retention_dal = RetentionDAL(test_db)
+    before = retention_dal.get_monthly_counts('admin_logs')
+    retention_dal.run({'admin_logs': 30})
+    assert retention_dal.get_monthly_counts('admin_logs') == before == [('2020-01', 2), ('2999-01', 1)]
+
+
+def test_run_analyzes_and_frees_pages(test_db):
+    """Test a run that moved rows refreshes statistics and vacuums freed pages."""
+    add_logs(test_db, ['2020-01-05 10:00:00'] * 2000 + ['2999-01-01 00:00:00'])
+    with test_db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    result = RetentionDAL(test_db).run({'admin_logs': 30})
+
+    assert result['admin_logs'] == 2000
+    assert result['pages_freed'] > 0
+    with test_db.get_connection() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'admin_logs'").fetchone()[0]
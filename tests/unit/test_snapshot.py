@@ -0,0 +1,85 @@
+"""
+Unit tests for cached snapshots.
+Tests change invalidation, stale-while-revalidate and single-flight refresh.
+"""
+
+import pytest
+import os
+import threading
+import time
+from src.data_access.database import Database
+from src.data_access.admin_dal import AdminDAL
+from src.data_access.user_dal import UserDAL
+from src.utils.snapshot import Snapshot, clear_snapshots
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_snapshot.db')
+    yield db
+    clear_snapshots()
+    if os.path.exists('test_snapshot.db'):
+        os.remove('test_snapshot.db')
+
+
+def test_write_to_watched_table_makes_stats_stale(test_db):
+    """Test committed writes to a stats table are picked up by the next refresh."""
+    admin_dal = AdminDAL(test_db)
+    admin_dal.stats_snapshot.max_stale = 0  # refresh in the caller to observe it directly
+
+    assert admin_dal.get_cached_system_stats()['users_by_role'] == {}
+    assert admin_dal.get_cached_system_stats() is admin_dal.get_cached_system_stats()
+
+    UserDAL(test_db).create_user('Student', 'student@example.com', 'x', 'student')
+
+    assert admin_dal.get_cached_system_stats()['users_by_role'] == {'student': 1}
+    assert admin_dal.stats_snapshot.computations == 2
+
+
+def test_stale_value_served_while_refreshing():
+    """Test a stale read returns immediately and a background refresh replaces it."""
+    release = threading.Event()
+    values = iter(['first', 'second'])
+
+    def compute():
+        value = next(values)
+        if value == 'second':
+            release.wait(5)
+        return value
+
+    snapshot = Snapshot(compute, ttl=0, max_stale=60)
+    assert snapshot.get() == 'first'
+
+    start = time.perf_counter()
+    assert snapshot.get() == 'first'
+    assert snapshot.get() == 'first'
+    assert time.perf_counter() - start < 1
+    release.set()
+
+    deadline = time.time() + 5
+    while snapshot.computations < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert snapshot.computations == 2
+    assert snapshot._value == 'second'
+
+
+def test_concurrent_cold_reads_compute_once():
+    """Test callers arriving together share a single computation."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'answer': 42}
+
+    snapshot = Snapshot(compute, ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(snapshot.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'answer': 42}] * 8
@@ -0,0 +1,87 @@
+"""
+Unit tests for bulk user import.
+Tests validation and the per-row report, duplicates, process-pool hashing
+and users registered while an import runs.
+"""
+
+import pytest
+import os
+from src.data_access.auth_cache import clear_auth_caches
+from src.data_access.database import Database
+from src.data_access.user_dal import UserDAL
+from src.utils import user_import
+from src.utils.auth import verify_password
+from src.utils.user_import import hash_passwords, import_users, insert_users, read_rows
+
+
+@pytest.fixture
+def test_db(monkeypatch):
+    """Create a test database with one existing user; hash at the lowest cost."""
+    monkeypatch.setattr(user_import, 'BCRYPT_ROUNDS', 4)
+    monkeypatch.setattr(user_import, 'INITIAL_ROUNDS', 4)
+    db = Database('test_user_import.db')
+    UserDAL(db).create_user('Existing', 'old@example.com', 'x', 'student')
+    yield db
+    clear_auth_caches()
+    if os.path.exists('test_user_import.db'):
+        os.remove('test_user_import.db')
+
+
+CSV = """name,email,role,department,password
+Ada Lovelace,ada@example.com,student,Math,
+Alan Turing,ALAN@example.com,,CS,Secret123
+Bad Email,not-an-email,student,,
+Bad Role,role@example.com,janitor,,
+Ada Again,ada@example.com,staff,,
+Old User,old@example.com,student,,
+Weak,weak@example.com,student,,short
+"""
+
+
+def test_report_has_one_entry_per_row(test_db):
+    """Test valid rows are created and every other row says why not."""
+    report, summary = import_users(test_db, CSV, workers=1)
+    status = {entry['line']: (entry['status'], entry['errors']) for entry in report}
+    assert [entry['line'] for entry in report] == [2, 3, 4, 5, 6, 7, 8]
+    assert status[2][0] == status[3][0] == 'created'
+    assert status[4][0] == 'error' and 'email' in status[4][1].lower()
+    assert status[5][0] == 'error' and 'role' in status[5][1].lower()
+    assert status[6] == ('error', 'Duplicate of line 2')
+    assert status[7] == ('exists', '')
+    assert status[8][0] == 'error' and '8 characters' in status[8][1]
+    assert (summary['created'], summary['exists'], summary['error']) == (2, 1, 4)
+
+
+def test_created_users_can_log_in(test_db):
+    """Test given passwords are kept and missing ones are generated and reported."""
+    report, _ = import_users(test_db, CSV, workers=1)
+    dal = UserDAL(test_db)
+    ada, alan = report[0], report[1]
+    assert ada['initial_password'] and not alan['initial_password']
+    assert verify_password(ada['initial_password'], dal.get_user_by_email('ada@example.com')['password_hash'])
+    alan_row = dal.get_user_by_id(alan['user_id'])
+    assert alan_row['email'] == 'alan@example.com' and alan_row['role'] == 'student'
+    assert verify_password('Secret123', alan_row['password_hash'])
+
+
+def test_process_pool_hashes_in_order(test_db):
+    """Test hashes from worker processes come back in input order."""
+    passwords = [(f'Password{i}', 4) for i in range(6)]
+    hashes = hash_passwords(passwords, workers=2)
+    assert all(verify_password(p, h) for (p, _), h in zip(passwords, hashes))
+
+
+def test_email_registered_meanwhile_is_not_claimed(test_db):
+    """Test an insert that loses to a concurrent registration skips only that row."""
+    created = insert_users(test_db, [
+        ('New', 'new@example.com', 'hash-new', 'student', None),
+        ('Old', 'old@example.com', 'hash-old', 'student', None),
+    ])
+    assert list(created) == ['new@example.com']
+    assert UserDAL(test_db).get_user_by_email('old@example.com')['password_hash'] == 'x'
+
+
+def test_header_is_checked():
+    """Test a file without name and email columns is refused outright."""
+    with pytest.raises(ValueError, match='email'):
+        read_rows("name,mail\nAda,ada@example.com\n")
@@ -0,0 +1,135 @@
+"""
+Unit tests for resource utilization analytics.
+Tests availability rule parsing, hour-grid interval arithmetic and the
+per-resource, per-building and per-week report.
+"""
+
+import pytest
+import os
+import json
+from datetime import date
+import numpy as np
+from src.data_access.database import Database
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.data_access.utilization_dal import (UtilizationDAL, clear_booking_intervals, get_booking_intervals,
+                                             hourly_occupancy, parse_availability_rules)
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.vector_index import clear_vector_indexes
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database with an owner."""
+    db = Database('test_utilization.db')
+    UserDAL(db).create_user('Owner', 'owner@example.com', 'x', 'staff')
+    yield db
+    clear_booking_intervals()
+    clear_catalogs()
+    clear_vector_indexes()
+    if os.path.exists('test_utilization.db'):
+        os.remove('test_utilization.db')
+
+
+def test_parse_availability_rules():
+    """Test weekday windows, partial hours and the default for missing rules."""
+    week = parse_availability_rules(json.dumps({'mon': [['08:30', '10:00']], 'wed': [['00:00', '24:00']]}))
+    assert week[8] == 30 and week[9] == 60 and week[10] == 0
+    assert week.sum() == 90 + 24 * 60
+
+    for rules in (None, '', 'not json', '{"funday": [["08:00", "09:00"]]}', '{"mon": [["8", "9"]]}'):
+        assert parse_availability_rules(rules).sum() == 7 * 14 * 60
+
+
+def test_hourly_occupancy_splits_partial_hours():
+    """Test intervals are split over hour slots and clipped to the grid."""
+    grid = hourly_occupancy(
+        np.array([0, 0, 1]), np.array([30, 100, 170]), np.array([50, 250, 10_000]), 2, 5
+    )
+    assert grid.tolist() == [[20, 20, 60, 60, 10], [0, 0, 10, 60, 60]]
+
+
+def test_utilization_by_resource_building_and_week(test_db):
+    """Test booked hours count only inside availability and are grouped by building and week."""
+    resources = ResourceDAL(test_db)
+    bookings = BookingDAL(test_db)
+    weekdays_9_to_17 = json.dumps({day: [['09:00', '17:00']] for day in ('mon', 'tue', 'wed', 'thu', 'fri')})
+    room = resources.create_resource(1, 'Room', '', 'Rooms', 'Library', 4, availability_rules=weekdays_9_to_17, status='published')
+    resources.create_resource(1, 'Lab', '', 'Labs', 'Science Hall', 20, status='published')
+    resources.create_resource(1, 'Draft', '', 'Labs', 'Science Hall', 20, status='draft')
+
+    # 2030-03-04 is a Monday; 08:00-10:00 only overlaps availability for one hour
+    for start, end, status in [
+        ('2030-03-04 08:00', '2030-03-04 10:00', 'approved'),
+        ('2030-03-12 13:00', '2030-03-12 17:00', 'completed'),
+        ('2030-03-05 09:00', '2030-03-05 17:00', 'rejected'),
+    ]:
+        booking_id = bookings.create_booking(room, 1, start, end)
+        bookings.update_booking_status(booking_id, status)
+    # Bookings of unpublished resources are ignored
+    booking_id = bookings.create_booking(3, 1, '2030-03-04 09:00', '2030-03-04 17:00')
+    bookings.update_booking_status(booking_id, 'approved')
+
+    report = UtilizationDAL(test_db).get_utilization(date(2030, 3, 4), date(2030, 3, 17))
+
+    assert report['periods'] == ['2030-03-04', '2030-03-11']
+    by_title = {entry['title']: entry for entry in report['resources']}
+    assert set(by_title) == {'Room', 'Lab'}
+    assert by_title['Room']['available_hours'] == 80
+    assert by_title['Room']['booked_hours'] == 5
+    assert by_title['Room']['weekly'] == [2.5, 10.0]
+    assert by_title['Lab']['available_hours'] == 14 * 14
+    assert by_title['Lab']['utilization'] == 0
+    assert {entry['building'] for entry in report['buildings']} == {'Library', 'Science Hall'}
+    assert report['overall']['booked_hours'] == 5
+
+    # The Lab has no rules: its hours are assumed, and the report says so
+    assert not by_title['Room']['assumed_availability'] and by_title['Room']['assumed_hours'] == 0
+    assert by_title['Lab']['assumed_availability'] and by_title['Lab']['assumed_hours'] == 14 * 14
+    assert report['overall']['assumed_hours'] == 14 * 14
+    assert report['assumed_availability'] == [{'resource_id': 2, 'title': 'Lab', 'building': 'Science Hall'}]
+
+
+def test_utilization_rejects_bad_ranges(test_db):
+    """Test reversed and overlong ranges raise ValueError."""
+    dal = UtilizationDAL(test_db)
+    with pytest.raises(ValueError):
+        dal.get_utilization(date(2030, 3, 5), date(2030, 3, 4))
+    with pytest.raises(ValueError):
+        dal.get_utilization(date(2030, 1, 1), date(2031, 6, 1))
+    assert dal.get_utilization(date(2030, 3, 4), date(2030, 3, 4))['resources'] == []
+
+
+def test_booking_intervals_refresh_incrementally(test_db):
+    """Test later reports read only new and re-stamped bookings, and a delete reloads."""
+    resources = ResourceDAL(test_db)
+    bookings = BookingDAL(test_db)
+    room = resources.create_resource(1, 'Room', '', 'Rooms', 'Library', 4, status='published')
+    ids = []
+    for day in range(4, 8):
+        booking_id = bookings.create_booking(room, 1, f'2030-03-0{day} 10:00', f'2030-03-0{day} 12:00')
+        bookings.update_booking_status(booking_id, 'approved')
+        ids.append(booking_id)
+    # Stamped long ago, so none of them is inside the re-read overlap
+    test_db.execute_query("UPDATE bookings SET updated_at = '2020-01-01 00:00:00'")
+    dal = UtilizationDAL(test_db)
+    first, last = date(2030, 3, 4), date(2030, 3, 10)
+    assert dal.get_utilization(first, last)['overall']['booked_hours'] == 8
+    intervals = get_booking_intervals(test_db)
+    assert intervals.rows_read == 4
+
+    # A new booking and a cancellation are picked up without re-reading the rest
+    booking_id = bookings.create_booking(room, 1, '2030-03-08 10:00', '2030-03-08 13:00')
+    bookings.update_booking_status(booking_id, 'completed')
+    bookings.update_booking_status(ids[0], 'cancelled')
+    assert dal.get_utilization(first, last)['overall']['booked_hours'] == 9
+    # Both re-stamped bookings, and the new one again as the id above the last seen
+    assert intervals.rows_read == 4 + 3 and intervals.reloads == 0
+
+    bookings.delete_booking(ids[1])
+    report = dal.get_utilization(first, last)
+    assert report['overall']['booked_hours'] == 7 and intervals.reloads == 1
+
+    clear_booking_intervals()
+    assert UtilizationDAL(test_db).get_utilization(first, last) == report
@@ -0,0 +1,91 @@
+"""
+Unit tests for the TF-IDF resource vector index.
+Tests similarity ranking, batch queries and incremental updates.
+"""
+
+import pytest
+import os
+from src.data_access.database import Database
+from src.data_access.resource_catalog import clear_catalogs
+from src.data_access.vector_index import clear_vector_indexes, tokenize
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+
+
+@pytest.fixture
+def test_db():
+    """Create a test database."""
+    db = Database('test_vectors.db')
+    yield db
+    clear_catalogs()
+    clear_vector_indexes()
+    if os.path.exists('test_vectors.db'):
+        os.remove('test_vectors.db')
+
+
+@pytest.fixture
+def setup_data(test_db):
+    """Create resources with overlapping descriptions."""
+    user_dal = UserDAL(test_db)
+    resource_dal = ResourceDAL(test_db)
+    owner_id = user_dal.create_user('Owner', 'owner@example.com', 'x', 'staff')
+
+    ids = {}
+    for title, description, category in [
+        ('Chemistry Lab', 'Fume hoods, beakers and titration equipment', 'Lab'),
+        ('Organic Chemistry Lab', 'Fume hoods and glassware for synthesis', 'Lab'),
+        ('Recording Studio', 'Soundproof booth with microphones and mixing desk', 'Studio'),
+        ('Podcast Booth', 'Small soundproof booth with two microphones', 'Studio'),
+    ]:
+        ids[title] = resource_dal.create_resource(
+            owner_id=owner_id, title=title, description=description,
+            category=category, location='Main Campus', capacity=4, status='published'
+        )
+    return {'ids': ids, 'resource_dal': resource_dal, 'owner_id': owner_id}
+
+
+def test_tokenize_drops_stopwords():
+    """Test tokenization lower-cases and removes stopwords."""
+    assert tokenize('The Quiet Room, with a Projector!') == ['quiet', 'room', 'projector']
+
+
+def test_similar_resources(setup_data):
+    """Test the nearest neighbour of a resource shares its vocabulary."""
+    ids = setup_data['ids']
+    vectors = setup_data['resource_dal'].vectors
+
+    similar = vectors.similar(ids['Recording Studio'], k=2)
+
+    assert similar[0][0] == ids['Podcast Booth']
+    assert ids['Recording Studio'] not in [rid for rid, _ in similar]
+    assert 0 < similar[0][1] <= 1
+
+
+def test_batch_matches_single_queries(setup_data):
+    """Test the batch path returns the same neighbours as single queries."""
+    ids = list(setup_data['ids'].values())
+    vectors = setup_data['resource_dal'].vectors
+
+    batch = vectors.similar_batch(ids, k=2)
+
+    for resource_id in ids:
+        assert batch[resource_id] == vectors.similar(resource_id, k=2)
+
+
+def test_text_search_and_incremental_update(setup_data):
+    """Test free-text search follows resource changes."""
+    resource_dal = setup_data['resource_dal']
+    ids = setup_data['ids']
+    vectors = resource_dal.vectors
+
+    assert vectors.search('fume hoods', k=2)[0][0] in (ids['Chemistry Lab'], ids['Organic Chemistry Lab'])
+
+    resource_dal.update_resource(ids['Chemistry Lab'], status='archived')
+    new_id = resource_dal.create_resource(
+        owner_id=setup_data['owner_id'], title='Telescope Deck', description='Rooftop telescope',
+        category='Observatory', location='Science Tower', capacity=6, status='published'
+    )
+
+    assert [rid for rid, _ in vectors.search('fume hoods', k=5)] == [ids['Organic Chemistry Lab']]
+    assert vectors.search('telescope')[0][0] == new_id
+    assert vectors.search('nothing matches this') == []